@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+""" Benchmark the JSON codecs of :mod:`bitsharesapi.codec` on recorded
+    notice payloads
+
+    .. code-block:: bash
+
+        python benchmarks/bench_codec.py [repetitions]
+"""
+import os
+import sys
+import json
+import timeit
+from bitsharesapi import codec
+
+
+def load_notices():
+    with open(os.path.join(os.path.dirname(__file__), "notices.json")) as fid:
+        notices = json.load(fid)
+    return [json.dumps(notice) for notice in notices]
+
+
+def main(number=20000):
+    messages = load_notices()
+    payload = {
+        "method": "call",
+        "params": [0, "get_objects", [["1.2.29", "1.3.121", "2.1.0"]]],
+        "jsonrpc": "2.0",
+        "id": 42}
+
+    print("{:8} {:>16} {:>16}".format(
+        "codec", "loads [msg/s]", "dumps [msg/s]"))
+    for name in sorted(codec.codecs):
+        c = codec.codecs[name]()
+        t_loads = timeit.timeit(
+            lambda: [c.loads(m) for m in messages], number=number)
+        t_dumps = timeit.timeit(
+            lambda: c.dumps_bytes(payload), number=number)
+        print("{:8} {:16,.0f} {:16,.0f}".format(
+            name,
+            number * len(messages) / t_loads,
+            number / t_dumps))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
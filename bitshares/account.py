@@ -5,6 +5,9 @@ import logging
 
 log = logging.getLogger()
 
+#: Maximum number of accounts per ``get_full_accounts`` call
+MAX_FULL_ACCOUNTS = 50
+
 
 class Account(BlockchainObject):
     """ This class allows to easily access Account data
@@ -54,7 +57,7 @@ class Account(BlockchainObject):
                 [self.identifier])[0]
         if not account:
             raise AccountDoesNotExistsException(self.identifier)
-        self.cache(account["name"])
+        name = account["name"]
 
         if self.full:
             accounts = self.blockchain.rpc.get_full_accounts(
@@ -75,6 +78,51 @@ class Account(BlockchainObject):
                 account,
                 blockchain_instance=self.blockchain
             )
+        # Lookups by name share the cache entry of the id
+        self.cache(name)
+
+    @classmethod
+    def _fetch_many(cls, identifiers, full=False, **kwargs):
+        """ Fetch accounts with one ``get_objects`` call for the ids, one
+            ``lookup_account_names`` call for the names and, for
+            ``full=True``, one ``get_full_accounts`` call
+        """
+        blockchain = kwargs["blockchain_instance"]
+        found = cls._get_objects(
+            [i for i in identifiers if cls._is_own_id(i)], blockchain)
+        names = [i for i in identifiers if not cls._is_own_id(i)]
+        if names:
+            accounts = blockchain.rpc.lookup_account_names(names)
+            found.update(
+                {name: account
+                 for name, account in zip(names, accounts) if account})
+
+        if full:
+            ids = list(set(account["id"] for account in found.values()))
+            full_accounts = dict()
+            for i in range(0, len(ids), MAX_FULL_ACCOUNTS):
+                for _, account in blockchain.rpc.get_full_accounts(
+                    ids[i:i + MAX_FULL_ACCOUNTS], False
+                ):
+                    data = dict(account["account"])
+                    data.update(
+                        {k: v for k, v in account.items() if k != "account"})
+                    full_accounts[data["id"]] = data
+            found = {
+                identifier: full_accounts[account["id"]]
+                for identifier, account in found.items()
+                if account["id"] in full_accounts}
+
+        accounts = []
+        for identifier in identifiers:
+            if identifier not in found:
+                # Raises AccountDoesNotExistsException
+                accounts.append(cls(identifier, full=full, **kwargs))
+                continue
+            account = cls(found[identifier], full=full, **kwargs)
+            account.cache(account["name"])
+            accounts.append(account)
+        return accounts
 
     @property
     def name(self):
@@ -1,7 +1,17 @@
+import threading
 from .instance import BlockchainInstance
 from .asset import Asset
 
 
+def _same_asset(a, b):
+    """ Assets of the asset registry only know id, symbol and precision,
+        so assets are compared by id
+    """
+    return a == b or (
+        dict.get(a, "id") is not None and
+        dict.get(a, "id") == dict.get(b, "id"))
+
+
 class Amount(dict):
     """ This class deals with Amounts of any asset to simplify dealing with the tuple::
 
@@ -66,13 +76,13 @@ class Amount(dict):
 
         elif len(args) == 1 and isinstance(args[0], str):
             self["amount"], self["symbol"] = args[0].split(" ")
-            self["asset"] = Asset(self["symbol"], blockchain_instance=self.blockchain)
+            self["asset"] = Asset.lookup(self["symbol"], blockchain_instance=self.blockchain)
 
         elif (len(args) == 1 and
                 isinstance(args[0], dict) and
                 "amount" in args[0] and
                 "asset_id" in args[0]):
-            self["asset"] = Asset(args[0]["asset_id"], blockchain_instance=self.blockchain)
+            self["asset"] = Asset.lookup(args[0]["asset_id"], blockchain_instance=self.blockchain)
             self["symbol"] = self["asset"]["symbol"]
             self["amount"] = int(args[0]["amount"]) / 10 ** self["asset"]["precision"]
 
@@ -80,7 +90,7 @@ class Amount(dict):
                 isinstance(args[0], dict) and
                 "amount" in args[0] and
                 "asset" in args[0]):
-            self["asset"] = Asset(args[0]["asset"], blockchain_instance=self.blockchain)
+            self["asset"] = Asset.lookup(args[0]["asset"], blockchain_instance=self.blockchain)
             self["symbol"] = self["asset"]["symbol"]
             self["amount"] = int(args[0]["amount"]) / 10 ** self["asset"]["precision"]
 
@@ -91,7 +101,7 @@ class Amount(dict):
 
         elif len(args) == 2 and isinstance(args[1], str):
             self["amount"] = args[0]
-            self["asset"] = Asset(args[1], blockchain_instance=self.blockchain)
+            self["asset"] = Asset.lookup(args[1], blockchain_instance=self.blockchain)
             self["symbol"] = self["asset"]["symbol"]
 
         elif isinstance(amount, (int, float)) and asset and isinstance(asset, Asset):
@@ -106,7 +116,7 @@ class Amount(dict):
 
         elif isinstance(amount, (int, float)) and asset and isinstance(asset, str):
             self["amount"] = amount
-            self["asset"] = Asset(asset, blockchain_instance=self.blockchain)
+            self["asset"] = Asset.lookup(asset, blockchain_instance=self.blockchain)
             self["symbol"] = asset
 
         else:
@@ -143,7 +153,7 @@ class Amount(dict):
         """ Returns the asset as instance of :class:`bitshares.asset.Asset`
         """
         if not self["asset"]:
-            self["asset"] = Asset(self["symbol"], blockchain_instance=self.blockchain)
+            self["asset"] = Asset.lookup(self["symbol"], blockchain_instance=self.blockchain)
         return self["asset"]
 
     def json(self):
@@ -173,7 +183,7 @@ class Amount(dict):
     def __add__(self, other):
         a = self.copy()
         if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
+            assert _same_asset(other["asset"], self["asset"])
             a["amount"] += other["amount"]
         else:
             a["amount"] += float(other)
@@ -182,7 +192,7 @@ class Amount(dict):
     def __sub__(self, other):
         a = self.copy()
         if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
+            assert _same_asset(other["asset"], self["asset"])
             a["amount"] -= other["amount"]
         else:
             a["amount"] -= float(other)
@@ -191,7 +201,7 @@ class Amount(dict):
     def __mul__(self, other):
         a = self.copy()
         if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
+            assert _same_asset(other["asset"], self["asset"])
             a["amount"] *= other["amount"]
         else:
             a["amount"] *= other
@@ -233,7 +243,7 @@ class Amount(dict):
 
     def __iadd__(self, other):
         if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
+            assert _same_asset(other["asset"], self["asset"])
             self["amount"] += other["amount"]
         else:
             self["amount"] += other
@@ -241,7 +251,7 @@ class Amount(dict):
 
     def __isub__(self, other):
         if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
+            assert _same_asset(other["asset"], self["asset"])
             self["amount"] -= other["amount"]
         else:
             self["amount"] -= other
@@ -249,7 +259,7 @@ class Amount(dict):
 
     def __imul__(self, other):
         if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
+            assert _same_asset(other["asset"], self["asset"])
             self["amount"] *= other["amount"]
         else:
             self["amount"] *= other
@@ -257,7 +267,7 @@ class Amount(dict):
 
     def __idiv__(self, other):
         if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
+            assert _same_asset(other["asset"], self["asset"])
             return self["amount"] / other["amount"]
         else:
             self["amount"] /= other
@@ -283,42 +293,42 @@ class Amount(dict):
 
     def __lt__(self, other):
         if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
+            assert _same_asset(other["asset"], self["asset"])
             return self["amount"] < other["amount"]
         else:
             return self["amount"] < float(other or 0)
 
     def __le__(self, other):
         if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
+            assert _same_asset(other["asset"], self["asset"])
             return self["amount"] <= other["amount"]
         else:
             return self["amount"] <= float(other or 0)
 
     def __eq__(self, other):
         if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
+            assert _same_asset(other["asset"], self["asset"])
             return self["amount"] == other["amount"]
         else:
             return self["amount"] == float(other or 0)
 
     def __ne__(self, other):
         if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
+            assert _same_asset(other["asset"], self["asset"])
             return self["amount"] != other["amount"]
         else:
             return self["amount"] != float(other or 0)
 
     def __ge__(self, other):
         if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
+            assert _same_asset(other["asset"], self["asset"])
             return self["amount"] >= other["amount"]
         else:
             return self["amount"] >= float(other or 0)
 
     def __gt__(self, other):
         if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
+            assert _same_asset(other["asset"], self["asset"])
             return self["amount"] > other["amount"]
         else:
             return self["amount"] > float(other or 0)
@@ -326,3 +336,265 @@ class Amount(dict):
     __repr__ = __str__
     __truediv__ = __div__
     __truemul__ = __mul__
+
+
+class AssetDescriptor(object):
+    """ Id, symbol and precision of an asset, the only properties of an
+        asset that :class:`CompactAmount` needs
+
+        :param str id: Id of the asset
+        :param str symbol: Symbol of the asset
+        :param int precision: Precision of the asset
+
+        Descriptors are interned: there is only one instance per id, symbol
+        and precision, so they can be compared with ``is`` and can't be
+        modified.
+    """
+    __slots__ = ["id", "symbol", "precision"]
+    _interned = dict()
+    _lock = threading.Lock()
+
+    def __new__(cls, id, symbol, precision):
+        key = (id, symbol, int(precision))
+        descriptor = cls._interned.get(key)
+        if descriptor is None:
+            with cls._lock:
+                descriptor = cls._interned.get(key)
+                if descriptor is None:
+                    descriptor = object.__new__(cls)
+                    object.__setattr__(descriptor, "id", key[0])
+                    object.__setattr__(descriptor, "symbol", key[1])
+                    object.__setattr__(descriptor, "precision", key[2])
+                    cls._interned[key] = descriptor
+        return descriptor
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Asset descriptors can't be modified")
+
+    def __reduce__(self):
+        return AssetDescriptor, (self.id, self.symbol, self.precision)
+
+    @classmethod
+    def from_asset(cls, asset):
+        """ Returns the descriptor of an :class:`bitshares.asset.Asset` (or
+            of a dict with ``id``, ``symbol`` and ``precision``)
+        """
+        return cls(asset["id"], asset["symbol"], asset["precision"])
+
+    def json(self):
+        return {
+            "id": self.id,
+            "symbol": self.symbol,
+            "precision": self.precision
+        }
+
+    def __repr__(self):
+        return "<AssetDescriptor {} {} {}>".format(
+            self.id, self.symbol, self.precision)
+
+
+class CompactAmount(object):
+    """ Lightweight amount of an asset in integer base units (satoshis)
+
+        :param int amount: Amount in base units of the asset
+        :param AssetDescriptor asset: The asset
+
+        Unlike :class:`Amount`, instances don't hold an
+        :class:`bitshares.asset.Asset` (and a BitShares instance) but an
+        interned :class:`AssetDescriptor`, so arithmetic never copies the
+        asset and never loses base units to floating point rounding.
+        Amounts of different assets can't be added, subtracted or compared
+        (``ValueError``).
+
+        .. code-block:: python
+
+            from bitshares.amount import Amount, CompactAmount
+            total = sum(
+                CompactAmount.from_json(op["amount"]) for op in operations)
+            print(total, total.json())
+            amount = total.to_amount()
+    """
+    __slots__ = ["amount", "asset"]
+
+    def __init__(self, amount, asset):
+        self.amount = int(amount)
+        self.asset = asset
+
+    @classmethod
+    def from_amount(cls, amount):
+        """ Returns the compact form of an :class:`Amount`
+        """
+        asset = AssetDescriptor.from_asset(amount["asset"])
+        return cls(
+            int(round(amount["amount"] * 10 ** asset.precision)), asset)
+
+    @classmethod
+    def from_json(cls, data, **kwargs):
+        """ Returns the amount of a dict with ``amount`` and ``asset_id``
+            (or ``asset``), as used by the API
+
+            :param bitshares.bitshares.BitShares blockchain_instance:
+                BitShares instance to load the asset with
+        """
+        asset_id = data.get("asset_id", data.get("asset"))
+        asset = AssetDescriptor.from_asset(Asset.lookup(asset_id, **kwargs))
+        return cls(data["amount"], asset)
+
+    def to_amount(self, **kwargs):
+        """ Returns the amount as :class:`Amount`
+
+            :param bitshares.bitshares.BitShares blockchain_instance:
+                BitShares instance to load the asset with
+        """
+        return Amount(
+            amount=float(self),
+            asset=Asset.lookup(self.asset.id, **kwargs),
+            **kwargs)
+
+    def json(self):
+        return {
+            "amount": self.amount,
+            "asset_id": self.asset.id
+        }
+
+    @property
+    def symbol(self):
+        return self.asset.symbol
+
+    def _check(self, other):
+        if other.asset is not self.asset:
+            raise ValueError(
+                "Amounts of {} and {} can't be combined".format(
+                    self.asset.symbol, other.asset.symbol))
+        return other.amount
+
+    def _units(self, other):
+        """ Base units of the (same asset) amount ``other`` or ``0`` for
+            ``sum()``
+        """
+        if isinstance(other, CompactAmount):
+            return self._check(other)
+        if other == 0:
+            return 0
+        return NotImplemented
+
+    def __str__(self):
+        precision = self.asset.precision
+        units, fraction = divmod(abs(self.amount), 10 ** precision)
+        if precision:
+            number = "{:,}.{:0{prec}d}".format(
+                units, fraction, prec=precision)
+        else:
+            number = "{:,}".format(units)
+        return "{}{} {}".format(
+            "-" if self.amount < 0 else "", number, self.asset.symbol)
+
+    def __repr__(self):
+        return "<CompactAmount {}>".format(str(self))
+
+    def __float__(self):
+        return self.amount / 10 ** self.asset.precision
+
+    def __int__(self):
+        return self.amount
+
+    def __bool__(self):
+        return bool(self.amount)
+
+    def __neg__(self):
+        return CompactAmount(-self.amount, self.asset)
+
+    def __abs__(self):
+        return CompactAmount(abs(self.amount), self.asset)
+
+    def __add__(self, other):
+        units = self._units(other)
+        if units is NotImplemented:
+            return units
+        return CompactAmount(self.amount + units, self.asset)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        units = self._units(other)
+        if units is NotImplemented:
+            return units
+        return CompactAmount(self.amount - units, self.asset)
+
+    def __rsub__(self, other):
+        units = self._units(other)
+        if units is NotImplemented:
+            return units
+        return CompactAmount(units - self.amount, self.asset)
+
+    def __mul__(self, other):
+        if not isinstance(other, (int, float)):
+            return NotImplemented
+        return CompactAmount(round(self.amount * other), self.asset)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, CompactAmount):
+            self._check(other)
+            return self.amount / other.amount
+        if not isinstance(other, (int, float)):
+            return NotImplemented
+        return CompactAmount(round(self.amount / other), self.asset)
+
+    def __floordiv__(self, other):
+        if isinstance(other, CompactAmount):
+            return self.amount // self._check(other)
+        if not isinstance(other, int):
+            return NotImplemented
+        return CompactAmount(self.amount // other, self.asset)
+
+    def __iadd__(self, other):
+        units = self._units(other)
+        if units is NotImplemented:
+            return units
+        self.amount += units
+        return self
+
+    def __isub__(self, other):
+        units = self._units(other)
+        if units is NotImplemented:
+            return units
+        self.amount -= units
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactAmount):
+            return NotImplemented
+        return self.asset is other.asset and self.amount == other.amount
+
+    def __ne__(self, other):
+        if not isinstance(other, CompactAmount):
+            return NotImplemented
+        return not self == other
+
+    def __lt__(self, other):
+        units = self._units(other)
+        if units is NotImplemented:
+            return units
+        return self.amount < units
+
+    def __le__(self, other):
+        units = self._units(other)
+        if units is NotImplemented:
+            return units
+        return self.amount <= units
+
+    def __gt__(self, other):
+        units = self._units(other)
+        if units is NotImplemented:
+            return units
+        return self.amount > units
+
+    def __ge__(self, other):
+        units = self._units(other)
+        if units is NotImplemented:
+            return units
+        return self.amount >= units
+
+    __hash__ = None
@@ -0,0 +1,257 @@
+""" Columnar amounts and prices of one asset pair in `NumPy
+    <https://numpy.org>`_ arrays, for analytics over order books and trade
+    histories without an :class:`bitshares.price.Order` per row.
+
+    NumPy is an optional dependency (``pip install bitshares[arrays]``), it
+    is only needed once an array is created.
+
+    .. code-block:: python
+
+        from bitshares.market import Market
+        book = Market("USD:BTS").orderbook_arrays(limit=100)
+        print(book["asks"].vwap(), book["asks"].depth(0.004))
+"""
+from .amount import AssetDescriptor, CompactAmount
+from .exceptions import InvalidAssetException
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError(
+            "Amount and price arrays require numpy, "
+            "install bitshares[arrays]")
+
+
+def _descriptor(asset):
+    if isinstance(asset, AssetDescriptor):
+        return asset
+    return AssetDescriptor.from_asset(asset)
+
+
+class AmountArray(object):
+    """ Amounts of one asset in integer base units
+
+        :param list amounts: Amounts in base units of the asset
+        :param bitshares.amount.AssetDescriptor asset: The asset (or an
+            :class:`bitshares.asset.Asset`)
+
+        Single elements are :class:`bitshares.amount.CompactAmount`
+        instances, slices and masks are arrays again. Arrays of different
+        assets can't be combined (``ValueError``).
+    """
+    __slots__ = ["amounts", "asset"]
+
+    def __init__(self, amounts, asset):
+        _require_numpy()
+        self.amounts = numpy.asarray(amounts, dtype=numpy.int64)
+        self.asset = _descriptor(asset)
+
+    @classmethod
+    def from_json(cls, rows, asset):
+        """ Amounts of a list of dicts with ``amount`` and ``asset_id``, as
+            used by the API
+        """
+        _require_numpy()
+        asset = _descriptor(asset)
+        for row in rows:
+            if row["asset_id"] != asset.id:
+                raise ValueError(
+                    "Amount of {} in an array of {}".format(
+                        row["asset_id"], asset.id))
+        return cls(
+            numpy.fromiter(
+                (int(row["amount"]) for row in rows),
+                dtype=numpy.int64,
+                count=len(rows)),
+            asset)
+
+    @classmethod
+    def from_decimal(cls, values, asset):
+        """ Amounts of a list of numbers (or decimal strings) in units of
+            the asset, as returned by ``get_order_book`` and
+            ``get_trade_history``
+        """
+        _require_numpy()
+        asset = _descriptor(asset)
+        values = numpy.asarray(values, dtype=numpy.float64)
+        return cls(
+            numpy.rint(values * 10 ** asset.precision), asset)
+
+    def _check(self, other):
+        if other.asset is not self.asset:
+            raise ValueError(
+                "Amounts of {} and {} can't be combined".format(
+                    self.asset.symbol, other.asset.symbol))
+        return other.amounts
+
+    def to_float(self):
+        """ Returns the amounts in units of the asset
+        """
+        return self.amounts / 10 ** self.asset.precision
+
+    def sum(self):
+        return CompactAmount(int(self.amounts.sum()), self.asset)
+
+    def cumsum(self):
+        return AmountArray(numpy.cumsum(self.amounts), self.asset)
+
+    def json(self):
+        return [
+            {"amount": int(amount), "asset_id": self.asset.id}
+            for amount in self.amounts]
+
+    @property
+    def symbol(self):
+        return self.asset.symbol
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def __iter__(self):
+        for amount in self.amounts:
+            yield CompactAmount(int(amount), self.asset)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, numpy.integer)):
+            return CompactAmount(int(self.amounts[key]), self.asset)
+        return AmountArray(self.amounts[key], self.asset)
+
+    def __neg__(self):
+        return AmountArray(-self.amounts, self.asset)
+
+    def __add__(self, other):
+        return AmountArray(self.amounts + self._check(other), self.asset)
+
+    def __sub__(self, other):
+        return AmountArray(self.amounts - self._check(other), self.asset)
+
+    def __mul__(self, other):
+        return AmountArray(numpy.rint(self.amounts * other), self.asset)
+
+    __rmul__ = __mul__
+
+    def __repr__(self):
+        return "<AmountArray {} {}>".format(
+            self.to_float(), self.asset.symbol)
+
+
+class PriceArray(object):
+    """ Prices of one asset pair as pairs of integer ``base`` and
+        ``quote`` amounts, e.g. the orders of one side of an order book
+
+        :param AmountArray base: Amounts of the base asset
+        :param AmountArray quote: Amounts of the quote asset
+
+        The price of each row is ``base`` per ``quote``, as for
+        :class:`bitshares.price.Price`. Inverted arrays share the amounts
+        of the original array.
+    """
+    __slots__ = ["base", "quote"]
+
+    def __init__(self, base, quote):
+        if len(base) != len(quote):
+            raise ValueError("base and quote differ in length")
+        self.base = base
+        self.quote = quote
+
+    @classmethod
+    def from_orderbook(cls, rows, base, quote):
+        """ Prices of the ``asks`` or ``bids`` of ``get_order_book``
+
+            :param list rows: Orders
+            :param bitshares.asset.Asset base: Base asset of the order book
+            :param bitshares.asset.Asset quote: Quote asset of the order book
+        """
+        return cls(
+            AmountArray.from_decimal([row["base"] for row in rows], base),
+            AmountArray.from_decimal([row["quote"] for row in rows], quote))
+
+    @classmethod
+    def from_trades(cls, rows, base, quote):
+        """ Prices of the trades of ``get_trade_history``
+
+            :param list rows: Trades
+            :param bitshares.asset.Asset base: Base asset of the market
+            :param bitshares.asset.Asset quote: Quote asset of the market
+        """
+        return cls(
+            AmountArray.from_decimal([row["value"] for row in rows], base),
+            AmountArray.from_decimal([row["amount"] for row in rows], quote))
+
+    def prices(self):
+        """ Returns the prices as floats (``base`` per ``quote``)
+        """
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            return self.base.to_float() / self.quote.to_float()
+
+    def symbols(self):
+        return self.base.symbol, self.quote.symbol
+
+    def invert(self):
+        """ Returns the prices in ``quote`` per ``base``
+        """
+        return PriceArray(self.quote, self.base)
+
+    def as_base(self, base):
+        """ Returns the prices so that the base asset is ``base``
+        """
+        if base == self.base.symbol:
+            return self
+        elif base == self.quote.symbol:
+            return self.invert()
+        else:
+            raise InvalidAssetException
+
+    def as_quote(self, quote):
+        """ Returns the prices so that the quote asset is ``quote``
+        """
+        if quote == self.quote.symbol:
+            return self
+        elif quote == self.base.symbol:
+            return self.invert()
+        else:
+            raise InvalidAssetException
+
+    def vwap(self):
+        """ Returns the volume weighted average price
+        """
+        quote = float(self.quote.sum())
+        if not quote:
+            return float("Inf")
+        return float(self.base.sum()) / quote
+
+    def depth(self, price, side="asks"):
+        """ Returns the amount of ``quote`` that is offered at ``price`` or
+            better
+
+            :param float price: Price in ``base`` per ``quote``
+            :param str side: ``asks`` (prices up to ``price``) or ``bids``
+                (prices from ``price`` on)
+        """
+        if side == "asks":
+            mask = self.prices() <= price
+        elif side == "bids":
+            mask = self.prices() >= price
+        else:
+            raise ValueError("side has to be 'asks' or 'bids'")
+        return self.quote[mask].sum()
+
+    def __len__(self):
+        return len(self.base)
+
+    def __getitem__(self, key):
+        """ Rows as tuple of ``base`` and ``quote`` amount, slices and masks
+            as :class:`PriceArray`
+        """
+        if isinstance(key, (int, numpy.integer)):
+            return self.base[key], self.quote[key]
+        return PriceArray(self.base[key], self.quote[key])
+
+    def __repr__(self):
+        return "<PriceArray {} {}/{}>".format(
+            self.prices(), self.base.symbol, self.quote.symbol)
@@ -8,6 +8,7 @@ from bitsharesbase.asset_permissions import (
     todict
 )
 from .exceptions import AssetDoesNotExistsException
+from .instance import BlockchainInstance
 from .blockchainobject import BlockchainObject
 
 
@@ -45,15 +46,91 @@ class Asset(BlockchainObject):
                     asset["bitasset_data_id"])
             self["dynamic_asset_data"] = self.blockchain.rpc.get_object(
                 asset["dynamic_asset_data_id"])
+        self.parse_options()
+        self.register(asset)
+        # Lookups by symbol share the cache entry of the id
+        self.cache(asset["symbol"])
+
+    @classmethod
+    def lookup(cls, identifier, **kwargs):
+        """ Returns the asset ``identifier`` (symbol or id), taken from the
+            asset registry of the BitShares instance (see
+            :class:`bitshares.assetregistry.AssetRegistry`) without using
+            the cache or the API server if possible
+
+            Assets of the registry are loaded lazily: only ``id``,
+            ``symbol`` and ``precision`` are available right away.
+        """
+        blockchain = BlockchainInstance(**kwargs).blockchain
+        registry = getattr(blockchain, "asset_registry", None)
+        if registry is not None and isinstance(identifier, str):
+            asset = registry.asset(identifier, blockchain)
+            if asset is not None:
+                return asset
+        return cls(identifier, blockchain_instance=blockchain)
+
+    def register(self, asset):
+        """ Add ``asset`` to the asset registry of the BitShares instance
+        """
+        registry = getattr(self.blockchain, "asset_registry", None)
+        if registry is not None and dict.get(asset, "precision") is not None:
+            registry.add_asset(asset)
 
-        # Permissions and flags
-        self["permissions"] = todict(asset["options"].get(
-            "issuer_permissions"))
-        self["flags"] = todict(asset["options"].get("flags"))
+    def parse_options(self):
+        """ Decode permissions, flags and description of the asset
+        """
+        options = dict.__getitem__(self, "options")
+        self["permissions"] = todict(options.get("issuer_permissions"))
+        self["flags"] = todict(options.get("flags"))
         try:
-            self["description"] = json.loads(asset["options"]["description"])
+            self["description"] = json.loads(options["description"])
         except:
-            self["description"] = asset["options"]["description"]
+            self["description"] = options["description"]
+
+    @classmethod
+    def _fetch_many(cls, identifiers, full=False, **kwargs):
+        """ Fetch assets with one ``get_objects`` call for the ids, one
+            ``lookup_asset_symbols`` call for the symbols and, for
+            ``full=True``, one ``get_objects`` call for the bitasset and
+            dynamic asset data
+        """
+        blockchain = kwargs["blockchain_instance"]
+        found = cls._get_objects(
+            [i for i in identifiers if cls._is_own_id(i)], blockchain)
+        symbols = [i for i in identifiers if not cls._is_own_id(i)]
+        if symbols:
+            assets = blockchain.rpc.lookup_asset_symbols(symbols)
+            found.update(
+                {symbol: asset
+                 for symbol, asset in zip(symbols, assets) if asset})
+
+        data = dict()
+        if full:
+            ids = set()
+            for asset in found.values():
+                ids.add(asset["dynamic_asset_data_id"])
+                if "bitasset_data_id" in asset:
+                    ids.add(asset["bitasset_data_id"])
+            data = cls._get_objects(list(ids), blockchain)
+
+        assets = []
+        for identifier in identifiers:
+            if identifier not in found:
+                # Raises AssetDoesNotExistsException
+                assets.append(cls(identifier, full=full, **kwargs))
+                continue
+            asset = cls(found[identifier], full=full, **kwargs)
+            if full:
+                if "bitasset_data_id" in asset:
+                    asset["bitasset_data"] = data.get(
+                        asset["bitasset_data_id"])
+                asset["dynamic_asset_data"] = data.get(
+                    asset["dynamic_asset_data_id"])
+            asset.parse_options()
+            asset.register(asset)
+            asset.cache(asset["symbol"])
+            assets.append(asset)
+        return assets
 
     @property
     def is_fully_loaded(self):
@@ -65,6 +142,12 @@ class Asset(BlockchainObject):
             "bitasset_data" in self
         )
 
+    def __getitem__(self, key):
+        # Lazy assets of the asset registry know id, symbol and precision
+        if not self.cached and dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        return super().__getitem__(key)
+
     @property
     def symbol(self):
         return self["symbol"]
@@ -0,0 +1,150 @@
+import gzip
+import logging
+import threading
+from bitsharesapi import codec
+from .amount import AssetDescriptor
+from .asset import Asset
+
+log = logging.getLogger(__name__)
+
+#: Number of assets per ``list_assets`` call (the maximum of the API)
+LIST_ASSETS_LIMIT = 100
+
+
+class AssetRegistry(object):
+    """ Id, symbol and precision of the assets of a chain, the only
+        properties of an asset that :class:`bitshares.amount.Amount` and
+        :class:`bitshares.price.Price` need
+
+        :param str chain_id: Chain of the assets
+
+        Registries are process-wide, there is one per chain (see
+        :func:`for_chain`). They are filled with the assets that are loaded
+        and, with :func:`preload`, with all assets of the chain. Assets
+        never change their symbol or precision, so entries never expire.
+
+        ``Amount`` and ``Price`` take the assets they need from the registry
+        of their BitShares instance (see :func:`bitshares.asset.Asset.lookup`)
+        and thus don't look up the object cache or call the API server for
+        them.
+
+        .. code-block:: python
+
+            from bitshares import BitShares
+            bitshares = BitShares(preload_assets="/tmp/assets.json.gz")
+    """
+    _registries = dict()
+    _registries_lock = threading.Lock()
+
+    def __init__(self, chain_id=None):
+        self.chain_id = chain_id
+        self._by_id = dict()
+        self._by_symbol = dict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_chain(cls, chain_id):
+        """ Returns the registry of the chain ``chain_id``
+        """
+        with cls._registries_lock:
+            if chain_id not in cls._registries:
+                cls._registries[chain_id] = cls(chain_id)
+            return cls._registries[chain_id]
+
+    def add(self, id, symbol, precision):
+        """ Register an asset and return its
+            :class:`bitshares.amount.AssetDescriptor`
+        """
+        descriptor = AssetDescriptor(id, symbol, precision)
+        with self._lock:
+            self._by_id[id] = descriptor
+            self._by_symbol[symbol] = descriptor
+        return descriptor
+
+    def add_asset(self, asset):
+        """ Register an asset object of the API (or an
+            :class:`bitshares.asset.Asset`)
+        """
+        return self.add(
+            dict.__getitem__(asset, "id"),
+            dict.__getitem__(asset, "symbol"),
+            dict.__getitem__(asset, "precision"))
+
+    def get(self, identifier):
+        """ Returns the :class:`bitshares.amount.AssetDescriptor` of the
+            asset with the id or symbol ``identifier`` (or ``None``)
+        """
+        descriptor = self._by_id.get(identifier)
+        if descriptor is None:
+            descriptor = self._by_symbol.get(identifier)
+        return descriptor
+
+    def asset(self, identifier, blockchain_instance):
+        """ Returns a lazy :class:`bitshares.asset.Asset` that knows its id,
+            symbol and precision (all other properties are loaded once they
+            are used) or ``None`` if the asset is not registered
+        """
+        descriptor = self.get(identifier)
+        if descriptor is None:
+            return None
+        return Asset(
+            descriptor.json(),
+            lazy=True,
+            blockchain_instance=blockchain_instance)
+
+    def preload(self, rpc, limit=LIST_ASSETS_LIMIT):
+        """ Register all assets of the chain
+
+            :param bitsharesapi.bitsharesnoderpc.BitSharesNodeRPC rpc: RPC
+                connection
+            :param int limit: Assets per ``list_assets`` call
+            :returns: Number of registered assets
+        """
+        lower_bound = ""
+        while True:
+            assets = rpc.list_assets(lower_bound, limit)
+            for asset in assets:
+                self.add_asset(asset)
+            if len(assets) < limit or assets[-1]["symbol"] == lower_bound:
+                break
+            # The next page starts with the last asset of this page
+            lower_bound = assets[-1]["symbol"]
+        return len(self)
+
+    def save(self, path):
+        """ Write the registry into a gzip compressed JSON file
+        """
+        with self._lock:
+            assets = [
+                [d.id, d.symbol, d.precision] for d in self._by_id.values()]
+        with gzip.open(path, "wb") as fid:
+            fid.write(codec.dumps_bytes({
+                "chain_id": self.chain_id,
+                "assets": assets,
+            }))
+
+    def load(self, path):
+        """ Register the assets of a file written with :func:`save`
+
+            :returns: Number of loaded assets
+        """
+        with gzip.open(path, "rb") as fid:
+            data = codec.loads(fid.read())
+        if data.get("chain_id") != self.chain_id:
+            log.warning("Ignoring asset registry of chain {}".format(
+                data.get("chain_id")))
+            return 0
+        for id, symbol, precision in data["assets"]:
+            self.add(id, symbol, precision)
+        return len(data["assets"])
+
+    def clear(self):
+        with self._lock:
+            self._by_id = dict()
+            self._by_symbol = dict()
+
+    def __contains__(self, identifier):
+        return self.get(identifier) is not None
+
+    def __len__(self):
+        return len(self._by_id)
@@ -1,3 +1,4 @@
+import os
 import logging
 
 from datetime import datetime, timedelta
@@ -9,11 +10,13 @@ from .instance import set_shared_blockchain_instance, shared_blockchain_instance
 from .asset import Asset
 from .account import Account
 from .amount import Amount
+from .assetregistry import AssetRegistry
 from .price import Price
 from .witness import Witness
 from .committee import Committee
 from .vesting import Vesting
 from .worker import Worker
+from .blockchainobject import BlockchainObject
 from .exceptions import (
     AccountExistsException,
 )
@@ -50,6 +53,30 @@ class BitShares(object):
             "irrversible")
         :param bool bundle: Do not broadcast transactions right away, but allow
             to bundle operations *(optional)*
+        :param bool push_cache: Keep cached accounts and assets up to date
+            through database subscriptions instead of refetching them
+            regularly (see :class:`bitshares.cachesubscriber.CacheSubscriber`)
+            *(optional)*
+        :param bool,str shared_cache: Share the object cache with other
+            processes on this machine through an SQLite database (``True``
+            for the default file or the path of the database, see
+            :class:`bitshares.sharedcache.SqliteCacheBackend`) *(optional)*
+        :param int cache_stats_interval: Log the statistics of the object
+            cache (see :func:`cache_stats`) every ``cache_stats_interval``
+            seconds *(optional)*
+        :param callable cache_stats_callback: Call this with the statistics
+            of the object cache instead of logging them *(optional)*
+        :param str warm_start: Load the object cache from this snapshot
+            file (if it exists) after connecting, see :func:`save_cache`
+            *(optional)*
+        :param str cache_scope: Which instances share cached objects:
+            ``shared`` (all instances, default), ``chain`` (all instances
+            connected to the same chain) or ``instance`` (none)
+            *(optional)*
+        :param bool,str preload_assets: Register id, symbol and precision
+            of all assets of the chain after connecting (``True`` or the
+            path of a file that keeps them across runs, see
+            :func:`preload_assets`) *(optional)*
 
         Three wallet operation modes are possible:
 
@@ -141,11 +168,46 @@ class BitShares(object):
             get_default_config_store()
         )
 
+        self.warm_start = kwargs.get("warm_start", None)
+        self.cache_scope = kwargs.get("cache_scope", "shared")
+        if self.cache_scope not in ["shared", "chain", "instance"]:
+            raise ValueError(
+                "Unknown cache scope {}".format(self.cache_scope))
+        # None uses the cache shared by all instances
+        self.object_cache = None
+        # See bitshares.assetregistry.AssetRegistry
+        self.asset_registry = None
+        if kwargs.get("cache_stats_interval"):
+            BlockchainObject.cache_stats.report_every(
+                kwargs["cache_stats_interval"],
+                kwargs.get("cache_stats_callback"))
+        self.cache_subscriber = None
         if not self.offline:
             self.connect(node=node,
                          rpcuser=rpcuser,
                          rpcpassword=rpcpassword,
                          **kwargs)
+            self.scope_cache()
+            self.asset_registry = AssetRegistry.for_chain(
+                self.rpc.chain_params["chain_id"])
+            if kwargs.get("preload_assets"):
+                preload_assets = kwargs["preload_assets"]
+                self.preload_assets(
+                    None if preload_assets is True else preload_assets)
+            if kwargs.get("shared_cache"):
+                from .sharedcache import SqliteCacheBackend
+                shared_cache = kwargs["shared_cache"]
+                BlockchainObject.cache_for(self).backend = SqliteCacheBackend(
+                    path=None if shared_cache is True else shared_cache,
+                    namespace=self.rpc.chain_params["chain_id"],
+                    blockchain_instance=self)
+            if self.warm_start:
+                self.load_cache(self.warm_start)
+            if kwargs.get("push_cache"):
+                from .cachesubscriber import CacheSubscriber
+                self.cache_subscriber = CacheSubscriber(
+                    blockchain_instance=self)
+                self.cache_subscriber.start()
 
         # txbuffers/propbuffer are initialized and cleared
         self.clear()
@@ -183,6 +245,92 @@ class BitShares(object):
     def is_connected(self):
         return bool(self.rpc)
 
+    def scope_cache(self):
+        """ Pick the object cache of this instance according to
+            ``cache_scope`` (internal use only)
+        """
+        chain_id = self.rpc.chain_params["chain_id"]
+        if self.cache_scope == "instance":
+            self.object_cache = BlockchainObject.new_cache(chain_id=chain_id)
+        elif self.cache_scope == "chain":
+            self.object_cache = BlockchainObject.chain_cache(chain_id)
+        else:
+            cache = BlockchainObject._cache
+            if cache.chain_id is None:
+                cache.chain_id = chain_id
+            elif cache.chain_id != chain_id:
+                log.warning(
+                    "Instances of different chains share the object cache, "
+                    "use cache_scope=\"chain\" to keep them apart")
+
+    def preload_assets(self, path=None):
+        """ Register id, symbol and precision of all assets of the chain
+            (see :class:`bitshares.assetregistry.AssetRegistry`), so that
+            :class:`bitshares.amount.Amount` and
+            :class:`bitshares.price.Price` never need to load an asset
+
+            :param str path: Load the assets from this file if it exists,
+                otherwise list them with ``list_assets`` and write them to
+                the file
+            :returns: Number of registered assets
+        """
+        if path and os.path.isfile(path):
+            try:
+                if self.asset_registry.load(path):
+                    return len(self.asset_registry)
+            except Exception as e:
+                log.warning("Cannot load assets {}: {}".format(path, e))
+        self.asset_registry.preload(self.rpc)
+        if path:
+            self.asset_registry.save(path)
+        return len(self.asset_registry)
+
+    def cache_stats(self):
+        """ Returns the statistics of the object cache: hits, misses,
+            stores, expirations, evictions and refresh latency per class
+            (``classes``) and object type (``types``), the state of the
+            cache (``cache``) and the statistics per expiration policy
+            (``policies``)
+        """
+        stats = BlockchainObject.cache_stats.json()
+        stats["cache"] = BlockchainObject.cache_for(self).json()
+        stats["policies"] = BlockchainObject.cache_policies.stats()
+        return stats
+
+    def save_cache(self, path=None):
+        """ Write the object cache into a snapshot file that
+            ``BitShares(warm_start=path)`` loads on start
+
+            :param str path: Snapshot file (defaults to ``warm_start``)
+        """
+        path = path or self.warm_start
+        if not path:
+            raise ValueError("You need to provide a path")
+        BlockchainObject.save_cache(
+            path,
+            self.rpc.chain_params["chain_id"],
+            cache=BlockchainObject.cache_for(self))
+
+    def load_cache(self, path=None):
+        """ Load the object cache from a snapshot file written with
+            :func:`save_cache`
+
+            :param str path: Snapshot file (defaults to ``warm_start``)
+            :returns: Number of loaded cache entries
+        """
+        path = path or self.warm_start
+        if not path or not os.path.isfile(path):
+            return 0
+        try:
+            return BlockchainObject.load_cache(
+                path,
+                self.rpc.chain_params["chain_id"],
+                blockchain_instance=self)
+        except Exception as e:
+            # A broken snapshot only costs a cold start
+            log.warning("Cannot load cache snapshot {}: {}".format(path, e))
+            return 0
+
     @property
     def prefix(self):
         return self.rpc.chain_params["prefix"]
@@ -897,8 +1045,9 @@ class BitShares(object):
         if not isinstance(witnesses, (list, set, tuple)):
             witnesses = {witnesses}
 
-        for witness in witnesses:
-            witness = Witness(witness, blockchain_instance=self)
+        for witness in Witness.load_many(
+            list(witnesses), blockchain_instance=self
+        ):
             options["votes"].append(witness["vote_id"])
 
         options["votes"] = list(set(options["votes"]))
@@ -935,8 +1084,9 @@ class BitShares(object):
         if not isinstance(witnesses, (list, set, tuple)):
             witnesses = {witnesses}
 
-        for witness in witnesses:
-            witness = Witness(witness, blockchain_instance=self)
+        for witness in Witness.load_many(
+            list(witnesses), blockchain_instance=self
+        ):
             if witness["vote_id"] in options["votes"]:
                 options["votes"].remove(witness["vote_id"])
 
@@ -974,8 +1124,9 @@ class BitShares(object):
         if not isinstance(committees, (list, set, tuple)):
             committees = {committees}
 
-        for committee in committees:
-            committee = Committee(committee, blockchain_instance=self)
+        for committee in Committee.load_many(
+            list(committees), blockchain_instance=self
+        ):
             options["votes"].append(committee["vote_id"])
 
         options["votes"] = list(set(options["votes"]))
@@ -1012,8 +1163,9 @@ class BitShares(object):
         if not isinstance(committees, (list, set, tuple)):
             committees = {committees}
 
-        for committee in committees:
-            committee = Committee(committee, blockchain_instance=self)
+        for committee in Committee.load_many(
+            list(committees), blockchain_instance=self
+        ):
             if committee["vote_id"] in options["votes"]:
                 options["votes"].remove(committee["vote_id"])
 
@@ -112,11 +112,13 @@ class Blockchain(object):
             blockchain_instance=self.blockchain
         ).time().timestamp())
 
-    def blocks(self, start=None, stop=None):
+    def blocks(self, start=None, stop=None, pipeline=100):
         """ Yields blocks starting from ``start``.
 
             :param int start: Starting block
             :param int stop: Stop at this block
+            :param int pipeline: Number of blocks that are requested at once
+                (see :func:`bitsharesapi.bitsharesnoderpc.BitSharesNodeRPC.pipeline`)
             :param str mode: We here have the choice between
              "head" (the last block) and "irreversible" (the block that is
              confirmed by 2/3 of all block producers and is thus irreversible)
@@ -137,11 +139,17 @@ class Blockchain(object):
                 head_block = self.get_current_block_num()
 
             # Blocks from start until head block
-            for blocknum in range(start, head_block + 1):
-                # Get full block
-                block = self.wait_for_and_get_block(blocknum)
-                block.update({"block_num": blocknum})
-                yield block
+            for first in range(start, head_block + 1, pipeline):
+                blocknums = range(first, min(first + pipeline, head_block + 1))
+                with self.blockchain.rpc.pipeline() as p:
+                    futures = [p.get_block(blocknum) for blocknum in blocknums]
+                for blocknum, future in zip(blocknums, futures):
+                    # Get full block
+                    block = future.result()
+                    if not block:
+                        block = self.wait_for_and_get_block(blocknum)
+                    block.update({"block_num": blocknum})
+                    yield block
             # Set new start
             start = head_block + 1
 
@@ -1,16 +1,387 @@
+import sys
+import gzip
+import time
+import logging
+import threading
+from collections import OrderedDict
+from bitsharesapi import codec
 from .instance import BlockchainInstance
-from datetime import datetime, timedelta
 
+log = logging.getLogger(__name__)
 
-class ObjectCache(dict):
 
+#: Maximum number of objects in :attr:`BlockchainObject._cache`
+MAX_CACHED_OBJECTS = 100000
+
+#: Expiration of objects that never change
+FOREVER = float("inf")
+
+#: Default expiration per class (``Asset.full`` for assets loaded with
+#: ``full=True``), object type (``1.11``) or object space (``2``).
+#: ``None`` stands for the ``default_expiration`` of the cache, ``0``
+#: disables caching.
+DEFAULT_CACHE_POLICIES = {
+    "Block": FOREVER,
+    "BlockHeader": FOREVER,
+    # Operations in the account history
+    "1.11": FOREVER,
+    # Symbol, precision, issuer and options rarely change
+    "Asset": 60 * 60,
+    # Supply and feeds do
+    "Asset.full": None,
+    # Dynamic objects (global properties, balances, statistics, ...)
+    "2": 0,
+}
+
+
+def _sizeof(value, _seen=None):
+    """ Rough estimate of the memory used by ``value`` in bytes
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for k, v in dict.items(value):
+            size += _sizeof(k, _seen) + _sizeof(v, _seen)
+    elif isinstance(value, (list, tuple, set)):
+        for v in value:
+            size += _sizeof(v, _seen)
+    return size
+
+
+class _CacheEntry(object):
+    __slots__ = ["value", "expires", "size", "stored", "expiration"]
+
+    def __init__(self, value, expires, size, stored, expiration):
+        self.value = value
+        self.expires = expires
+        self.size = size
+        self.stored = stored
+        # Queue of the entry in ObjectCache._expiry
+        self.expiration = expiration
+
+
+class _InFlight(object):
+    """ Load of an object that other threads can wait for
+    """
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.exception = None
+
+    def result(self):
+        self.event.wait()
+        if self.exception is not None:
+            raise self.exception
+        return self.value
+
+
+def _object_type(obj):
+    """ Returns the object type (e.g. ``1.3``) of ``obj`` or ``None``
+    """
+    id = dict.get(obj, "id") if isinstance(obj, dict) else None
+    if not id:
+        id = getattr(obj, "identifier", None)
+    if isinstance(id, str) and BlockchainObject.objectid_valid(id):
+        return id.rsplit(".", 1)[0]
+    if getattr(obj, "type_id", None):
+        return "{}.{}".format(obj.space_id, obj.type_id)
+    return None
+
+
+def _class_path(klass):
+    return "{}.{}".format(klass.__module__, klass.__name__)
+
+
+class CacheCounters(object):
+    """ Cache statistics of one kind of objects
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.refresh_time = 0.0
+        self.max_refresh_time = 0.0
+
+    def json(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+            "stores": self.stores,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "refreshes": self.refreshes,
+            "refresh_time": self.refresh_time,
+            "avg_refresh_time": (
+                self.refresh_time / self.refreshes if self.refreshes
+                else None),
+            "max_refresh_time": self.max_refresh_time,
+        }
+
+
+class CacheStatistics(object):
+    """ Hits, misses, stores, expirations, evictions and refresh latency
+        of the object cache per class (e.g. ``Account``) and per object
+        type (space and type id, e.g. ``1.3``)
+
+        Misses are the objects that had to be fetched from the API server,
+        so the classes and types with many misses (or long refresh times)
+        are the ones causing RPC traffic.
+
+        .. code-block:: python
+
+            from bitshares.blockchainobject import BlockchainObject
+            stats = BlockchainObject.cache_stats
+            stats.reset()
+            market.ticker()
+            print(stats.json()["classes"])
+            # Log all statistics every minute
+            stats.report_every(60)
+    """
+    def __init__(self):
+        self.classes = dict()
+        self.types = dict()
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def counters(self, obj):
+        """ Returns the :class:`CacheCounters` of the class and of the
+            object type of ``obj`` (if known)
+        """
+        ret = []
+        name = obj.__class__.__name__
+        if name not in self.classes:
+            self.classes[name] = CacheCounters()
+        ret.append(self.classes[name])
+        type = _object_type(obj)
+        if type:
+            if type not in self.types:
+                self.types[type] = CacheCounters()
+            ret.append(self.types[type])
+        return ret
+
+    def record(self, obj, counter, amount=1):
+        """ Add ``amount`` to ``counter`` of the class and type of ``obj``
+        """
+        with self._lock:
+            for counters in self.counters(obj):
+                setattr(counters, counter, getattr(counters, counter) + amount)
+
+    def record_refresh(self, obj, duration):
+        with self._lock:
+            for counters in self.counters(obj):
+                counters.refreshes += 1
+                counters.refresh_time += duration
+                counters.max_refresh_time = max(
+                    counters.max_refresh_time, duration)
+
+    def reset(self):
+        with self._lock:
+            self.classes = dict()
+            self.types = dict()
+
+    def json(self):
+        with self._lock:
+            return {
+                "classes": {
+                    name: counters.json()
+                    for name, counters in self.classes.items()},
+                "types": {
+                    type: counters.json()
+                    for type, counters in self.types.items()},
+            }
+
+    def report_every(self, interval, callback=None):
+        """ Call ``callback`` with :func:`json` (or log the statistics if
+            no callback is given) every ``interval`` seconds
+        """
+        self.stop_reporting()
+
+        def report():
+            try:
+                if callback:
+                    callback(self.json())
+                else:
+                    log.info("Cache statistics: {}".format(self.json()))
+            finally:
+                if self._timer is timer:
+                    self.report_every(interval, callback)
+
+        timer = threading.Timer(interval, report)
+        timer.daemon = True
+        self._timer = timer
+        timer.start()
+
+    def stop_reporting(self):
+        timer, self._timer = self._timer, None
+        if timer:
+            timer.cancel()
+
+
+class CachePolicy(object):
+    """ Expiration of a kind of objects and the statistics of their cache
+        lookups
+    """
+    def __init__(self, expiration=None):
+        self.expiration = expiration
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def json(self):
+        return {
+            "expiration": self.expiration,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+        }
+
+
+class CachePolicies(object):
+    """ Registry of the cache expiration per class, object type and object
+        space
+
+        :param dict policies: Expiration in seconds indexed by class name,
+            object type (e.g. ``1.3``) or object space (e.g. ``2``)
+
+        The most specific policy wins: class, type, space. Objects without
+        a policy use the ``default_expiration`` of the cache.
+
+        .. code-block:: python
+
+            from bitshares.account import Account
+            from bitshares.blockchainobject import BlockchainObject, FOREVER
+            policies = BlockchainObject.cache_policies
+            policies.set(Account, 30)
+            policies.set("1.7", 0)      # don't cache limit orders
+            policies.set("Block", FOREVER)
+            print(policies.stats())
+    """
+    def __init__(self, policies={}):
+        self.default = CachePolicy()
+        self.policies = dict()
+        for key, expiration in policies.items():
+            self.set(key, expiration)
+
+    def set(self, key, expiration):
+        """ Set the expiration (in seconds, :attr:`FOREVER`, ``0`` for no
+            caching or ``None`` for the default of the cache) of ``key``
+
+            :param key: Class (or class name), object type or object space
+        """
+        if isinstance(key, type):
+            key = key.__name__
+        if key in self.policies:
+            self.policies[key].expiration = expiration
+        else:
+            self.policies[key] = CachePolicy(expiration)
+
+    def remove(self, key):
+        if isinstance(key, type):
+            key = key.__name__
+        self.policies.pop(key, None)
+
+    def keys(self, obj):
+        """ Keys that may hold the policy of ``obj``, most specific first
+        """
+        name = obj.__class__.__name__
+        keys = [name]
+        if getattr(obj, "full", False):
+            keys.insert(0, name + ".full")
+        type = _object_type(obj)
+        if type is None:
+            return keys
+        return keys + [type, type.split(".")[0]]
+
+    def lookup(self, obj):
+        """ Returns the :class:`CachePolicy` of ``obj``
+        """
+        for key in self.keys(obj):
+            if key in self.policies:
+                return self.policies[key]
+        return self.default
+
+    def stats(self):
+        ret = {key: policy.json() for key, policy in self.policies.items()}
+        ret["default"] = self.default.json()
+        return ret
+
+
+class ObjectCache(object):
+    """ Cache for objects obtained from the blockchain
+
+        :param dict initial_data: Initial content of the cache
+        :param int default_expiration: Seconds after which an entry expires
+        :param bool no_overwrite: Do not replace entries that have not
+            expired yet
+        :param int max_entries: Maximum number of entries (defaults to no
+            limit)
+        :param int max_bytes: Maximum (estimated) memory used by the cached
+            values (defaults to no limit)
+        :param float expire_interval: Seconds between two removals of all
+            expired entries
+        :param backend: Store shared with other processes (see
+            :class:`bitshares.sharedcache.CacheBackend`)
+        :param CacheStatistics stats: Records expirations and evictions
+            per class and object type
+        :param str chain_id: Chain of the cached objects (if known)
+
+        Once a limit is reached, the least recently used entries are
+        removed. Expired entries are removed when they are looked up and,
+        at most every ``expire_interval`` seconds, all at once when an entry
+        is added. Entries that were added with the same expiration expire in
+        the order they were added, so removing expired entries only touches
+        the entries that actually expired. The cache can be used from
+        multiple threads.
+
+        With a ``backend``, entries are also written to the backend and
+        entries that are not in the cache are looked up in the backend.
+        Limits and ``clear()`` only apply to the entries in memory.
+
+        Entries can have aliases (see :func:`alias`): the entry is stored
+        once under its key (e.g. the object id), lookups of an alias (e.g.
+        an account name) return the entry of the key, so all aliases share
+        the expiration of the entry and see its updates at once. Aliases
+        are written to the ``backend``, too.
+    """
     def __init__(
         self,
         initial_data={},
         default_expiration=10,
         no_overwrite=False,
+        max_entries=None,
+        max_bytes=None,
+        expire_interval=60,
+        backend=None,
+        stats=None,
+        chain_id=None,
     ):
-        super().__init__(initial_data)
+        self.backend = backend
+        self.stats = stats
+        self.chain_id = chain_id
+        self.expirations = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        # Alias -> key and key -> aliases
+        self._aliases = dict()
+        self._aliased = dict()
+        self._lock = threading.RLock()
+        # Keys of the entries in the order they expire, per expiration
+        # (entries that never expire are not queued)
+        self._expiry = dict()
+        self.bytes = 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.expire_interval = expire_interval
+        self._last_expire = time.monotonic()
 
         # Expiration
         self.set_expiration(default_expiration)
@@ -18,35 +389,237 @@ class ObjectCache(dict):
         # This allows nicer testing
         self.no_overwrite = no_overwrite
 
+        for key, value in initial_data.items():
+            self[key] = value
+
     def __setitem__(self, key, value):
-        if key in self and not self.no_overwrite:
-            del self[key]
-        elif key in self and self.no_overwrite:
-            return
-        data = {
-            "expires": datetime.utcnow() + timedelta(
-                seconds=self.default_expiration),
-            "data": value
-        }
-        dict.__setitem__(self, key, data)
+        self.set(key, value)
+
+    def set(self, key, value, expiration=None, age=0):
+        """ Store ``value`` for ``expiration`` seconds (defaults to
+            ``default_expiration``). Entries with an expiration of
+            :attr:`FOREVER` are only removed to make room for others, an
+            expiration of ``0`` removes the entry. ``age`` is the number of
+            seconds ``value`` has been known already, it counts against
+            ``expiration`` (see :func:`entries`).
+        """
+        if expiration is None:
+            expiration = self.default_expiration
+        if self._store(key, value, expiration, age) and (
+            self.backend is not None
+        ):
+            self.backend.set(key, value, expiration, age)
+
+    def _store(self, key, value, expiration, age=0):
+        size = _sizeof(value) if self.max_bytes and expiration else 0
+        with self._lock:
+            now = time.monotonic()
+            if key in self._aliases:
+                # The key is an entry of its own from now on
+                self._unalias(key)
+            entry = self._data.get(key)
+            if entry is not None:
+                if self.no_overwrite and now < entry.expires:
+                    return False
+                self._remove(key)
+            stored = now - age
+            if not expiration or stored + expiration <= now:
+                return True
+            entry = _CacheEntry(
+                value, stored + expiration, size, stored, expiration)
+            self._data[key] = entry
+            self.bytes += size
+            if expiration != FOREVER:
+                # Queued by the nominal expiration, so that entries restored
+                # with an age share the queue of the others. They are
+                # removed by expire() once the entries queued before them
+                # have expired, get() never returns them after ``expires``
+                self._expiry.setdefault(
+                    expiration, OrderedDict())[key] = entry
+
+            if now - self._last_expire >= self.expire_interval:
+                self.expire(now)
+            self._evict()
+            return True
 
     def __getitem__(self, key):
-        if key in self:
-            value = dict.__getitem__(self, key)
-            return value["data"]
+        return self.get(key)
 
-    def get(self, key, default):
-        if key in self:
-            return self[key]
-        else:
+    def get(self, key, default=None):
+        """ Returns the value of ``key`` or ``default`` if there is no such
+            entry or if it has expired
+        """
+        with self._lock:
+            key = self._aliases.get(key, key)
+            entry = self._data.get(key)
+            if entry is not None and time.monotonic() < entry.expires:
+                self._data.move_to_end(key)
+                return entry.value
+            if entry is not None:
+                self._remove(key)
+                self._drop_aliases(key)
+                self._count("expirations", entry)
+        return self._load(key, default)
+
+    def _load(self, key, default=None):
+        """ Take the entry ``key`` from the backend
+        """
+        if self.backend is None:
             return default
+        found = self.backend.get(key)
+        alias = None
+        if found is None:
+            # Aliases made by other processes
+            alias, key = key, self.backend.resolve(key)
+            if key is None or key == alias:
+                return default
+            found = self.backend.get(key)
+            if found is None:
+                return default
+        value, age, expiration = found
+        self._store(key, value, expiration, age)
+        if alias is not None:
+            self.alias(alias, key, share=False)
+        return value
 
     def __contains__(self, key):
-        if dict.__contains__(self, key):
-            value = dict.__getitem__(self, key)
-            if datetime.utcnow() < value["expires"]:
-                return True
-        return False
+        key = self._aliases.get(key, key)
+        entry = self._data.get(key)
+        if entry is not None and time.monotonic() < entry.expires:
+            return True
+        return self._load(key) is not None
+
+    def alias(self, alias, key, share=True):
+        """ Make ``alias`` refer to the entry ``key``
+
+            :param bool share: Also write the alias to the backend
+        """
+        if alias == key:
+            return
+        with self._lock:
+            self._unalias(alias)
+            self._aliases[alias] = key
+            self._aliased.setdefault(key, set()).add(alias)
+        if share and self.backend is not None:
+            self.backend.alias(alias, key)
+
+    def aliases(self):
+        """ Returns all aliases and the keys they refer to
+        """
+        with self._lock:
+            return dict(self._aliases)
+
+    def _unalias(self, alias):
+        key = self._aliases.pop(alias, None)
+        if key is not None:
+            self._aliased[key].discard(alias)
+            if not self._aliased[key]:
+                del self._aliased[key]
+
+    def _drop_aliases(self, key):
+        for alias in self._aliased.pop(key, ()):
+            del self._aliases[alias]
+
+    def __delitem__(self, key):
+        self.pop(key)
+
+    def pop(self, key, default=None):
+        """ Remove the entry ``key`` (or the entry the alias ``key``
+            refers to) and return its value
+        """
+        with self._lock:
+            key = self._aliases.get(key, key)
+            entry = self._remove(key)
+            self._drop_aliases(key)
+        if self.backend is not None:
+            self.backend.delete(key)
+        if entry is None or time.monotonic() >= entry.expires:
+            return default
+        return entry.value
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        with self._lock:
+            return list(self._data)
+
+    def entries(self):
+        """ Returns ``(key, value, age, expiration)`` of all entries that
+            have not expired, where ``expiration`` is the total lifetime of
+            the entry
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, entry.value, now - entry.stored,
+                 entry.expires - entry.stored)
+                for key, entry in self._data.items() if now < entry.expires]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._aliases.clear()
+            self._aliased.clear()
+            self._expiry.clear()
+            self.bytes = 0
+
+    def _remove(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry.size
+                queue = self._expiry.get(entry.expiration)
+                if queue is not None:
+                    queue.pop(key, None)
+                    if not queue:
+                        del self._expiry[entry.expiration]
+            return entry
+
+    def _evict(self):
+        while self._data and (
+            (self.max_entries and len(self._data) > self.max_entries) or
+            (self.max_bytes and self.bytes > self.max_bytes)
+        ):
+            # Least recently used
+            key = next(iter(self._data))
+            self._drop_aliases(key)
+            self._count("evictions", self._remove(key))
+
+    def _count(self, counter, entry):
+        setattr(self, counter, getattr(self, counter) + 1)
+        if self.stats is not None:
+            self.stats.record(entry.value, counter)
+
+    def expire(self, now=None):
+        """ Remove all expired entries
+        """
+        with self._lock:
+            if now is None:
+                now = time.monotonic()
+            self._last_expire = now
+            for queue in list(self._expiry.values()):
+                while queue:
+                    key, entry = next(iter(queue.items()))
+                    if entry.expires > now:
+                        break
+                    # Also removes the key from the queue
+                    self._remove(key)
+                    self._drop_aliases(key)
+                    self._count("expirations", entry)
+
+    def json(self):
+        return {
+            "entries": len(self._data),
+            "aliases": len(self._aliases),
+            "bytes": self.bytes,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "default_expiration": self.default_expiration,
+        }
 
     def __str__(self):
         return "ObjectCache(n={}, default_expiration={})".format(
@@ -62,7 +635,24 @@ class BlockchainObject(dict, BlockchainInstance):
     type_id = None
     type_ids = []
 
-    _cache = ObjectCache()
+    cache_stats = CacheStatistics()
+    _cache = ObjectCache(max_entries=MAX_CACHED_OBJECTS, stats=cache_stats)
+    cache_policies = CachePolicies(DEFAULT_CACHE_POLICIES)
+    # See bitshares.cachesubscriber.CacheSubscriber
+    _cache_subscriber = None
+    # Caches of cache_scope="chain", indexed by chain id
+    _chain_caches = dict()
+    # Objects that are being loaded, see load()
+    _inflight = dict()
+    _inflight_lock = threading.Lock()
+    # Classes that cached objects may be restored as, see decode_cached()
+    _classes = dict()
+    # Result of the batch an object is requested in, see _defer()
+    _pending = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        BlockchainObject._classes[_class_path(cls)] = cls
 
     def __init__(
         self,
@@ -94,8 +684,12 @@ class BlockchainObject(dict, BlockchainInstance):
         elif isinstance(data, int):
             # This is only for block number bascially
             self.identifier = data
-            if not lazy and not self.cached:
-                self.refresh()
+            cached = self.getcache(str(data))
+            # Other classes may be cached under the same number
+            if isinstance(cached, self.__class__):
+                super().__init__(cached)
+            elif not lazy and not self.cached:
+                self.load(str(data))
             # make sure to store the blocknumber for caching
             self["id"] = str(data)
             # Set identifier again as it is overwritten in super() in refresh()
@@ -105,18 +699,342 @@ class BlockchainObject(dict, BlockchainInstance):
             if self.test_valid_objectid(self.identifier):
                 # Here we assume we deal with an id
                 self.testid(self.identifier)
-            if self.iscached(data):
-                super().__init__(self.getcache(data))
+            cached = self.getcache(data)
+            if cached is not None:
+                super().__init__(cached)
             elif not lazy and not self.cached:
-                self.refresh()
+                if self._defer(data, use_cache):
+                    return
+                self.load(data)
 
         if use_cache and not lazy:
             self.cache()
             self.cached = True
 
+    def _defer(self, identifier, use_cache):
+        """ Within ``rpc.batch()``, add the object to the batch instead of
+            loading it, so the objects of the batch are requested with one
+            call. The object is loaded once it is used (and unknown objects
+            only raise then).
+        """
+        if getattr(self, "full", False) or not self._is_own_id(identifier):
+            return False
+        coalescer = getattr(
+            getattr(self.blockchain, "rpc", None), "__dict__", {}
+        ).get("coalescer")
+        batch = coalescer.current_batch if coalescer else None
+        if batch is None:
+            return False
+        self._pending = batch.add([identifier])
+        self._cache_pending = use_cache
+        return True
+
+    def _load_pending(self):
+        """ Load a deferred object from the result of its batch
+        """
+        pending, self._pending = self._pending, None
+        objects = dict(zip(pending._ids, pending.result()))
+        with self.blockchain.rpc.coalescer.prefetched(objects):
+            self.load(self.identifier)
+        if self._cache_pending:
+            self.cache()
+        self.cached = True
+
+    def load(self, key):
+        """ Refresh the object that was not found in the cache under
+            ``key``. If another thread is loading the same object already,
+            wait for it and take its result instead of asking the API server
+            again.
+        """
+        cache = self.objectcache
+        flight_key = (
+            cache, self.__class__, key, getattr(self, "full", False))
+        with BlockchainObject._inflight_lock:
+            flight = BlockchainObject._inflight.get(flight_key)
+            leader = flight is None
+            if leader:
+                flight = _InFlight()
+                BlockchainObject._inflight[flight_key] = flight
+        if not leader:
+            dict.__init__(self, flight.result())
+            return
+
+        try:
+            # The load of the same object under another key (id or name)
+            # may have just completed
+            cached = cache.get(key)
+            if isinstance(cached, self.__class__):
+                dict.__init__(self, cached)
+            else:
+                start = time.monotonic()
+                self.refresh()
+                BlockchainObject.cache_stats.record_refresh(
+                    self, time.monotonic() - start)
+            flight.value = dict(self)
+        except Exception as e:
+            flight.exception = e
+            raise
+        finally:
+            with BlockchainObject._inflight_lock:
+                del BlockchainObject._inflight[flight_key]
+            flight.event.set()
+
+    @classmethod
+    def load_many(cls, identifiers, lazy=False, **kwargs):
+        """ Returns the objects ``identifiers`` in the same order, loaded
+            with as few API calls as possible
+
+            :param list identifiers: Object ids (or names, depending on the
+                class)
+            :param bool lazy: Lazy loading (no API calls at all)
+
+            All other arguments are passed to the constructor of the class.
+            Objects that are cached are taken from the cache, the others
+            are fetched with one ``get_objects`` call and put into the cache.
+
+            .. code-block:: python
+
+                from bitshares.account import Account
+                accounts = Account.load_many(["init0", "init1", "1.2.100"])
+        """
+        kwargs["blockchain_instance"] = BlockchainInstance(**kwargs).blockchain
+        kwargs.pop("bitshares_instance", None)
+        if lazy:
+            return [cls(i, lazy=True, **kwargs) for i in identifiers]
+
+        full = kwargs.get("full", False)
+        cache = BlockchainObject.cache_for(kwargs["blockchain_instance"])
+        missing = []
+        for identifier in identifiers:
+            cached = cache.get(identifier)
+            if not (
+                isinstance(cached, cls) and
+                getattr(cached, "full", False) >= full
+            ) and identifier not in missing:
+                missing.append(identifier)
+        start = time.monotonic()
+        objects = dict(zip(missing, cls._fetch_many(missing, **kwargs)))
+        for obj in objects.values():
+            # The objects were fetched together
+            BlockchainObject.cache_stats.record(obj, "misses")
+            BlockchainObject.cache_stats.record_refresh(
+                obj, (time.monotonic() - start) / len(objects))
+        return [
+            objects[i] if i in objects else cls(i, **kwargs)
+            for i in identifiers]
+
+    @classmethod
+    def _fetch_many(cls, identifiers, **kwargs):
+        """ Fetch the objects ``identifiers`` that are not cached. Objects
+            that can't be fetched in a batch are loaded one by one (which
+            raises the exception of the class for unknown objects).
+        """
+        found = cls._get_objects(
+            [i for i in identifiers if cls._is_own_id(i)],
+            kwargs["blockchain_instance"])
+        return [
+            cls(found[i], **kwargs) if i in found else cls(i, **kwargs)
+            for i in identifiers]
+
+    @classmethod
+    def _fetch_many_by_account(cls, identifiers, method, **kwargs):
+        """ Fetch objects given by their id or by their account (name or
+            id): one ``get_objects`` call for the ids and one pipelined
+            ``method`` call per account
+        """
+        from .account import Account
+        blockchain = kwargs["blockchain_instance"]
+        found = cls._get_objects(
+            [i for i in identifiers if cls._is_own_id(i)], blockchain)
+        accounts = [i for i in identifiers if not cls._is_own_id(i)]
+        if accounts:
+            # Raises AccountDoesNotExistsException for unknown accounts
+            accounts = dict(zip(accounts, Account.load_many(
+                accounts, blockchain_instance=blockchain)))
+            with blockchain.rpc.pipeline() as pipeline:
+                futures = {
+                    identifier: getattr(pipeline, method)(account["id"])
+                    for identifier, account in accounts.items()}
+            for identifier, future in futures.items():
+                obj = future.result()
+                if obj:
+                    found[identifier] = obj
+        return [
+            cls(found[i], **kwargs) if i in found else cls(i, **kwargs)
+            for i in identifiers]
+
+    @classmethod
+    def _is_own_id(cls, identifier, type_id=None):
+        """ Is ``identifier`` the id of an object of this class?
+        """
+        type_id = type_id or cls.type_id or (cls.type_ids or [None])[0]
+        return (
+            isinstance(identifier, str) and
+            bool(BlockchainObject.objectid_valid(identifier)) and
+            identifier.split(".")[:2] == [str(cls.space_id), str(type_id)]
+        )
+
+    @staticmethod
+    def _get_objects(ids, blockchain):
+        """ Returns the existing objects of ``ids`` indexed by id
+        """
+        if not ids:
+            return dict()
+        objects = blockchain.rpc.get_objects(ids)
+        return {id: obj for id, obj in zip(ids, objects) if obj}
+
+    @property
+    def objectcache(self):
+        """ The :class:`ObjectCache` this object is cached in
+        """
+        return BlockchainObject.cache_for(self.blockchain)
+
+    @staticmethod
+    def cache_for(blockchain):
+        """ Returns the :class:`ObjectCache` of the objects of the
+            BitShares instance ``blockchain`` (see the ``cache_scope``
+            argument of :class:`bitshares.bitshares.BitShares`)
+        """
+        cache = getattr(blockchain, "object_cache", None)
+        if cache is None:
+            return BlockchainObject._cache
+        return cache
+
+    @staticmethod
+    def new_cache(**kwargs):
+        """ Returns a new, empty :class:`ObjectCache`
+        """
+        return ObjectCache(
+            max_entries=MAX_CACHED_OBJECTS,
+            stats=BlockchainObject.cache_stats,
+            **kwargs)
+
+    @staticmethod
+    def chain_cache(chain_id):
+        """ Returns the :class:`ObjectCache` that all BitShares instances
+            with ``cache_scope="chain"`` use for the chain ``chain_id``
+        """
+        with BlockchainObject._inflight_lock:
+            if chain_id not in BlockchainObject._chain_caches:
+                BlockchainObject._chain_caches[chain_id] = (
+                    BlockchainObject.new_cache(chain_id=chain_id))
+            return BlockchainObject._chain_caches[chain_id]
+
     @staticmethod
     def clear_cache():
-        BlockchainObject._cache = ObjectCache()
+        """ Remove all objects from the cache shared by all instances
+            (caches of other scopes are not affected)
+        """
+        BlockchainObject._cache = BlockchainObject.new_cache(
+            backend=BlockchainObject._cache.backend)
+
+    @staticmethod
+    def set_cache_backend(backend):
+        """ Share the cache with other processes through ``backend`` (see
+            :class:`bitshares.sharedcache.CacheBackend`), ``None`` to stop
+            sharing
+        """
+        BlockchainObject._cache.backend = backend
+
+    @staticmethod
+    def set_expiration(expiration):
+        """ Set the expiration of objects added to the cache from now on
+        """
+        BlockchainObject._cache.set_expiration(expiration)
+
+    @staticmethod
+    def save_cache(path, chain_id, cache=None):
+        """ Write the objects in the cache into a gzip compressed JSON
+            snapshot
+
+            :param str path: File to write
+            :param str chain_id: Chain the objects belong to
+            :param ObjectCache cache: Cache to write (defaults to the cache
+                shared by all instances)
+
+            The snapshot records the age of each entry. Objects that can't
+            be represented in JSON are skipped.
+        """
+        if cache is None:
+            cache = BlockchainObject._cache
+        objects = []
+        entries = []
+        indexes = dict()
+        for key, value, age, expiration in cache.entries():
+            if id(value) not in indexes:
+                record = encode_cached(value)
+                try:
+                    codec.dumps(record)
+                except (TypeError, ValueError, OverflowError):
+                    indexes[id(value)] = None
+                    continue
+                indexes[id(value)] = len(objects)
+                objects.append(record)
+            if indexes[id(value)] is not None:
+                entries.append([
+                    key, indexes[id(value)], age,
+                    None if expiration == FOREVER else expiration])
+        snapshot = {
+            "chain_id": chain_id,
+            "time": time.time(),
+            "objects": objects,
+            "entries": entries,
+            "aliases": cache.aliases(),
+        }
+        with gzip.open(path, "wb") as fid:
+            fid.write(codec.dumps_bytes(snapshot))
+
+    @staticmethod
+    def load_cache(path, chain_id, **kwargs):
+        """ Add the objects of a snapshot written with :func:`save_cache`
+            to the cache
+
+            :param str path: File to read
+            :param str chain_id: Only load a snapshot of this chain
+            :param bitshares.bitshares.BitShares blockchain_instance:
+                BitShares instance of the loaded objects (they are added to
+                its cache)
+            :returns: Number of cache entries that have been loaded
+
+            The objects keep their age: objects older than the current
+            expiration (see :class:`CachePolicies`) of their kind are not
+            loaded and thus fetched again once they are used. Objects that
+            never change are always loaded.
+        """
+        with gzip.open(path, "rb") as fid:
+            snapshot = codec.loads(fid.read())
+        if snapshot.get("chain_id") != chain_id:
+            log.warning("Ignoring cache snapshot of chain {}".format(
+                snapshot.get("chain_id")))
+            return 0
+        elapsed = max(time.time() - snapshot["time"], 0)
+        blockchain = BlockchainInstance(**kwargs).blockchain
+        objects = [
+            decode_cached(record, blockchain_instance=blockchain)
+            for record in snapshot["objects"]]
+
+        cache = BlockchainObject.cache_for(blockchain)
+        if cache.chain_id is None:
+            cache.chain_id = chain_id
+        loaded = 0
+        for key, index, age, expiration in snapshot["entries"]:
+            obj = objects[index]
+            if obj is None:
+                continue
+            if expiration is None:
+                expiration = FOREVER
+            if isinstance(obj, BlockchainObject):
+                expiration = obj.cache_policy().expiration
+            if expiration is None:
+                expiration = cache.default_expiration
+            age += elapsed
+            if expiration != FOREVER and age >= expiration:
+                continue
+            cache.set(key, obj, expiration, age=age)
+            loaded += 1
+        for alias, key in snapshot.get("aliases", {}).items():
+            cache.alias(alias, key)
+        return loaded
 
     @staticmethod
     def objectid_valid(i):
@@ -149,32 +1067,65 @@ class BlockchainObject(dict, BlockchainInstance):
             "Valid id's for {} are {}.{}.x".format(
                 self.__class__.__name__, self.space_id, self.type_ids)
 
+    def cache_policy(self):
+        """ Returns the :class:`CachePolicy` of this object
+        """
+        return BlockchainObject.cache_policies.lookup(self)
+
     def cache(self, key=None):
-        # store in cache
-        if key is None and dict.__contains__(self, "id"):
-            BlockchainObject._cache[self.get("id")] = self
-        elif key:
-            BlockchainObject._cache[key] = self
+        """ Store the object in the cache under its id. Other keys (e.g.
+            the name of an account) become aliases of the id.
+        """
+        id = dict.get(self, "id")
+        if key is None:
+            key = id
+        if not key:
+            return
+        policy = self.cache_policy()
+        policy.stores += 1
+        BlockchainObject.cache_stats.record(self, "stores")
+        cache = self.objectcache
+        if id and key != id:
+            cache.set(id, self, policy.expiration)
+            cache.alias(key, id)
+        else:
+            cache.set(key, self, policy.expiration)
+        if BlockchainObject._cache_subscriber:
+            BlockchainObject._cache_subscriber.watch(self, id or key)
 
     def iscached(self, id):
-        return id in BlockchainObject._cache
+        return id in self.objectcache
 
     def getcache(self, id):
-        return BlockchainObject._cache.get(id, None)
+        value = self.objectcache.get(id, None)
+        policy = self.cache_policy()
+        if value is None:
+            policy.misses += 1
+            BlockchainObject.cache_stats.record(self, "misses")
+        else:
+            policy.hits += 1
+            BlockchainObject.cache_stats.record(self, "hits")
+        return value
+
+    def _refresh_lazy(self):
+        if self._pending is not None:
+            self._load_pending()
+        else:
+            self.refresh()
 
     def __getitem__(self, key):
         if not self.cached:
-            self.refresh()
+            self._refresh_lazy()
         return super().__getitem__(key)
 
     def items(self):
         if not self.cached:
-            self.refresh()
+            self._refresh_lazy()
         return super().items()
 
     def __contains__(self, key):
         if not self.cached:
-            self.refresh()
+            self._refresh_lazy()
         return super().__contains__(key)
 
     def __repr__(self):
@@ -182,6 +1133,9 @@ class BlockchainObject(dict, BlockchainInstance):
             self.__class__.__name__, str(self.identifier))
 
 
+BlockchainObject._classes[_class_path(BlockchainObject)] = BlockchainObject
+
+
 class Object(BlockchainObject):
 
     def refresh(self):
@@ -190,3 +1144,37 @@ class Object(BlockchainObject):
             self.blockchain.rpc.get_object(self.identifier),
             blockchain_instance=self.blockchain
         )
+
+
+def encode_cached(value):
+    """ Returns a JSON compatible record of the cached ``value`` (see
+        :func:`decode_cached`)
+    """
+    if not isinstance(value, BlockchainObject):
+        return [None, False, value]
+    return [
+        _class_path(value.__class__),
+        getattr(value, "full", False),
+        dict(value)]
+
+
+def decode_cached(record, **kwargs):
+    """ Returns the cached value of a record made with
+        :func:`encode_cached` (``None`` if its class is unknown)
+
+        Only :class:`BlockchainObject` and its subclasses (of modules that
+        are imported) are restored, other classes named in a cache file are
+        never imported.
+
+        :param bitshares.bitshares.BitShares blockchain_instance: BitShares
+            instance of the value
+    """
+    klass, full, data = record
+    if klass is None:
+        return data
+    klass = BlockchainObject._classes.get(klass)
+    if klass is None:
+        return None
+    obj = klass(data, full=full, use_cache=False, **kwargs)
+    obj.cached = True
+    return obj
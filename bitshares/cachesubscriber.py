@@ -0,0 +1,212 @@
+import logging
+import threading
+from bitsharesapi.websocket import BitSharesWebsocket
+from .instance import BlockchainInstance
+from .blockchainobject import BlockchainObject
+
+log = logging.getLogger(__name__)
+
+#: Objects that are watched for changes by default (accounts and assets)
+WATCHED_TYPES = ["1.2", "1.3"]
+
+#: Cache policies that are extended while the subscription is active
+WATCHED_POLICIES = ["Account", "Asset", "Asset.full", "1.2", "1.3"]
+
+#: Expiration of watched objects while the subscription is active
+WATCHED_EXPIRATION = 24 * 60 * 60
+
+
+class _CacheWebsocket(BitSharesWebsocket):
+    """ Websocket that re-subscribes to all watched objects after every
+        (re)connect
+    """
+    def __init__(self, subscriber, *args, **kwargs):
+        self.subscriber = subscriber
+        super().__init__(*args, **kwargs)
+
+    def on_open(self, *args, **kwargs):
+        super().on_open(*args, **kwargs)
+        self.subscriber._on_connect()
+
+    def on_close(self, *args, **kwargs):
+        super().on_close(*args, **kwargs)
+        self.subscriber._on_disconnect()
+
+
+class CacheSubscriber(BlockchainInstance):
+    """ Keeps the object cache of :class:`bitshares.blockchainobject.BlockchainObject`
+        up to date through database subscriptions on a dedicated websocket.
+
+        :param list types: Object types to watch (defaults to
+            :attr:`WATCHED_TYPES`)
+        :param list policies: Cache policies (see
+            :class:`bitshares.blockchainobject.CachePolicies`) to set to
+            ``expiration`` while the subscription is active (defaults to
+            :attr:`WATCHED_POLICIES`)
+        :param int expiration: Cache expiration of watched objects while the
+            subscription is active (defaults to a day)
+        :param bitshares.bitshares.BitShares blockchain_instance: BitShares
+            instance
+
+        Every cached account and asset (and the bitasset and dynamic data of
+        assets loaded with ``full=True``) is subscribed to with
+        ``get_objects``. Once the node reports a change, the object is
+        removed from the cache, so the next ``Account(...)`` or
+        ``Asset(...)`` fetches the new state while all other lookups are
+        served from the cache without a round-trip. While the websocket is
+        disconnected, changes may be missed, so all watched objects are
+        removed from the cache on disconnect.
+
+        .. code-block:: python
+
+            from bitshares.cachesubscriber import CacheSubscriber
+            subscriber = CacheSubscriber()
+            subscriber.start()
+            ...
+            subscriber.stop()
+
+        Alternatively, use ``BitShares(push_cache=True)``.
+    """
+    def __init__(
+        self,
+        types=WATCHED_TYPES,
+        policies=WATCHED_POLICIES,
+        expiration=WATCHED_EXPIRATION,
+        **kwargs
+    ):
+        BlockchainInstance.__init__(self, **kwargs)
+        self.types = types
+        self.policies = policies
+        self.expiration = expiration
+        self.invalidations = 0
+        # Watched object id -> cache keys of the objects to invalidate
+        self.watched = dict()
+        self.connected = False
+        self.websocket = None
+        self._thread = None
+        self._lock = threading.Lock()
+        # Expirations to restore on stop()
+        self._policies = dict()
+
+    def start(self):
+        """ Connect, subscribe and extend the expiration of watched objects
+        """
+        rpc = self.blockchain.rpc
+        self.websocket = _CacheWebsocket(
+            self,
+            urls=rpc.urls,
+            user=rpc.user,
+            password=rpc.password,
+            objects=[t + ".x" for t in self.watched_spaces()],
+            on_object=self.process_notice,
+        )
+        policies = BlockchainObject.cache_policies
+        for key in self.policies:
+            policy = policies.policies.get(key)
+            self._policies[key] = policy.expiration if policy else None
+            policies.set(key, self.expiration)
+        BlockchainObject._cache_subscriber = self
+        self._thread = threading.Thread(target=self.websocket.run_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """ Close the websocket and restore the expiration of watched
+            objects
+        """
+        if BlockchainObject._cache_subscriber is self:
+            BlockchainObject._cache_subscriber = None
+        policies = BlockchainObject.cache_policies
+        for key, expiration in self._policies.items():
+            if expiration is None:
+                policies.remove(key)
+            else:
+                policies.set(key, expiration)
+        self._policies = dict()
+        if self.websocket and self.websocket.ws:
+            self.websocket.close()
+        self.invalidate_all()
+
+    def watched_spaces(self):
+        """ Object types of the watched objects and their dependencies
+        """
+        return self.types + ["2.3", "2.4", "2.6"]
+
+    def dependencies(self, obj):
+        """ Object ids that, when changed, outdate ``obj``
+        """
+        id = dict.get(obj, "id")
+        ids = [id]
+        if getattr(obj, "full", False):
+            for key in ["dynamic_asset_data_id", "bitasset_data_id",
+                        "statistics"]:
+                value = dict.get(obj, key)
+                # Full accounts embed their statistics object
+                if isinstance(value, dict):
+                    value = value.get("id")
+                if isinstance(value, str):
+                    ids.append(value)
+        return ids
+
+    def watch(self, obj, key):
+        """ Subscribe to the changes of ``obj``, cached under ``key``
+        """
+        id = dict.get(obj, "id")
+        if not isinstance(id, str) or id.rsplit(".", 1)[0] not in self.types:
+            return
+        # Objects of instances with a cache of their own
+        if self.cache() is not BlockchainObject.cache_for(
+            getattr(obj, "blockchain", None)
+        ):
+            return
+        new = []
+        with self._lock:
+            for dependency in self.dependencies(obj):
+                if dependency not in self.watched:
+                    self.watched[dependency] = set()
+                    new.append(dependency)
+                self.watched[dependency].add(key)
+        if new and self.connected:
+            self.websocket.get_objects(new)
+
+    def process_notice(self, notice):
+        """ Remove the objects that depend on the changed object from the
+            cache
+        """
+        with self._lock:
+            # The node keeps sending changes of this object
+            keys = self.watched.get(notice["id"], set())
+            if keys:
+                self.watched[notice["id"]] = set()
+        for key in keys:
+            self.invalidate(key)
+
+    def cache(self):
+        """ The object cache of our BitShares instance
+        """
+        return BlockchainObject.cache_for(self.blockchain)
+
+    def invalidate(self, key):
+        cache = self.cache()
+        if key in cache:
+            del cache[key]
+            self.invalidations += 1
+
+    def invalidate_all(self):
+        with self._lock:
+            watched, self.watched = self.watched, dict()
+        for keys in watched.values():
+            for key in keys:
+                self.invalidate(key)
+
+    def _on_connect(self):
+        self.connected = True
+        with self._lock:
+            ids = list(self.watched)
+        if ids:
+            self.websocket.get_objects(ids)
+
+    def _on_disconnect(self):
+        self.connected = False
+        # Changes may be missed until we are connected again
+        self.invalidate_all()
@@ -39,6 +39,13 @@ class Committee(BlockchainObject):
             member, blockchain_instance=self.blockchain)
         self.account_id = member["committee_member_account"]
 
+    @classmethod
+    def _fetch_many(cls, identifiers, **kwargs):
+        return cls._fetch_many_by_account(
+            identifiers, "get_committee_member_by_account", **kwargs)
+
     @property
     def account(self):
-        return Account(self.account_id, blockchain_instance=self.blockchain)
+        return Account(
+            self["committee_member_account"],
+            blockchain_instance=self.blockchain)
@@ -39,8 +39,9 @@ def shared_blockchain_instance():
         bitshares instance that can be reused by multiple classes.
     """
     if not SharedInstance.instance:
-        clear_cache()
-        SharedInstance.instance = bts.BitShares(**SharedInstance.config)
+        instance = bts.BitShares(**SharedInstance.config)
+        switch_cache(instance)
+        SharedInstance.instance = instance
     return SharedInstance.instance
 
 
@@ -51,7 +52,7 @@ def set_shared_blockchain_instance(bitshares_instance):
         :param bitshares.bitshares.BitShares bitshares_instance: BitShares
             instance
     """
-    clear_cache()
+    switch_cache(bitshares_instance)
     SharedInstance.instance = bitshares_instance
 
 
@@ -62,6 +63,29 @@ def clear_cache():
     BlockchainObject.clear_cache()
 
 
+def _chain_id(instance):
+    """ Chain id of a connected instance (or ``None``)
+    """
+    if instance is None or getattr(instance, "offline", True):
+        return None
+    try:
+        return instance.rpc.chain_params["chain_id"]
+    except Exception:
+        return None
+
+
+def switch_cache(instance):
+    """ Clear the cache shared by all instances only if ``instance`` is
+        connected to a different (or unknown) chain than the cached
+        objects
+    """
+    from .blockchainobject import BlockchainObject
+    chain_id = _chain_id(instance)
+    if chain_id is None or chain_id != BlockchainObject._cache.chain_id:
+        clear_cache()
+    BlockchainObject._cache.chain_id = chain_id
+
+
 def set_shared_config(config):
     """ This allows to set a config that will be used when calling
         ``shared_bitshares_instance`` and allows to define the configuration
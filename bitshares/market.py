@@ -245,6 +245,24 @@ class Market(BlockchainInstance, dict):
         data = {"asks": asks, "bids": bids}
         return data
 
+    def orderbook_arrays(self, limit=25):
+        """ Returns the order book as columns (see
+            :class:`bitshares.arrays.PriceArray`), without an order
+            instance per row
+
+            :param int limit: Limit the amount of orders (default: 25)
+        """
+        from .arrays import PriceArray
+        orders = self.blockchain.rpc.get_order_book(
+            self["base"]["id"],
+            self["quote"]["id"],
+            limit
+        )
+        return {
+            side: PriceArray.from_orderbook(
+                orders[side], self["base"], self["quote"])
+            for side in ["asks", "bids"]}
+
     def trades(self, limit=25, start=None, stop=None):
         """ Returns your trade history for a given market.
 
@@ -252,6 +270,31 @@ class Market(BlockchainInstance, dict):
             :param datetime start: start time
             :param datetime stop: stop time
 
+        """
+        for order in self._trade_history(limit, start, stop):
+            yield FilledOrder(
+                order,
+                quote=Amount(order["amount"], self["quote"], blockchain_instance=self.blockchain),
+                base=Amount(float(order["amount"]) * float(order["price"]), self["base"], blockchain_instance=self.blockchain),
+                blockchain_instance=self.blockchain
+            )
+
+    def trades_arrays(self, limit=25, start=None, stop=None):
+        """ Returns the trade history as columns (see
+            :class:`bitshares.arrays.PriceArray`), without an order
+            instance per row
+
+            :param int limit: Limit the amount of orders (default: 25)
+            :param datetime start: start time
+            :param datetime stop: stop time
+        """
+        from .arrays import PriceArray
+        return PriceArray.from_trades(
+            list(self._trade_history(limit, start, stop)),
+            self["base"], self["quote"])
+
+    def _trade_history(self, limit=25, start=None, stop=None):
+        """ Trades of the market as returned by the API
         """
         # FIXME, this call should also return whether it was a buy or
         # sell
@@ -289,12 +332,7 @@ class Market(BlockchainInstance, dict):
                 return
             for order in orders:
                 cnt += 1
-                yield FilledOrder(
-                    order,
-                    quote=Amount(order["amount"], self["quote"], blockchain_instance=self.blockchain),
-                    base=Amount(float(order["amount"]) * float(order["price"]), self["base"], blockchain_instance=self.blockchain),
-                    blockchain_instance=self.blockchain
-                )
+                yield order
                 if cnt >= limit:
                     return
                 sequence = order.get("sequence")
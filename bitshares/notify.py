@@ -19,6 +19,10 @@ class Notify(Events):
         :param fnt on_block: Callback that will be called for each block received
         :param fnt on_account: Callback that will be called for changes of the listed accounts
         :param fnt on_market: Callback that will be called for changes of the listed markets
+        :param bitsharesapi.dispatch.NotificationDispatcher dispatcher: Call
+            the callbacks on worker threads instead of the websocket thread
+        :param bool coalesce_objects: Only deliver the latest state of each
+            object to ``on_object`` while the callback is falling behind
         :param bitshares.bitshares.BitShares blockchain_instance: BitShares instance
 
         **Example**
@@ -61,6 +65,8 @@ class Notify(Events):
         on_account=None,
         on_market=None,
         keep_alive=25,
+        dispatcher=None,
+        coalesce_objects=False,
         **kwargs
     ):
         # Events
@@ -95,7 +101,10 @@ class Notify(Events):
             on_block=on_block,
             on_account=self.process_account,
             on_market=self.process_market,
-            keep_alive=keep_alive
+            keep_alive=keep_alive,
+            node_pool=getattr(self.blockchain.rpc, "pool", None),
+            dispatcher=dispatcher,
+            coalesce_objects=coalesce_objects
         )
 
     def get_market_ids(self, markets):
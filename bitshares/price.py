@@ -1,4 +1,5 @@
 from fractions import Fraction
+from math import gcd
 from .exceptions import InvalidAssetException
 from .instance import BlockchainInstance
 from .account import Account
@@ -8,6 +9,16 @@ from .utils import formatTimeString
 from .utils import parse_time, assets_from_string
 
 
+def _shallow_copy(amount):
+    """ Copy an :class:`bitshares.amount.Amount` without copying (or
+        looking up) its asset
+    """
+    copy = Amount.__new__(Amount)
+    copy.blockchain = amount.blockchain
+    dict.update(copy, amount)
+    return copy
+
+
 class Price(dict, BlockchainInstance):
     """ This class deals with all sorts of prices of any pair of assets to
         simplify dealing with the tuple::
@@ -62,6 +73,11 @@ class Price(dict, BlockchainInstance):
             0.662600000 USD/BTS
 
     """
+    # Integer base and quote amounts and the amounts they were taken from,
+    # see ratio()
+    _ratio = None
+    _ratio_of = None
+
     def __init__(
         self,
         *args,
@@ -77,11 +93,9 @@ class Price(dict, BlockchainInstance):
             import re
             price, assets = args[0].split(" ")
             base_symbol, quote_symbol = assets_from_string(assets)
-            base = Asset(base_symbol, blockchain_instance=self.blockchain)
-            quote = Asset(quote_symbol, blockchain_instance=self.blockchain)
-            frac = Fraction(float(price)).limit_denominator(10 ** base["precision"])
-            self["quote"] = Amount(amount=frac.denominator, asset=quote, blockchain_instance=self.blockchain)
-            self["base"] = Amount(amount=frac.numerator, asset=base, blockchain_instance=self.blockchain)
+            base = Asset.lookup(base_symbol, blockchain_instance=self.blockchain)
+            quote = Asset.lookup(quote_symbol, blockchain_instance=self.blockchain)
+            self._set_fraction(price, base, quote)
 
         elif (len(args) == 1 and isinstance(args[0], dict) and
                 "base" in args[0] and
@@ -92,6 +106,9 @@ class Price(dict, BlockchainInstance):
             if args[0]["base"]["asset_id"] == base_id:
                 self["base"] = Amount(args[0]["base"], blockchain_instance=self.blockchain)
                 self["quote"] = Amount(args[0]["quote"], blockchain_instance=self.blockchain)
+                self._keep_ratio((
+                    int(args[0]["base"]["amount"]),
+                    int(args[0]["quote"]["amount"])))
             else:
                 self["quote"] = Amount(args[0]["base"], blockchain_instance=self.blockchain)
                 self["base"] = Amount(args[0]["quote"], blockchain_instance=self.blockchain)
@@ -99,24 +116,28 @@ class Price(dict, BlockchainInstance):
         elif len(args) == 1 and isinstance(args[0], dict) and "receives" in args[0]:
             # Filled order
             assert base_asset, "Need a 'base_asset' asset"
-            base_asset = Asset(base_asset, blockchain_instance=self.blockchain)
+            base_asset = Asset.lookup(base_asset, blockchain_instance=self.blockchain)
             if args[0]["receives"]["asset_id"] == base_asset["id"]:
                 # If the seller received "base" in a quote_base market, than
                 # it has been a sell order of quote
                 self["base"] = Amount(args[0]["receives"], blockchain_instance=self.blockchain)
                 self["quote"] = Amount(args[0]["pays"], blockchain_instance=self.blockchain)
                 self["type"] = "sell"
+                self._keep_ratio((
+                    int(args[0]["receives"]["amount"]),
+                    int(args[0]["pays"]["amount"])))
             else:
                 # buy order
                 self["base"] = Amount(args[0]["pays"], blockchain_instance=self.blockchain)
                 self["quote"] = Amount(args[0]["receives"], blockchain_instance=self.blockchain)
                 self["type"] = "buy"
+                self._keep_ratio((
+                    int(args[0]["pays"]["amount"]),
+                    int(args[0]["receives"]["amount"])))
 
         elif len(args) == 1 and (isinstance(base, Asset) and isinstance(quote, Asset)):
             price = args[0]
-            frac = Fraction(float(price)).limit_denominator(10 ** base["precision"])
-            self["quote"] = Amount(amount=frac.denominator, asset=quote, blockchain_instance=self.blockchain)
-            self["base"] = Amount(amount=frac.numerator, asset=base, blockchain_instance=self.blockchain)
+            self._set_fraction(price, base, quote)
 
         elif len(args) == 1 and (isinstance(base, Amount) and isinstance(quote, Amount)):
             price = args[0]
@@ -125,11 +146,9 @@ class Price(dict, BlockchainInstance):
 
         elif (len(args) == 1 and isinstance(base, str) and isinstance(quote, str)):
             price = args[0]
-            base = Asset(base, blockchain_instance=self.blockchain)
-            quote = Asset(quote, blockchain_instance=self.blockchain)
-            frac = Fraction(float(price)).limit_denominator(10 ** base["precision"])
-            self["quote"] = Amount(amount=frac.denominator, asset=quote, blockchain_instance=self.blockchain)
-            self["base"] = Amount(amount=frac.numerator, asset=base, blockchain_instance=self.blockchain)
+            base = Asset.lookup(base, blockchain_instance=self.blockchain)
+            quote = Asset.lookup(quote, blockchain_instance=self.blockchain)
+            self._set_fraction(price, base, quote)
 
         elif (len(args) == 0 and isinstance(base, str) and isinstance(quote, str)):
             self["quote"] = Amount(quote, blockchain_instance=self.blockchain)
@@ -154,30 +173,126 @@ class Price(dict, BlockchainInstance):
             import re
             price = args[0]
             base_symbol, quote_symbol = assets_from_string(args[1])
-            base = Asset(base_symbol, blockchain_instance=self.blockchain)
-            quote = Asset(quote_symbol, blockchain_instance=self.blockchain)
-            frac = Fraction(float(price)).limit_denominator(10 ** base["precision"])
-            self["quote"] = Amount(amount=frac.denominator, asset=quote, blockchain_instance=self.blockchain)
-            self["base"] = Amount(amount=frac.numerator, asset=base, blockchain_instance=self.blockchain)
+            base = Asset.lookup(base_symbol, blockchain_instance=self.blockchain)
+            quote = Asset.lookup(quote_symbol, blockchain_instance=self.blockchain)
+            self._set_fraction(price, base, quote)
 
         else:
             raise ValueError("Couldn't parse 'Price'.")
 
+    def _set_fraction(self, price, base, quote):
+        """ Set ``base`` and ``quote`` to a fraction that approximates
+            ``price`` with at most the precision of ``base``
+        """
+        frac = Fraction(float(price)).limit_denominator(10 ** base["precision"])
+        self["quote"] = Amount(amount=frac.denominator, asset=quote, blockchain_instance=self.blockchain)
+        self["base"] = Amount(amount=frac.numerator, asset=base, blockchain_instance=self.blockchain)
+        self._keep_ratio((
+            frac.numerator * 10 ** base["precision"],
+            frac.denominator * 10 ** quote["precision"]))
+
+    def _amounts(self):
+        return (
+            dict.__getitem__(self, "base")["amount"],
+            dict.__getitem__(self, "quote")["amount"])
+
+    def _keep_ratio(self, ratio):
+        """ Remember the exact ratio of the current base and quote amounts
+        """
+        self._ratio = ratio
+        if ratio is not None:
+            self._ratio_of = self._amounts()
+
+    def _cached_ratio(self):
+        """ Returns the remembered ratio unless the amounts were changed in
+            place since (or ``None``)
+        """
+        if self._ratio is not None and self._ratio_of == self._amounts():
+            return self._ratio
+
     def __setitem__(self, key, value):
-        """ Here we set "price" if we change quote or base
+        """ Here we reset "price" if we change quote or base
         """
         dict.__setitem__(self, key, value)
-        if ("quote" in self and
-                "base" in self and
-                self["base"] and self["quote"]):  # don't derive price for deleted Orders
-            dict.__setitem__(self, "price", self._safedivide(
+        if key in ["base", "quote"]:
+            # Derived once it is used, see __missing__
+            dict.pop(self, "price", None)
+            self._ratio = None
+
+    def __missing__(self, key):
+        """ Derive "price" from quote and base
+        """
+        if (key == "price" and
+                dict.get(self, "base") and
+                dict.get(self, "quote")):  # don't derive price for deleted Orders
+            price = self._safedivide(
                 self["base"]["amount"],
-                self["quote"]["amount"]))
+                self["quote"]["amount"])
+            dict.__setitem__(self, "price", price)
+            return price
+        raise KeyError(key)
+
+    def _derive_price(self):
+        """ Store "price" so that it shows up like any other key
+        """
+        if not dict.__contains__(self, "price"):
+            try:
+                self.__missing__("price")
+            except KeyError:
+                pass
+
+    def __contains__(self, key):
+        if key == "price":
+            self._derive_price()
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        if key == "price":
+            self._derive_price()
+        return dict.get(self, key, default)
+
+    def __iter__(self):
+        self._derive_price()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._derive_price()
+        return dict.__len__(self)
+
+    def keys(self):
+        self._derive_price()
+        return dict.keys(self)
+
+    def values(self):
+        self._derive_price()
+        return dict.values(self)
+
+    def items(self):
+        self._derive_price()
+        return dict.items(self)
 
     def copy(self):
-        return Price(
+        price = Price(
             base=self["base"].copy(),
-            quote=self["quote"].copy())
+            quote=self["quote"].copy(),
+            blockchain_instance=self.blockchain)
+        price._keep_ratio(self._cached_ratio())
+        return price
+
+    def ratio(self):
+        """ Returns the price as exact ratio of integer ``base`` and
+            ``quote`` amounts (in base units of the assets)
+
+            Prices of the chain keep their amounts, other prices are
+            rounded to the precision of the assets.
+        """
+        ratio = self._cached_ratio()
+        if ratio is None:
+            ratio = (
+                int(round(self["base"]["amount"] * 10 ** self["base"]["asset"]["precision"])),
+                int(round(self["quote"]["amount"] * 10 ** self["quote"]["asset"]["precision"])))
+            self._keep_ratio(ratio)
+        return ratio
 
     def _safedivide(self, a, b):
         if b != 0.0:
@@ -188,38 +303,64 @@ class Price(dict, BlockchainInstance):
     def symbols(self):
         return self["base"]["symbol"], self["quote"]["symbol"]
 
+    def _view(self, base, quote, ratio=None):
+        """ Returns a new price of ``base`` and ``quote`` that shares their
+            assets and ``ratio`` instead of looking them up again
+        """
+        view = Price.__new__(Price)
+        view.blockchain = self.blockchain
+        dict.__setitem__(view, "base", _shallow_copy(base))
+        dict.__setitem__(view, "quote", _shallow_copy(quote))
+        view._keep_ratio(ratio)
+        return view
+
+    def inverted(self):
+        """ Returns the inverted price (e.g. ``BTS/USD`` for ``USD/BTS``)
+            as a new price. Only the amounts are copied, their assets and
+            the exact ratio are shared with this price.
+        """
+        ratio = self._cached_ratio()
+        return self._view(
+            self["quote"], self["base"],
+            None if ratio is None else (ratio[1], ratio[0]))
+
     def as_base(self, base):
         """ Returns the price instance so that the base asset is ``base``.
 
-            Note: This makes a copy of the object!
+            Note: This makes a copy of the amounts (see :func:`inverted`)!
         """
         if base == self["base"]["symbol"]:
-            return self.copy()
+            return self._view(self["base"], self["quote"], self._cached_ratio())
         elif base == self["quote"]["symbol"]:
-            return self.copy().invert()
+            return self.inverted()
         else:
             raise InvalidAssetException
 
     def as_quote(self, quote):
         """ Returns the price instance so that the quote asset is ``quote``.
 
-            Note: This makes a copy of the object!
+            Note: This makes a copy of the amounts (see :func:`inverted`)!
         """
         if quote == self["quote"]["symbol"]:
-            return self.copy()
+            return self._view(self["base"], self["quote"], self._cached_ratio())
         elif quote == self["base"]["symbol"]:
-            return self.copy().invert()
+            return self.inverted()
         else:
             raise InvalidAssetException
 
     def invert(self):
         """ Invert the price (e.g. go from ``USD/BTS`` into ``BTS/USD``)
         """
+        ratio = self._cached_ratio()
         tmp = self["quote"]
         self["quote"] = self["base"]
         self["base"] = tmp
+        if ratio is not None:
+            self._keep_ratio((ratio[1], ratio[0]))
         if "for_sale" in self and self["for_sale"]:
-            self["for_sale"] = Amount(self["for_sale"]['amount'] * self["price"], self["base"]["symbol"])
+            self["for_sale"] = Amount(
+                self["for_sale"]['amount'] * self["price"], self["base"]["symbol"],
+                blockchain_instance=self.blockchain)
         return self
 
     def json(self):
@@ -229,19 +370,16 @@ class Price(dict, BlockchainInstance):
             "quote": self["quote"].json()
         }
         """
-        quote = self["quote"]
-        base = self["base"]
-        frac = Fraction(
-            int(quote) / int(base)
-        ).limit_denominator(10 ** base["asset"]["precision"])
+        base_amount, quote_amount = self.ratio()
+        divisor = gcd(base_amount, quote_amount) or 1
         return {
             "base": {
-                "amount": int(frac.denominator),
-                "asset_id": base["asset"]["id"]
+                "amount": base_amount // divisor,
+                "asset_id": self["base"]["asset"]["id"]
             },
             "quote": {
-                "amount": int(frac.numerator),
-                "asset_id": quote["asset"]["id"]
+                "amount": quote_amount // divisor,
+                "asset_id": self["quote"]["asset"]["id"]
             }}
 
     def __repr__(self):
@@ -447,7 +585,8 @@ class Order(Price):
             """
             order = self.blockchain.rpc.get_objects([args[0]])[0]
             if order:
-                super(Order, self).__init__(order["sell_price"])
+                super(Order, self).__init__(
+                    order["sell_price"], blockchain_instance=self.blockchain)
                 self.update(order)
                 self["deleted"] = False
             else:
@@ -479,6 +618,7 @@ class Order(Price):
             super(Order, self).__init__(
                 Amount(args[0]["min_to_receive"], blockchain_instance=self.blockchain),
                 Amount(args[0]["amount_to_sell"], blockchain_instance=self.blockchain),
+                blockchain_instance=self.blockchain
             )
         else:
             # Try load Order as Price
@@ -559,6 +699,7 @@ class FilledOrder(Price):
                 order.get("price"),
                 base=kwargs.get("base"),
                 quote=kwargs.get("quote"),
+                blockchain_instance=self.blockchain
             )
             self.update(order)
             self["time"] = formatTimeString(order["date"])
@@ -571,6 +712,7 @@ class FilledOrder(Price):
             super(FilledOrder, self).__init__(
                 order,
                 base_asset=base_asset,
+                blockchain_instance=self.blockchain
             )
 
             # To be on the save side, store the entire order object in this
@@ -0,0 +1,241 @@
+import time
+import sqlite3
+import logging
+import threading
+from bitsharesapi import codec
+from .storage import SQLiteFile
+from .blockchainobject import FOREVER, encode_cached, decode_cached
+
+log = logging.getLogger(__name__)
+
+
+class CacheBackend(object):
+    """ Interface of stores that share the entries of
+        :class:`bitshares.blockchainobject.ObjectCache` between processes
+
+        Entries expire by wall-clock time, so that all processes agree on
+        the age of an entry.
+    """
+    def get(self, key):
+        """ Returns ``(value, age, expiration)`` of the entry ``key`` or
+            ``None`` if there is no such entry or if it has expired
+        """
+        raise NotImplementedError
+
+    def set(self, key, value, expiration, age=0):
+        """ Store ``value`` for ``expiration`` seconds (:attr:`FOREVER` for
+            no expiration, ``0`` removes the entry). ``age`` is the number
+            of seconds ``value`` has been known already.
+        """
+        raise NotImplementedError
+
+    def delete(self, key):
+        """ Remove the entry ``key``
+        """
+        raise NotImplementedError
+
+    def alias(self, alias, key):
+        """ Make ``alias`` refer to the entry ``key`` (backends that don't
+            store aliases leave them to the process that made them)
+        """
+        pass
+
+    def resolve(self, alias):
+        """ Returns the key ``alias`` refers to (or ``None``)
+        """
+        return None
+
+    def clear(self):
+        """ Remove all entries
+        """
+        raise NotImplementedError
+
+
+class SqliteCacheBackend(CacheBackend):
+    """ Cache backend in an SQLite database that all local processes can
+        read and write
+
+        :param str path: Database file (defaults to ``cache.sqlite`` in the
+            data directory of ``bitshares``)
+        :param str namespace: Keeps the entries of different chains apart
+        :param float timeout: Seconds to wait for a lock on the database
+        :param float purge_interval: Seconds between two removals of all
+            expired entries
+        :param bitshares.bitshares.BitShares blockchain_instance: BitShares
+            instance of the objects read from the database
+
+        Objects are stored as JSON, objects that can't be represented in
+        JSON are not shared. Aliases (e.g. account names and asset symbols)
+        are shared, too, and removed once the entry they refer to is gone.
+        Errors of the database are logged and treated like a cache miss.
+
+        .. code-block:: python
+
+            from bitshares import BitShares
+            bitshares = BitShares(shared_cache=True)
+
+        or
+
+        .. code-block:: python
+
+            from bitshares.blockchainobject import BlockchainObject
+            from bitshares.sharedcache import SqliteCacheBackend
+            BlockchainObject.set_cache_backend(
+                SqliteCacheBackend("/tmp/cache.sqlite", namespace=chain_id))
+    """
+    __tablename__ = "objects"
+    __aliastable__ = "aliases"
+
+    def __init__(
+        self,
+        path=None,
+        namespace="",
+        timeout=5.0,
+        purge_interval=60,
+        blockchain_instance=None,
+    ):
+        if path is None:
+            path = SQLiteFile(appname="bitshares", profile="cache").sqlite_file
+        self.path = path
+        self.namespace = namespace
+        self.timeout = timeout
+        self.purge_interval = purge_interval
+        self.blockchain_instance = blockchain_instance
+        self._local = threading.local()
+        self._last_purge = time.time()
+        self.create()
+
+    def connection(self):
+        """ Connection of the current thread
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def create(self):
+        connection = self.connection()
+        # Readers don't block writers
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS {} ("
+            "namespace TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "value TEXT NOT NULL, "
+            "stored REAL NOT NULL, "
+            "expires REAL, "
+            "PRIMARY KEY (namespace, key))".format(self.__tablename__))
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS {} ("
+            "namespace TEXT NOT NULL, "
+            "alias TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "PRIMARY KEY (namespace, alias))".format(self.__aliastable__))
+
+    def get(self, key):
+        now = time.time()
+        try:
+            row = self.connection().execute(
+                "SELECT value, stored, expires FROM {} "
+                "WHERE namespace=? AND key=?".format(self.__tablename__),
+                (self.namespace, str(key))).fetchone()
+        except sqlite3.Error as e:
+            log.warning("Cannot read shared cache: {}".format(e))
+            return None
+        if row is None:
+            return None
+        value, stored, expires = row
+        if expires is not None and expires <= now:
+            return None
+        value = decode_cached(
+            codec.loads(value), blockchain_instance=self.blockchain_instance)
+        if value is None:
+            return None
+        if expires is None:
+            return value, now - stored, FOREVER
+        return value, now - stored, expires - stored
+
+    def set(self, key, value, expiration, age=0):
+        if not expiration:
+            return self.delete(key)
+        try:
+            data = codec.dumps(encode_cached(value))
+        except (TypeError, ValueError, OverflowError):
+            return
+        now = time.time()
+        stored = now - age
+        expires = None if expiration == FOREVER else stored + expiration
+        try:
+            self.connection().execute(
+                "INSERT OR REPLACE INTO {} "
+                "(namespace, key, value, stored, expires) "
+                "VALUES (?, ?, ?, ?, ?)".format(self.__tablename__),
+                (self.namespace, str(key), data, stored, expires))
+            if now - self._last_purge >= self.purge_interval:
+                self.purge(now)
+        except sqlite3.Error as e:
+            log.warning("Cannot write shared cache: {}".format(e))
+
+    def delete(self, key):
+        try:
+            self.connection().execute(
+                "DELETE FROM {} WHERE namespace=? AND key=?".format(
+                    self.__tablename__),
+                (self.namespace, str(key)))
+            self.connection().execute(
+                "DELETE FROM {} WHERE namespace=? AND key=?".format(
+                    self.__aliastable__),
+                (self.namespace, str(key)))
+        except sqlite3.Error as e:
+            log.warning("Cannot write shared cache: {}".format(e))
+
+    def alias(self, alias, key):
+        try:
+            self.connection().execute(
+                "INSERT OR REPLACE INTO {} (namespace, alias, key) "
+                "VALUES (?, ?, ?)".format(self.__aliastable__),
+                (self.namespace, str(alias), str(key)))
+        except sqlite3.Error as e:
+            log.warning("Cannot write shared cache: {}".format(e))
+
+    def resolve(self, alias):
+        try:
+            row = self.connection().execute(
+                "SELECT key FROM {} WHERE namespace=? AND alias=?".format(
+                    self.__aliastable__),
+                (self.namespace, str(alias))).fetchone()
+        except sqlite3.Error as e:
+            log.warning("Cannot read shared cache: {}".format(e))
+            return None
+        return row[0] if row else None
+
+    def purge(self, now=None):
+        """ Remove all expired entries (of all namespaces)
+        """
+        if now is None:
+            now = time.time()
+        self._last_purge = now
+        self.connection().execute(
+            "DELETE FROM {} WHERE expires <= ?".format(self.__tablename__),
+            (now,))
+        # Aliases of removed entries
+        self.connection().execute(
+            "DELETE FROM {aliases} WHERE NOT EXISTS ("
+            "SELECT 1 FROM {objects} WHERE "
+            "{objects}.namespace={aliases}.namespace AND "
+            "{objects}.key={aliases}.key)".format(
+                aliases=self.__aliastable__, objects=self.__tablename__))
+
+    def clear(self):
+        for table in [self.__tablename__, self.__aliastable__]:
+            self.connection().execute(
+                "DELETE FROM {} WHERE namespace=?".format(table),
+                (self.namespace,))
+
+    def __len__(self):
+        return self.connection().execute(
+            "SELECT COUNT(*) FROM {} WHERE namespace=?".format(
+                self.__tablename__),
+            (self.namespace,)).fetchone()[0]
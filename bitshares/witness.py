@@ -31,6 +31,11 @@ class Witness(BlockchainObject):
         super(Witness, self).__init__(
             witness, blockchain_instance=self.blockchain)
 
+    @classmethod
+    def _fetch_many(cls, identifiers, **kwargs):
+        return cls._fetch_many_by_account(
+            identifiers, "get_witness_by_account", **kwargs)
+
     @property
     def account(self):
         return Account(
@@ -74,10 +79,8 @@ class Witnesses(list):
         self.schedule = self.blockchain.rpc.get_object(
             "2.12.0").get("current_shuffled_witnesses", [])
 
-        witnesses = [
-            Witness(x, lazy=lazy, blockchain_instance=self.blockchain)
-            for x in self.schedule
-        ]
+        witnesses = Witness.load_many(
+            self.schedule, lazy=lazy, blockchain_instance=self.blockchain)
 
         if only_active:
             account = Account(
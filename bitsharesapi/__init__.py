@@ -1,5 +1,12 @@
 __all__ = [
+    "aio",
+    "batch",
     "bitsharesnoderpc",
+    "codec",
+    "dispatch",
     "exceptions",
+    "nodepool",
+    "pipeline",
+    "ratelimit",
     "websocket",
 ]
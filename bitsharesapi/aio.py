@@ -0,0 +1,332 @@
+import ssl
+import asyncio
+import logging
+import websockets
+from itertools import cycle
+from grapheneapi.exceptions import RPCError
+from bitsharesbase.chains import known_chains
+from . import codec
+from .bitsharesnoderpc import Api
+from .exceptions import NumRetriesReached
+
+log = logging.getLogger(__name__)
+
+
+class AsyncBitSharesNodeRPC(object):
+    """ Asyncio client for a BitShares node that keeps a single websocket
+        open and multiplexes any number of in-flight calls over it.
+
+        Every JSON-RPC call is tagged with the ``id`` from
+        :func:`get_request_id` and resolved through its own future once
+        the matching reply arrives, so replies may come back in any order.
+
+        :param str urls: Either a single Websocket URL, or a list of URLs
+        :param str user: Username for Authentication
+        :param str password: Password for Authentication
+        :param int num_retries: Try x times to reconnect to a node on
+            disconnect, -1 for indefinitely
+        :param int max_size: Maximum size of a message received from the
+            node (defaults to unlimited)
+
+        .. code-block:: python
+
+            import asyncio
+            from bitsharesapi.aio import AsyncBitSharesNodeRPC
+
+            async def main():
+                rpc = AsyncBitSharesNodeRPC("wss://node.bitshares.eu")
+                await rpc.connect()
+                books = await asyncio.gather(*[
+                    rpc.get_order_book("1.3.0", quote, 25)
+                    for quote in ["1.3.113", "1.3.121", "1.3.861"]
+                ])
+                await rpc.close()
+
+            asyncio.get_event_loop().run_until_complete(main())
+
+        Push notifications (e.g. after ``set_subscribe_callback``) are put
+        into the :attr:`notifications` queue.
+    """
+
+    # Reuse the error mapping of the synchronous client
+    post_process_exception = Api.post_process_exception
+
+    def __init__(
+        self,
+        urls,
+        user="",
+        password="",
+        num_retries=-1,
+        max_size=None,
+        **kwargs
+    ):
+        self.user = user
+        self.password = password
+        self.num_retries = num_retries
+        self.max_size = max_size
+        self.api_id = {}
+
+        if isinstance(urls, cycle):
+            self.urls = urls
+        elif isinstance(urls, list):
+            self.urls = cycle(urls)
+        else:
+            self.urls = cycle([urls])
+
+        self.url = None
+        self.ws = None
+        self.notifications = asyncio.Queue()
+
+        self._request_id = 0
+        self._pending = dict()
+        self._reader = None
+        self._network = None
+        self._connect_lock = asyncio.Lock()
+
+    # -------------------------------------------------------------------------
+    # Connection handling
+    # -------------------------------------------------------------------------
+    @property
+    def connected(self):
+        return bool(self._reader and not self._reader.done())
+
+    async def connect(self):
+        """ Connect to the next node in ``urls`` and start reading replies
+            from it. Retries according to ``num_retries``.
+        """
+        cnt = 0
+        while True:
+            cnt += 1
+            self.url = next(self.urls)
+            log.debug("Trying to connect to node %s" % self.url)
+            try:
+                await self._connect(self.url)
+                await self._setup()
+                break
+            except (OSError, websockets.WebSocketException):
+                # Includes the ConnectionError of a connection lost during
+                # _setup()
+                if self.ws:
+                    await self.ws.close()
+                if self.num_retries >= 0 and cnt > self.num_retries:
+                    raise NumRetriesReached()
+                sleeptime = (cnt - 1) * 2 if cnt < 10 else 10
+                log.warning(
+                    "Lost connection to node during connect(): %s (%d/%d) "
+                    "Retrying in %d seconds"
+                    % (self.url, cnt, self.num_retries, sleeptime)
+                )
+                await asyncio.sleep(sleeptime)
+
+    async def _setup(self):
+        """ Login and identify the network of a new connection
+
+            The calls are not retried: :func:`reconnect` holds the connect
+            lock while it calls :func:`connect`, so reconnecting from here
+            would wait for the lock forever. :func:`connect` retries
+            instead.
+        """
+        if self.user and self.password:
+            await self._call(
+                "login", [self.user, self.password], {"api_id": 1},
+                retry=False)
+        if self._network is None:
+            props = await self._call(
+                "get_chain_properties", [], {}, retry=False)
+            self._network = self._known_chain(props["chain_id"])
+
+    async def _connect(self, url):
+        sslopt = None
+        if url[:3] == "wss":
+            sslopt = ssl.create_default_context()
+        self.ws = await websockets.connect(
+            url, ssl=sslopt, max_size=self.max_size)
+        self._reader = asyncio.ensure_future(self._read_messages(self.ws))
+
+    async def close(self):
+        """ Close the websocket and fail all calls still in flight
+        """
+        if self.ws:
+            await self.ws.close()
+        if self._reader:
+            await asyncio.wait([self._reader])
+
+    async def reconnect(self, ws=None):
+        """ Reconnect, unless some other call already did so after ``ws``
+            was lost
+        """
+        async with self._connect_lock:
+            if ws is not None and ws is not self.ws:
+                return
+            if self.ws:
+                await self.ws.close()
+            await self.connect()
+
+    async def _read_messages(self, ws):
+        """ Read all messages from ``ws`` and resolve the future waiting
+            for each reply's ``id``. Notices go to :attr:`notifications`.
+        """
+        try:
+            while True:
+                reply = await ws.recv()
+                try:
+                    data = codec.loads(reply)
+                except ValueError:
+                    log.error("API node returned invalid format. Expected JSON!")
+                    continue
+
+                if data.get("method") == "notice":
+                    self.notifications.put_nowait(data["params"])
+                    continue
+
+                _, future = self._pending.pop(data.get("id"), (None, None))
+                if future is None:
+                    log.debug("Received reply for unknown id: %s" % str(data))
+                elif not future.done():
+                    future.set_result(data)
+        except websockets.ConnectionClosed as e:
+            log.debug("Connection to {} closed: {}".format(self.url, str(e)))
+        finally:
+            # Everything still in flight on this socket is lost
+            for id, (_ws, future) in list(self._pending.items()):
+                if _ws is ws:
+                    self._pending.pop(id, None)
+                    if not future.done():
+                        future.set_exception(
+                            ConnectionError("Connection closed"))
+
+    def get_request_id(self):
+        self._request_id += 1
+        return self._request_id
+
+    # -------------------------------------------------------------------------
+    # RPC Calls
+    # -------------------------------------------------------------------------
+    async def rpcexec(self, payload):
+        """ Send the payload and wait for the reply with the same ``id``
+
+            :param json payload: Payload data
+            :raises ConnectionError: if the connection is lost before the
+                reply arrived
+        """
+        if not self.connected:
+            await self.reconnect()
+        ws = self.ws
+        future = asyncio.get_event_loop().create_future()
+        self._pending[payload["id"]] = (ws, future)
+        try:
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(codec.dumps(payload))
+            await ws.send(codec.dumps(payload))
+            return await future
+        except websockets.ConnectionClosed:
+            raise ConnectionError("Connection closed")
+        finally:
+            self._pending.pop(payload["id"], None)
+
+    def parse_response(self, ret):
+        if "error" in ret:
+            if "detail" in ret["error"]:
+                raise RPCError(ret["error"]["detail"])
+            else:
+                raise RPCError(ret["error"]["message"])
+        else:
+            return ret["result"]
+
+    def __getattr__(self, name):
+        """ Map all methods to RPC calls and pass through the arguments
+        """
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        async def method(*args, **kwargs):
+            return await self._call(name, args, kwargs)
+        return method
+
+    async def _call(self, name, args, kwargs, retry=True):
+        """ Call ``name`` and return its (mapped) result
+
+            :param bool retry: Reconnect and call again if the connection
+                is lost (according to ``num_retries``), otherwise raise
+                ``ConnectionError``
+        """
+        if "api_id" in kwargs:
+            api_id = kwargs["api_id"]
+        elif "api" in kwargs:
+            api_id = self.api_id.get(kwargs["api"]) or kwargs["api"]
+        else:
+            api_id = 0
+
+        cnt = 0
+        while True:
+            cnt += 1
+            query = {"method": "call",
+                     "params": [api_id, name, list(args)],
+                     "jsonrpc": "2.0",
+                     "id": self.get_request_id()}
+            ws = self.ws
+            try:
+                if not retry and not self.connected:
+                    raise ConnectionError("Connection closed")
+                reply = await self.rpcexec(query)
+                break
+            except ConnectionError as e:
+                if not retry:
+                    raise
+                if self.num_retries >= 0 and cnt > self.num_retries:
+                    raise NumRetriesReached()
+                log.warning(str(e))
+                log.warning("Reconnecting ...")
+                await self.reconnect(ws)
+
+        try:
+            return self.parse_response(reply)
+        except RPCError as e:
+            self.post_process_exception(e)
+
+    # -------------------------------------------------------------------------
+    # Helpers (see :class:`bitsharesapi.bitsharesnoderpc.BitSharesNodeRPC`)
+    # -------------------------------------------------------------------------
+    @property
+    def chain_params(self):
+        return self._network
+
+    async def get_network(self):
+        """ Identify the connected network. This call returns a
+            dictionary with keys chain_id, core_symbol and prefix
+        """
+        props = await self.get_chain_properties()
+        return self._known_chain(props["chain_id"])
+
+    def _known_chain(self, chain_id):
+        for k, v in known_chains.items():
+            if v["chain_id"] == chain_id:
+                return v
+        raise Exception("Connecting to unknown network!")
+
+    async def get_account(self, name, **kwargs):
+        """ Get full account details from account name or id
+
+            :param str name: Account name or account id
+        """
+        if len(name.split(".")) == 3:
+            return (await self.get_objects([name]))[0]
+        else:
+            return await self.get_account_by_name(name, **kwargs)
+
+    async def get_asset(self, name, **kwargs):
+        """ Get full asset from name of id
+
+            :param str name: Symbol name or asset id (e.g. 1.3.0)
+        """
+        if len(name.split(".")) == 3:
+            return (await self.get_objects([name], **kwargs))[0]
+        else:
+            return (await self.lookup_asset_symbols([name], **kwargs))[0]
+
+    async def get_object(self, o, **kwargs):
+        """ Get object with id ``o``
+
+            :param str o: Full object id
+        """
+        return (await self.get_objects([o], **kwargs))[0]
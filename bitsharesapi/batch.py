@@ -0,0 +1,238 @@
+import time
+import logging
+import threading
+
+log = logging.getLogger(__name__)
+
+
+class PendingObjects(object):
+    """ Result of a ``get_objects`` call made inside of
+        :func:`ObjectCoalescer.batch`. The objects are only requested from
+        the node once the result is accessed for the first time (or the
+        batch is left), together with every other call of the same batch.
+    """
+    def __init__(self, batch, ids):
+        self._batch = batch
+        self._ids = list(ids)
+        self._result = None
+
+    @property
+    def resolved(self):
+        return self._result is not None
+
+    def result(self):
+        """ Returns the objects as a list (and resolves the batch if needed)
+        """
+        if self._result is None:
+            self._batch.flush()
+        return self._result
+
+    def _resolve(self, objects):
+        self._result = [objects.get(id) for id in self._ids]
+
+    def __getitem__(self, key):
+        return self.result()[key]
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self.result())
+
+    def __contains__(self, item):
+        return item in self.result()
+
+    def __eq__(self, other):
+        if isinstance(other, PendingObjects):
+            other = other.result()
+        return self.result() == other
+
+    def __bool__(self):
+        return bool(self._ids)
+
+    def __repr__(self):
+        if self._result is None:
+            return "<PendingObjects {}>".format(self._ids)
+        return repr(self._result)
+
+
+class ObjectsBatch(object):
+    """ Collects all ``get_objects`` calls made within a ``with
+        rpc.batch():`` block, see :func:`ObjectCoalescer.batch`.
+    """
+    def __init__(self, coalescer):
+        self.coalescer = coalescer
+        self.pending = []
+
+    def add(self, ids):
+        pending = PendingObjects(self, ids)
+        self.pending.append(pending)
+        return pending
+
+    def flush(self):
+        """ Request all objects that have not been resolved yet with as
+            few ``get_objects`` calls as possible
+        """
+        pending, self.pending = self.pending, []
+        ids = [id for p in pending for id in p._ids]
+        if not ids:
+            return
+        objects = self.coalescer.fetch_unique(ids)
+        for p in pending:
+            p._resolve(objects)
+
+
+class _Window(object):
+    """ The ids requested by concurrent callers within one window
+    """
+    def __init__(self):
+        self.ids = []
+        self.closed = False
+        self.event = threading.Event()
+        self.objects = None
+        self.error = None
+
+
+class ObjectCoalescer(object):
+    """ Coalesces ``get_objects`` calls into as few RPC calls as possible.
+
+        :param callable fetch: The actual ``get_objects`` RPC call
+        :param float window: Time (in seconds) to wait for concurrent calls
+            from other threads to join the same request. ``0`` (default)
+            disables time-based coalescing.
+        :param int max_batch: Maximum number of ids to request with a single
+            call
+
+        Calls can be coalesced in two ways:
+
+        * Implicitly, by setting a ``window``. All ``get_objects`` calls
+          issued (from any thread) within the window are sent as a single
+          call and the reply is split back to the callers.
+        * Explicitly, by using a ``batch()`` block. Within the block,
+          ``get_objects`` returns instances of :class:`PendingObjects` that
+          are resolved together, once any of them is accessed or the block
+          is left:
+
+          .. code-block:: python
+
+              with rpc.batch():
+                  results = [rpc.get_objects([id]) for id in ids]
+              accounts = [r[0] for r in results]
+
+        Calls that come with additional keyword arguments are never
+        coalesced.
+    """
+    def __init__(self, fetch, window=0.0, max_batch=100):
+        self.fetch = fetch
+        self.window = window
+        self.max_batch = max_batch
+
+        self._lock = threading.Lock()
+        self._window = None
+        self._local = threading.local()
+
+    def batch(self):
+        return _BatchContext(self)
+
+    def prefetched(self, objects):
+        """ Within the returned context, ``get_objects`` calls of the
+            current thread for ids of ``objects`` (a dictionary that maps
+            ids to objects) are answered without calling the node
+        """
+        return _PrefetchContext(self, objects)
+
+    @property
+    def current_batch(self):
+        return getattr(self._local, "batch", None)
+
+    def get_objects(self, ids, **kwargs):
+        if kwargs:
+            return self.fetch(ids, **kwargs)
+        prefetched = getattr(self._local, "prefetched", None)
+        if prefetched and all(id in prefetched for id in ids):
+            return [prefetched[id] for id in ids]
+        batch = self.current_batch
+        if batch is not None:
+            return batch.add(ids)
+        if self.window > 0:
+            return self._get_windowed(ids)
+        return self.fetch(ids)
+
+    def fetch_unique(self, ids):
+        """ Request every distinct id in ``ids`` and return a dictionary that
+            maps the ids to the objects
+        """
+        unique = list(dict.fromkeys(ids))
+        objects = dict()
+        for i in range(0, len(unique), self.max_batch):
+            chunk = unique[i:i + self.max_batch]
+            objects.update(zip(chunk, self.fetch(chunk)))
+        return objects
+
+    def _get_windowed(self, ids):
+        with self._lock:
+            window = self._window
+            leader = window is None or window.closed
+            if leader:
+                window = self._window = _Window()
+            window.ids.extend(ids)
+            if len(window.ids) >= self.max_batch:
+                # Callers arriving from now on open a new window
+                window.closed = True
+
+        if leader:
+            time.sleep(self.window)
+            with self._lock:
+                window.closed = True
+                if self._window is window:
+                    self._window = None
+            log.debug("Coalesced {} ids into one request".format(
+                len(window.ids)))
+            try:
+                window.objects = self.fetch_unique(window.ids)
+            except Exception as e:
+                window.error = e
+            finally:
+                window.event.set()
+        else:
+            window.event.wait()
+
+        if window.error is not None:
+            raise window.error
+        return [window.objects.get(id) for id in ids]
+
+
+class _BatchContext(object):
+    def __init__(self, coalescer):
+        self.coalescer = coalescer
+        self.batch = None
+
+    def __enter__(self):
+        # Nested batches join the outer batch
+        if self.coalescer.current_batch is None:
+            self.batch = ObjectsBatch(self.coalescer)
+            self.coalescer._local.batch = self.batch
+        return self.coalescer.current_batch
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.batch is not None:
+            self.coalescer._local.batch = None
+            if exc_type is None:
+                self.batch.flush()
+
+
+class _PrefetchContext(object):
+    def __init__(self, coalescer, objects):
+        self.coalescer = coalescer
+        self.objects = objects
+        self.outer = None
+
+    def __enter__(self):
+        self.outer = getattr(self.coalescer._local, "prefetched", None)
+        prefetched = dict(self.outer or {})
+        prefetched.update(self.objects)
+        self.coalescer._local.prefetched = prefetched
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.coalescer._local.prefetched = self.outer
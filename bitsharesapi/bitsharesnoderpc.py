@@ -1,10 +1,31 @@
 import re
 from grapheneapi.api import Api as Original_Api
+from grapheneapi.exceptions import RPCError
+from grapheneapi.http import Http
 from bitsharesbase.chains import known_chains
-from . import exceptions
+from . import codec, exceptions
+from .batch import ObjectCoalescer
+from .nodepool import NodePool
+from .pipeline import Pipeline
+from .ratelimit import RateLimiter
+from .websocket import RPCWebsocket
+
+
+class RPCHttp(codec.CodecRpc, Http):
+    """ HTTP connection of :class:`bitsharesapi.bitsharesnoderpc.BitSharesNodeRPC`
+
+        Replies are decoded with :mod:`bitsharesapi.codec`.
+    """
 
 
 class Api(Original_Api):
+    def updated_connection(self):
+        if self.url[:2] == "ws":
+            return RPCWebsocket(self.url, **self._kwargs)
+        elif self.url[:4] == "http":
+            return RPCHttp(self.url, **self._kwargs)
+        return super().updated_connection()
+
     def post_process_exception(self, e):
         msg = exceptions.decodeRPCErrorMsg(e).strip()
         if msg == "missing required active authority":
@@ -22,6 +43,156 @@ class Api(Original_Api):
 
 
 class BitSharesNodeRPC(Api):
+    """ RPC connection to a BitShares node
+
+        :param float coalesce_window: Time (in seconds) within which
+            concurrent ``get_objects`` calls are merged into a single call
+            (defaults to ``0``, i.e. disabled). See
+            :class:`bitsharesapi.batch.ObjectCoalescer`.
+        :param bool node_pool: Keep connections to all ``urls`` and send
+            each call to the best performing node (defaults to ``False``).
+            Can also be an instance of
+            :class:`bitsharesapi.nodepool.NodePool`.
+        :param list write_urls: Nodes that receive broadcasts when using
+            ``node_pool`` (defaults to all nodes)
+        :param list hedge: Hedge these reads across two nodes of the
+            ``node_pool`` (``True`` for ``get_order_book``, ``get_ticker``
+            and ``get_limit_orders``)
+        :param float hedge_percentile: Latency percentile of the best node
+            after which a hedged read is also sent to the second best node
+        :param dict rate_limit: Client-side token bucket and concurrency
+            window per node and API (``True`` for the default limits), see
+            :class:`bitsharesapi.ratelimit.RateLimiter`. The current limits
+            are returned by :func:`rate_limits`.
+    """
+
+    def __init__(self, urls, *args, **kwargs):
+        self.coalescer = ObjectCoalescer(
+            self._get_objects,
+            window=kwargs.pop("coalesce_window", 0)
+        )
+        self.pool = kwargs.pop("node_pool", None)
+        write_urls = kwargs.pop("write_urls", None)
+        hedge = kwargs.pop("hedge", None)
+        hedge_percentile = kwargs.pop("hedge_percentile", 95)
+        self.rate_limit = kwargs.pop("rate_limit", None)
+        self._rate_limiters = dict()
+        if self.pool and not isinstance(self.pool, NodePool):
+            pool_kwargs = dict(kwargs)
+            pool_kwargs.pop("num_retries", None)
+            if len(args) > 0:
+                pool_kwargs["user"] = args[0]
+            if len(args) > 1:
+                pool_kwargs["password"] = args[1]
+            self.pool = NodePool(
+                urls,
+                write_urls=write_urls,
+                hedge=hedge,
+                hedge_percentile=hedge_percentile,
+                rate_limit=self.rate_limit,
+                **pool_kwargs
+            )
+        super().__init__(urls, *args, **kwargs)
+
+    def connect(self):
+        if self.pool:
+            self.pool.connect()
+            self.register_apis()
+        else:
+            super().connect()
+
+    @property
+    def connection(self):
+        if self.pool:
+            return self.pool.best().connection
+        return super().connection
+
+    def __getattr__(self, name):
+        pool = self.__dict__.get("pool")
+        if pool is None:
+            func = super().__getattr__(name)
+            limiter = self.rate_limiter()
+            if limiter is None:
+                return func
+            return lambda *args, **kwargs: limiter.call(
+                name, func, *args, **kwargs)
+
+        def func(*args, **kwargs):
+            try:
+                return pool.call(name, *args, **kwargs)
+            except RPCError as e:
+                self.post_process_exception(e)
+        return func
+
+    def rate_limiter(self, url=None):
+        """ Returns the :class:`bitsharesapi.ratelimit.RateLimiter` of the
+            node ``url`` (defaults to the current node), or ``None`` if
+            calls are not limited
+        """
+        if not self.__dict__.get("rate_limit"):
+            return None
+        pool = self.__dict__.get("pool")
+        if pool:
+            return pool.best().limiter
+        url = url or self.url
+        if url not in self._rate_limiters:
+            self._rate_limiters[url] = RateLimiter(self.rate_limit)
+        return self._rate_limiters[url]
+
+    def rate_limits(self):
+        """ Returns the current limits of all nodes, indexed by url
+        """
+        if self.pool:
+            return {
+                node.url: node.limiter.json() for node in self.pool.nodes
+                if node.limiter}
+        return {
+            url: limiter.json()
+            for url, limiter in self._rate_limiters.items()}
+
+    def error_url(self):
+        limiter = self.rate_limiter()
+        if limiter:
+            limiter.record_error()
+        super().error_url()
+
+    def batch(self):
+        """ Collect all ``get_objects`` calls within a ``with`` block
+            into as few calls as possible
+
+            Objects of :mod:`bitshares` that are created by id within the
+            block (e.g. ``Account("1.2.100")``) are requested together, too,
+            and loaded once they are used.
+
+            .. code-block:: python
+
+                with rpc.batch():
+                    results = [rpc.get_objects([id]) for id in ids]
+        """
+        return self.coalescer.batch()
+
+    def pipeline(self, max_inflight=100):
+        """ Send all calls made on the returned
+            :class:`bitsharesapi.pipeline.Pipeline` back-to-back and collect
+            the replies afterwards
+
+            .. code-block:: python
+
+                with rpc.pipeline() as pipeline:
+                    futures = [pipeline.get_block(n) for n in range(1, 101)]
+                blocks = [f.result() for f in futures]
+        """
+        return Pipeline(self, max_inflight=max_inflight)
+
+    def _get_objects(self, ids, **kwargs):
+        return self.__getattr__("get_objects")(ids, **kwargs)
+
+    def get_objects(self, ids, **kwargs):
+        """ Get objects with ids ``ids``
+
+            :param list ids: Full object ids
+        """
+        return self.coalescer.get_objects(ids, **kwargs)
 
     def get_network(self):
         """ Identify the connected network. This call returns a
@@ -0,0 +1,190 @@
+""" JSON encoding and decoding for the websocket and RPC layers.
+
+    The fastest available implementation is used: `orjson
+    <https://github.com/ijl/orjson>`_ or `ujson
+    <https://github.com/ultrajson/ultrajson>`_ if installed, falling back to
+    the ``json`` module of the standard library otherwise. Payloads that the
+    fast implementations refuse (e.g. integers beyond 64 bits or control
+    characters in strings) are handled by the standard library.
+
+    .. code-block:: python
+
+        from bitsharesapi import codec
+        codec.set_codec("json")   # force the standard library
+        print(codec.get_codec().name)
+"""
+import json
+import logging
+from grapheneapi.exceptions import RPCError
+
+log = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+
+class JsonCodec(object):
+    """ The ``json`` module of the standard library
+    """
+    name = "json"
+
+    def loads(self, data):
+        return json.loads(data, strict=False)
+
+    def dumps(self, obj):
+        """ Returns ``obj`` encoded as ``str``
+        """
+        return json.dumps(obj, ensure_ascii=False)
+
+    def dumps_bytes(self, obj):
+        """ Returns ``obj`` encoded as UTF-8 ``bytes``
+        """
+        return self.dumps(obj).encode("utf8")
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def loads(self, data):
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            return JsonCodec.loads(self, data)
+
+    def dumps(self, obj):
+        return self.dumps_bytes(obj).decode("utf8")
+
+    def dumps_bytes(self, obj):
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            return JsonCodec.dumps(self, obj).encode("utf8")
+
+
+class UjsonCodec(JsonCodec):
+    name = "ujson"
+
+    def loads(self, data):
+        try:
+            return ujson.loads(data)
+        except ValueError:
+            return JsonCodec.loads(self, data)
+
+    def dumps(self, obj):
+        try:
+            return ujson.dumps(obj, ensure_ascii=False)
+        except (TypeError, OverflowError):
+            return JsonCodec.dumps(self, obj)
+
+
+codecs = {"json": JsonCodec}
+if ujson:
+    codecs["ujson"] = UjsonCodec
+if orjson:
+    codecs["orjson"] = OrjsonCodec
+
+_codec = None
+
+
+def get_codec():
+    """ Returns the codec in use
+    """
+    return _codec
+
+
+def set_codec(name=None):
+    """ Select the codec by name (``orjson``, ``ujson`` or ``json``). If no
+        name is given, the fastest available codec is used.
+
+        :raises ValueError: if the codec is not available
+    """
+    global _codec
+    if name is None:
+        for name in ["orjson", "ujson", "json"]:
+            if name in codecs:
+                break
+    if name not in codecs:
+        raise ValueError("JSON codec {} is not available".format(name))
+    _codec = codecs[name]()
+    return _codec
+
+
+class CodecRpc(object):
+    """ Mixin for :class:`grapheneapi.rpc.Rpc` connections that decodes
+        replies with the codec in use and only encodes calls and replies for
+        the log if debug logging is enabled
+    """
+    def parse_response(self, query, log_on_debug=True):
+        if isinstance(query, dict):
+            ret = query
+        else:
+            try:
+                ret = loads(query)
+            except ValueError:
+                raise ValueError(
+                    "Client returned invalid format. Expected JSON!")
+
+        if log_on_debug and log.isEnabledFor(logging.DEBUG):
+            log.debug(query if isinstance(query, str) else dumps(query))
+
+        if "error" in ret:
+            error = ret["error"]
+            if "detail" in error:
+                raise RPCError(error["detail"])
+            if error["message"] == "Execution error":
+                text = error["data"]["stack"][0]["format"]
+                data = error["data"]["stack"][0]["data"]
+                text = text.replace("${", "{")
+                raise RPCError(text.format(**data))
+            raise RPCError(error["message"])
+        return ret["result"]
+
+    def __getattr__(self, name):
+        """ Map all methods to RPC calls and pass through the arguments
+        """
+        def method(*args, **kwargs):
+            if "api_id" in kwargs:
+                api_id = kwargs["api_id"]
+            elif "api" in kwargs:
+                api_id = self.api_id.get(kwargs["api"]) or kwargs["api"]
+            else:
+                api_id = 0
+
+            # let's be able to define the num_retries per query
+            self.num_retries = kwargs.get("num_retries", self.num_retries)
+
+            query = {
+                "method": "call",
+                "params": [api_id, name, list(args)],
+                "jsonrpc": "2.0",
+                "id": self.get_request_id(),
+            }
+            debug = log.isEnabledFor(logging.DEBUG)
+            if debug:
+                log.debug(dumps(query))
+            response = self.rpcexec(query)
+            return self.parse_response(response, log_on_debug=debug)
+
+        return method
+
+
+def loads(data):
+    return _codec.loads(data)
+
+
+def dumps(obj):
+    return _codec.dumps(obj)
+
+
+def dumps_bytes(obj):
+    return _codec.dumps_bytes(obj)
+
+
+set_codec()
@@ -0,0 +1,260 @@
+import time
+import logging
+import threading
+import traceback
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+#: Wait for room in the queue (slows down reading from the websocket)
+BLOCK = "block"
+#: Drop the oldest notice of the queue
+DROP_OLDEST = "drop-oldest"
+#: Replace a queued notice with the same key, block if there is none
+COALESCE = "coalesce"
+
+OVERFLOW_POLICIES = [BLOCK, DROP_OLDEST, COALESCE]
+
+
+class _Entry(object):
+    __slots__ = ["key", "callback", "payload", "time"]
+
+    def __init__(self, key, callback, payload):
+        self.key = key
+        self.callback = callback
+        self.payload = payload
+        self.time = time.time()
+
+
+class _EventQueue(object):
+    """ Notices of one event that wait for one worker
+    """
+    def __init__(self):
+        self.entries = deque()
+        # Most recent queued entry per key
+        self.latest = dict()
+
+    def append(self, entry):
+        self.entries.append(entry)
+        self.latest[entry.key] = entry
+
+    def popleft(self):
+        entry = self.entries.popleft()
+        if self.latest.get(entry.key) is entry:
+            del self.latest[entry.key]
+        return entry
+
+
+class EventStats(object):
+    """ Counters of a single event
+    """
+    def __init__(self):
+        self.queued = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_depth = 0
+
+    def json(self):
+        return {
+            "queued": self.queued,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "max_depth": self.max_depth,
+        }
+
+
+class _Worker(object):
+    """ A thread with one bounded queue per event
+    """
+    def __init__(self, dispatcher, index):
+        self.dispatcher = dispatcher
+        self.queues = dict()
+        self.turn = 0
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(
+            target=self.run,
+            name="notification-dispatch-{}".format(index))
+        self.thread.daemon = True
+
+    def queue(self, event):
+        if event not in self.queues:
+            self.queues[event] = _EventQueue()
+        return self.queues[event]
+
+    def run(self):
+        dispatcher = self.dispatcher
+        while True:
+            with self.condition:
+                entry = None
+                while entry is None:
+                    # Take turns between the events so that a busy event
+                    # does not starve the others
+                    events = list(self.queues)
+                    for i in range(len(events)):
+                        event = events[(self.turn + i) % len(events)]
+                        if self.queues[event].entries:
+                            entry = self.queues[event].popleft()
+                            self.turn += i + 1
+                            break
+                    else:
+                        if dispatcher.stopped:
+                            return
+                        self.condition.wait()
+                self.condition.notify_all()
+            dispatcher._deliver(event, entry)
+
+
+class NotificationDispatcher(object):
+    """ Delivers notices to their callbacks on a pool of worker threads
+        instead of the thread that reads from the websocket.
+
+        :param int workers: Number of worker threads
+        :param int maxsize: Maximum number of queued notices per event and
+            worker
+        :param str overflow: What to do with a new notice if its queue is
+            full, one of ``block`` (default), ``drop-oldest`` or
+            ``coalesce``
+        :param list coalesce: Events that only deliver the latest state per
+            key: a notice replaces a still queued notice with the same key,
+            regardless of the queue size
+
+        Each notice comes with a key (e.g. the object id). All notices with
+        the same key are handled by the same worker and are thus delivered
+        in the order they were received. Per event, the number of queued
+        notices, the age of the oldest queued notice and the number of
+        dropped and coalesced notices are available through :func:`stats`.
+
+        Coalescing lets consumers of busy objects keep up with bursts: as
+        long as the consumer is fast enough, every state is delivered, once
+        it falls behind, intermediate states of the same object are merged
+        into the latest one.
+
+        .. code-block:: python
+
+            from bitsharesapi.dispatch import NotificationDispatcher
+            from bitsharesapi.websocket import BitSharesWebsocket
+            ws = BitSharesWebsocket(
+                "wss://node.bitshares.eu",
+                objects=["2.1.0", "1.7.x"],
+                on_object=print,
+                dispatcher=NotificationDispatcher(
+                    workers=4, overflow="drop-oldest"))
+            ws.run_forever()
+    """
+    def __init__(self, workers=4, maxsize=1000, overflow=BLOCK, coalesce=[]):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError("Unknown overflow policy {}".format(overflow))
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.coalesce = set(coalesce)
+        self.stopped = False
+        self.workers = [_Worker(self, i) for i in range(max(workers, 1))]
+        self.event_stats = dict()
+        self._started = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            for worker in self.workers:
+                worker.thread.start()
+
+    def stop(self, wait=True):
+        """ Stop the workers once all queued notices are delivered
+        """
+        self.stopped = True
+        for worker in self.workers:
+            with worker.condition:
+                worker.condition.notify_all()
+        if wait:
+            for worker in self.workers:
+                if worker.thread.is_alive() and (
+                    worker.thread is not threading.current_thread()
+                ):
+                    worker.thread.join()
+
+    def stats_for(self, event):
+        if event not in self.event_stats:
+            with self._lock:
+                self.event_stats.setdefault(event, EventStats())
+        return self.event_stats[event]
+
+    def put(self, event, key, callback, payload):
+        """ Queue ``payload`` to be delivered to ``callback``
+
+            :param str event: Name of the event (e.g. ``on_object``)
+            :param key: Notices with the same key are delivered in order
+            :param callable callback: Called with ``payload``
+        """
+        if not self._started:
+            self.start()
+        stats = self.stats_for(event)
+        worker = self.workers[hash(key) % len(self.workers)]
+        entry = _Entry(key, callback, payload)
+        with worker.condition:
+            queue = worker.queue(event)
+            if event in self.coalesce and key in queue.latest:
+                queue.latest[key].payload = payload
+                stats.coalesced += 1
+                return
+            while len(queue.entries) >= self.maxsize:
+                if self.overflow == DROP_OLDEST:
+                    queue.popleft()
+                    stats.dropped += 1
+                elif self.overflow == COALESCE and key in queue.latest:
+                    queue.latest[key].payload = payload
+                    stats.coalesced += 1
+                    return
+                else:
+                    worker.condition.wait()
+            queue.append(entry)
+            stats.queued += 1
+            stats.max_depth = max(stats.max_depth, len(queue.entries))
+            worker.condition.notify_all()
+
+    def _deliver(self, event, entry):
+        stats = self.stats_for(event)
+        error = False
+        try:
+            entry.callback(entry.payload)
+        except Exception as e:
+            error = True
+            log.critical("Error in {}: {}\n\n{}".format(
+                event, str(e), traceback.format_exc()))
+        with self._lock:
+            stats.delivered += 1
+            stats.errors += error
+
+    def depth(self, event):
+        """ Number of queued notices of ``event``
+        """
+        return sum(
+            len(worker.queues[event].entries) for worker in self.workers
+            if event in worker.queues)
+
+    def lag(self, event):
+        """ Age in seconds of the oldest queued notice of ``event``
+        """
+        oldest = [
+            worker.queues[event].entries[0].time for worker in self.workers
+            if event in worker.queues and worker.queues[event].entries]
+        if not oldest:
+            return 0.0
+        return time.time() - min(oldest)
+
+    def stats(self):
+        """ Returns the counters, depth and lag of all events, indexed by
+            event name
+        """
+        ret = dict()
+        for event, stats in list(self.event_stats.items()):
+            ret[event] = stats.json()
+            ret[event]["depth"] = self.depth(event)
+            ret[event]["lag"] = self.lag(event)
+        return ret
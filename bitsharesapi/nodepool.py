@@ -0,0 +1,464 @@
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from grapheneapi.exceptions import RPCError
+from .exceptions import NumRetriesReached
+from .ratelimit import RateLimiter
+from .websocket import RPCWebsocket
+
+log = logging.getLogger(__name__)
+
+#: Calls that change the state of the chain and are only sent to
+#: :attr:`NodePool.write_urls`
+WRITE_METHODS = [
+    "broadcast_transaction",
+    "broadcast_transaction_synchronous",
+    "broadcast_transaction_with_callback",
+    "broadcast_block",
+]
+
+#: Latency-critical reads that are hedged by default if hedging is enabled
+HEDGE_METHODS = [
+    "get_order_book",
+    "get_ticker",
+    "get_limit_orders",
+]
+
+
+class NodeStats(object):
+    """ Health statistics of a single node
+
+        :param int samples: Number of latency samples to keep
+        :param float decay: Weight of older calls in the error rate
+    """
+    def __init__(self, samples=100, decay=0.9):
+        self.latencies = deque(maxlen=samples)
+        self.decay = decay
+        self.calls = 0
+        self.errors = 0
+        self.error_rate = 0.0
+        self.head_block_number = None
+        self.lag = 0
+        self._sorted = None
+        self._lock = threading.Lock()
+
+    def record_success(self, latency):
+        with self._lock:
+            self.calls += 1
+            self.latencies.append(latency)
+            self.error_rate *= self.decay
+            self._sorted = None
+
+    def record_error(self):
+        with self._lock:
+            self.calls += 1
+            self.errors += 1
+            self.error_rate = self.error_rate * self.decay + (1 - self.decay)
+
+    def percentile(self, p):
+        """ Returns the ``p``-th percentile (0-100) of the latency in seconds,
+            or ``None`` if no call has been recorded yet
+        """
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = sorted(self.latencies)
+            latencies = self._sorted
+        if not latencies:
+            return None
+        index = int(round(p / 100.0 * (len(latencies) - 1)))
+        return latencies[index]
+
+    def json(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": self.error_rate,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "head_block_number": self.head_block_number,
+            "lag": self.lag,
+        }
+
+
+class Node(object):
+    """ A warm connection to one node of a :class:`NodePool`
+
+        :param rate_limit: Limits of
+            :class:`bitsharesapi.ratelimit.RateLimiter` (``True`` for the
+            default limits)
+    """
+    def __init__(self, url, rate_limit=None, **kwargs):
+        self.url = url
+        self.stats = NodeStats()
+        self.limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.connected = False
+        self.down_until = 0
+        self._kwargs = kwargs
+        self.connection = self._new_connection()
+
+    def _new_connection(self):
+        if self.url[:2] == "ws":
+            return RPCWebsocket(self.url, **self._kwargs)
+        elif self.url[:4] == "http":
+            from .bitsharesnoderpc import RPCHttp
+            return RPCHttp(self.url, **self._kwargs)
+        raise ValueError("Only support http(s) and ws(s) connections!")
+
+    @property
+    def is_up(self):
+        return time.time() >= self.down_until
+
+    def connect(self):
+        self.connection.connect()
+        self.connected = True
+        self.down_until = 0
+
+    def disconnect(self):
+        if self.connected:
+            self.connected = False
+            self.connection.disconnect()
+
+    def call(self, name, *args, **kwargs):
+        """ Execute a call on this node and record its latency
+        """
+        if not self.connected:
+            self.connect()
+        func = self.connection.__getattr__(name)
+        start = time.time()
+        try:
+            if self.limiter:
+                result = self.limiter.call(name, func, *args, **kwargs)
+            else:
+                result = func(*args, **kwargs)
+        except RPCError:
+            # The node is healthy, the call is not
+            self.stats.record_success(time.time() - start)
+            raise
+        except Exception:
+            self.stats.record_error()
+            if self.limiter:
+                self.limiter.record_error()
+            raise
+        self.stats.record_success(time.time() - start)
+        return result
+
+    def abandon(self, future):
+        """ Stop waiting for the call of ``future`` that is in flight on
+            this node. A websocket answers one call at a time, so later
+            calls use a new connection and the current one is closed once
+            the abandoned call has returned.
+        """
+        if not isinstance(self.connection, RPCWebsocket):
+            return
+        connection, self.connection = self.connection, self._new_connection()
+
+        def close(future):
+            with connection.lock:
+                if connection.__dict__.get("ws"):
+                    connection.disconnect()
+        future.add_done_callback(close)
+
+    def __repr__(self):
+        return "<Node {}>".format(self.url)
+
+
+class NodePool(object):
+    """ Keeps warm connections to several nodes and sends each call to the
+        node that is currently performing best.
+
+        :param list urls: Websocket/http URLs of all nodes in the pool
+        :param list write_urls: Only these nodes receive calls that are
+            listed in :attr:`WRITE_METHODS` (defaults to all nodes)
+        :param int max_lag: Nodes that are more than ``max_lag`` blocks
+            behind the best known head block are not used for reads unless
+            no other node is available
+        :param float probe_interval: Seconds between two health probes
+            (``get_dynamic_global_properties``) of all nodes. ``0`` disables
+            background probing.
+        :param float retry_delay: Seconds a node is left alone after a
+            connection failure
+        :param int num_retries: Number of nodes to try for a single call
+            before giving up (defaults to all nodes)
+        :param list hedge: Calls to hedge (``True`` for
+            :attr:`HEDGE_METHODS`, defaults to no hedging)
+        :param float hedge_percentile: If the best node has not answered a
+            hedged call within this percentile (0-100) of its latency, the
+            same call is sent to the second best node and the first answer
+            wins (defaults to 95)
+        :param float hedge_min_delay: Lower bound of the hedge delay in
+            seconds
+        :param dict rate_limit: Client-side rate limits per node and API,
+            see :class:`bitsharesapi.ratelimit.RateLimiter`
+
+        The score of a node is its median latency, penalized by its recent
+        error rate and by the number of blocks its head block lags behind the
+        best node. Nodes without latency samples are tried first so every
+        node is measured. Statistics are available through :func:`stats`,
+        the hedging counters through :attr:`hedge_stats`.
+
+        .. code-block:: python
+
+            from bitsharesapi.bitsharesnoderpc import BitSharesNodeRPC
+            rpc = BitSharesNodeRPC(
+                ["wss://node1", "wss://node2", "wss://node3"],
+                node_pool=True,
+                write_urls=["wss://node1"])
+    """
+    def __init__(
+        self,
+        urls,
+        write_urls=None,
+        max_lag=3,
+        probe_interval=30,
+        retry_delay=10,
+        num_retries=None,
+        lag_penalty=0.5,
+        error_penalty=10,
+        hedge=None,
+        hedge_percentile=95,
+        hedge_min_delay=0.01,
+        rate_limit=None,
+        **kwargs
+    ):
+        if not isinstance(urls, list):
+            urls = [urls]
+        self.nodes = [
+            Node(url, rate_limit=rate_limit, **kwargs) for url in urls]
+        self.write_urls = write_urls or urls
+        self.max_lag = max_lag
+        self.probe_interval = probe_interval
+        self.retry_delay = retry_delay
+        self.num_retries = num_retries
+        self.lag_penalty = lag_penalty
+        self.error_penalty = error_penalty
+
+        if hedge is True:
+            hedge = HEDGE_METHODS
+        self.hedge_methods = hedge or []
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_stats = {"calls": 0, "fired": 0, "won": 0}
+        self._hedge_lock = threading.Lock()
+        self._executor = None
+
+        self._probe_event = threading.Event()
+        self._probe_thread = None
+
+    @property
+    def urls(self):
+        return [node.url for node in self.nodes]
+
+    def connect(self):
+        """ Connect to all nodes, probe them and start the background probe
+        """
+        for node in self.nodes:
+            self._connect_node(node)
+        if not any(node.is_up for node in self.nodes):
+            raise NumRetriesReached()
+        self.probe()
+        if self.probe_interval and not self._probe_thread:
+            self._probe_thread = threading.Thread(target=self._probe_loop)
+            self._probe_thread.daemon = True
+            self._probe_thread.start()
+
+    def disconnect(self):
+        self._probe_event.set()
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        for node in self.nodes:
+            node.disconnect()
+
+    def _connect_node(self, node):
+        try:
+            node.connect()
+        except Exception as e:
+            log.warning("Cannot connect to {}: {}".format(node.url, str(e)))
+            node.stats.record_error()
+            self.mark_down(node)
+
+    def mark_down(self, node):
+        """ Do not use ``node`` for the next ``retry_delay`` seconds
+        """
+        node.disconnect()
+        node.down_until = time.time() + self.retry_delay
+
+    def report_error(self, url):
+        """ Count an error of a connection to ``url`` that is not managed
+            by the pool (e.g. a notification websocket)
+        """
+        for node in self.nodes:
+            if node.url == url:
+                node.stats.record_error()
+
+    def _probe_loop(self):
+        while not self._probe_event.wait(self.probe_interval):
+            try:
+                self.probe()
+            except Exception as e:  # pragma: no cover
+                log.warning("Probing nodes failed: {}".format(str(e)))
+
+    def probe(self):
+        """ Measure latency and head block of every node and update the
+            lag of each node behind the best head block
+        """
+        for node in self.nodes:
+            if not node.is_up:
+                continue
+            try:
+                props = node.call("get_dynamic_global_properties")
+                node.stats.head_block_number = props["head_block_number"]
+            except Exception as e:
+                log.warning("Probing {} failed: {}".format(node.url, str(e)))
+                self.mark_down(node)
+
+        heads = [
+            node.stats.head_block_number for node in self.nodes
+            if node.stats.head_block_number is not None]
+        best = max(heads) if heads else 0
+        for node in self.nodes:
+            if node.stats.head_block_number is not None:
+                node.stats.lag = best - node.stats.head_block_number
+
+    def score(self, node):
+        """ Lower is better
+        """
+        latency = node.stats.percentile(50)
+        if latency is None:
+            return -1
+        return (
+            latency * (1 + self.error_penalty * node.stats.error_rate) +
+            self.lag_penalty * node.stats.lag
+        )
+
+    def candidates(self, name=None, exclude=[]):
+        """ Returns the nodes that may serve the call ``name``, best first
+        """
+        nodes = [
+            node for node in self.nodes
+            if node.is_up and node not in exclude]
+        if name in WRITE_METHODS:
+            nodes = [node for node in nodes if node.url in self.write_urls]
+        else:
+            synced = [node for node in nodes if node.stats.lag <= self.max_lag]
+            nodes = synced or nodes
+        return sorted(nodes, key=self.score)
+
+    def best(self, name=None, exclude=[]):
+        """ Returns the best node for the call ``name``
+        """
+        nodes = self.candidates(name, exclude)
+        if not nodes:
+            raise NumRetriesReached()
+        return nodes[0]
+
+    def call(self, name, *args, **kwargs):
+        """ Execute the call ``name`` on the best node and fail over to the
+            next best node on connection errors
+        """
+        tried = []
+        if name in self.hedge_methods:
+            nodes = self.candidates(name)
+            if len(nodes) > 1:
+                try:
+                    return self.hedged_call(nodes[0], nodes[1], name, *args, **kwargs)
+                except RPCError:
+                    raise
+                except Exception:
+                    tried.extend(nodes[:2])
+
+        num_retries = self.num_retries or len(self.nodes)
+        while len(tried) < num_retries:
+            node = self.best(name, exclude=tried)
+            tried.append(node)
+            try:
+                return node.call(name, *args, **kwargs)
+            except RPCError:
+                raise
+            except Exception as e:
+                log.warning("Call to {} failed: {}".format(node.url, str(e)))
+                self.mark_down(node)
+        raise NumRetriesReached()
+
+    def hedge_delay(self, node):
+        """ Time to wait for ``node`` before a call is hedged
+        """
+        delay = node.stats.percentile(self.hedge_percentile)
+        return max(delay or 0, self.hedge_min_delay)
+
+    def hedged_call(self, primary, secondary, name, *args, **kwargs):
+        """ Send the call to ``primary`` and, if it has not answered within
+            :func:`hedge_delay`, also to ``secondary``. The first successful
+            answer is returned, the other one is ignored.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=2 * len(self.nodes))
+        with self._hedge_lock:
+            self.hedge_stats["calls"] += 1
+
+        started = threading.Event()
+
+        def call_primary():
+            started.set()
+            return primary.call(name, *args, **kwargs)
+
+        first = self._executor.submit(call_primary)
+        # Time spent waiting for a worker does not count against the delay
+        while not started.wait(self.hedge_min_delay) and not first.done():
+            pass
+        done, _ = wait([first], timeout=self.hedge_delay(primary))
+        if done:
+            return self._hedge_result(primary, first)
+
+        with self._hedge_lock:
+            self.hedge_stats["fired"] += 1
+        log.debug("Hedging {} on {}".format(name, secondary.url))
+        second = self._executor.submit(secondary.call, name, *args, **kwargs)
+        futures = {first: primary, second: secondary}
+        error = None
+        while futures:
+            done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+            for future in done:
+                node = futures.pop(future)
+                try:
+                    result = self._hedge_result(node, future)
+                except RPCError:
+                    raise
+                except Exception as e:
+                    error = e
+                    continue
+                if future is second:
+                    with self._hedge_lock:
+                        self.hedge_stats["won"] += 1
+                # The loser is cancelled if it has not been sent yet,
+                # otherwise its answer is dropped without holding up the
+                # next calls to its node
+                for loser, node in futures.items():
+                    if not loser.cancel() and not loser.done():
+                        node.abandon(loser)
+                return result
+        raise error
+
+    def _hedge_result(self, node, future):
+        try:
+            return future.result()
+        except RPCError:
+            raise
+        except Exception as e:
+            log.warning("Call to {} failed: {}".format(node.url, str(e)))
+            self.mark_down(node)
+            raise
+
+    def stats(self):
+        """ Returns the statistics of all nodes, indexed by url
+        """
+        ret = dict()
+        for node in self.nodes:
+            ret[node.url] = node.stats.json()
+            if node.limiter:
+                ret[node.url]["rate_limit"] = node.limiter.json()
+        return ret
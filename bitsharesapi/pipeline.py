@@ -0,0 +1,222 @@
+import time
+import logging
+from grapheneapi.exceptions import RPCError
+from . import codec
+from .websocket import RPCWebsocket
+
+log = logging.getLogger(__name__)
+
+
+class PipelineFuture(object):
+    """ Result of a call made on a :class:`Pipeline`. The call is only sent
+        once the result is accessed for the first time (or the pipeline is
+        left), together with every other call of the pipeline.
+    """
+    def __init__(self, pipeline, name, args, kwargs):
+        self._pipeline = pipeline
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+        self.done = False
+        self._result = None
+        self._exception = None
+
+    def set_result(self, result):
+        self._result = result
+        self.done = True
+
+    def set_exception(self, exception):
+        self._exception = exception
+        self.done = True
+
+    def result(self):
+        """ Returns the result of the call (and executes the pipeline if
+            needed)
+
+            :raises Exception: the (mapped) error of the call
+        """
+        if not self.done:
+            self._pipeline.execute()
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def __repr__(self):
+        return "<PipelineFuture {}{}>".format(self.name, list(self.args))
+
+
+class Pipeline(object):
+    """ Sends many calls back-to-back over the websocket of ``rpc`` and
+        collects the replies by their ``id``, so all calls together take
+        about one round-trip instead of one round-trip per call.
+
+        :param bitsharesapi.bitsharesnoderpc.BitSharesNodeRPC rpc: RPC
+            connection
+        :param int max_inflight: Maximum number of calls that are sent
+            before the replies are read
+
+        Any RPC method can be called on the pipeline and returns a
+        :class:`PipelineFuture`. Errors are mapped per call, i.e. the
+        exception is raised by :func:`PipelineFuture.result` of the call
+        that failed only. On http connections, the calls are executed one
+        after the other.
+
+        .. code-block:: python
+
+            with rpc.pipeline() as pipeline:
+                futures = [pipeline.get_block(n) for n in range(1, 101)]
+            blocks = [f.result() for f in futures]
+    """
+    def __init__(self, rpc, max_inflight=100):
+        self.rpc = rpc
+        self.max_inflight = max_inflight
+        self.queued = []
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            future = PipelineFuture(self, name, args, kwargs)
+            self.queued.append(future)
+            return future
+        return method
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.execute()
+
+    def execute(self):
+        """ Send all queued calls and resolve their futures
+        """
+        queued, self.queued = self.queued, []
+        while queued:
+            size = self.max_inflight
+            limiter = self._limiter()
+            if limiter:
+                # Never have more calls in flight than the rate limits allow
+                size = max(1, min(size, limiter.min_window))
+            self._execute(queued[:size], limiter)
+            queued = queued[size:]
+
+    def _limiter(self):
+        if not self.rpc.__dict__.get("rate_limit"):
+            return None
+        return self.rpc.rate_limiter()
+
+    def _connection(self):
+        pool = self.rpc.__dict__.get("pool")
+        if pool:
+            node = pool.best()
+            if not node.connected:
+                node.connect()
+            return node.connection
+        return self.rpc.connection
+
+    def _execute(self, futures, limiter=None):
+        connection = self._connection()
+        if isinstance(connection, RPCWebsocket):
+            try:
+                return self._execute_pipelined(connection, futures, limiter)
+            except Exception as e:
+                # Replies that are still on their way must not be taken for
+                # replies to later calls
+                log.warning("Pipelining failed: {}".format(str(e)))
+                connection.disconnect()
+        self._execute_sequential([f for f in futures if not f.done])
+
+    def _execute_sequential(self, futures):
+        for future in futures:
+            try:
+                future.set_result(self.rpc.__getattr__(future.name)(
+                    *future.args, **future.kwargs))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _execute_pipelined(self, connection, futures, limiter=None):
+        if not connection.__dict__.get("ws"):
+            connection.connect()
+        # One permit per API for all calls of the batch, taken in a fixed
+        # order, so pipelines never wait for a window while holding slots
+        # of it (or of another window) that the others need
+        counts = dict()
+        if limiter:
+            for future in futures:
+                api = limiter.api(future.name, future.kwargs)
+                if api in limiter.limits:
+                    counts[api] = counts.get(api, 0) + 1
+        acquired = []
+        try:
+            for api in sorted(counts):
+                limit = limiter.limits[api]
+                acquired.append((limit, limit.acquire(counts[api])))
+        except BaseException:
+            for limit, count in acquired:
+                limit.release(count=count)
+            raise
+        start = time.monotonic()
+        try:
+            self._send_and_receive(connection, futures)
+        except Exception:
+            for limit, count in acquired:
+                limit.release(error=True, count=count)
+            raise
+        # The calls were answered one after the other
+        latency = (time.monotonic() - start) / len(futures)
+        for limit, count in acquired:
+            limit.release(latency, count=count)
+
+    def _send_and_receive(self, connection, futures):
+        by_id = dict()
+        frames = []
+        for future in futures:
+            query = {"method": "call",
+                     "params": [
+                         self._api_id(connection, future.kwargs),
+                         future.name,
+                         list(future.args)],
+                     "jsonrpc": "2.0",
+                     "id": connection.get_request_id()}
+            by_id[query["id"]] = future
+            frames.append(codec.dumps_bytes(query))
+
+        # Hold the lock of the connection so no other thread reads our
+        # replies
+        replies = []
+        with connection.lock:
+            for frame in frames:
+                connection.ws.send(frame)
+            while by_id:
+                data = codec.loads(connection.ws.recv())
+                future = by_id.pop(data.get("id"), None)
+                if future is None:
+                    log.debug("Ignoring message: {}".format(str(data)))
+                    continue
+                replies.append((future, data))
+
+        for future, data in replies:
+            self._resolve(future, data)
+
+    def _api_id(self, connection, kwargs):
+        if "api_id" in kwargs:
+            return kwargs["api_id"]
+        if "api" in kwargs:
+            return connection.api_id.get(kwargs["api"]) or kwargs["api"]
+        return 0
+
+    def _resolve(self, future, data):
+        if "error" not in data:
+            return future.set_result(data["result"])
+        error = data["error"]
+        if "detail" in error:
+            e = RPCError(error["detail"])
+        else:
+            e = RPCError(error["message"])
+        try:
+            self.rpc.post_process_exception(e)
+        except Exception as mapped:
+            e = mapped
+        future.set_exception(e)
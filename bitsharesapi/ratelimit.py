@@ -0,0 +1,296 @@
+import time
+import threading
+from grapheneapi.exceptions import RPCError
+from . import exceptions
+
+#: Calls that are served by the ``history`` API
+HISTORY_METHODS = [
+    "get_account_history",
+    "get_account_history_operations",
+    "get_account_history_by_operations",
+    "get_relative_account_history",
+    "get_fill_order_history",
+    "get_market_history",
+    "get_market_history_buckets",
+]
+
+#: Limits used for ``rate_limit=True``
+DEFAULT_LIMITS = {
+    "database": {"rate": 50, "burst": 100},
+    "history": {"rate": 10, "burst": 20},
+    "network_broadcast": {"rate": 5, "burst": 10},
+}
+
+
+class TokenBucket(object):
+    """ Allows ``rate`` calls per second on average and bursts of up to
+        ``burst`` calls
+
+        :param float rate: Tokens added per second
+        :param int burst: Maximum number of tokens (defaults to ``rate``)
+    """
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = burst or max(int(rate), 1)
+        self.tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, tokens=1):
+        """ Take ``tokens`` tokens, wait until they are available
+
+            More than ``burst`` tokens are taken in chunks of at most
+            ``burst`` tokens, so that batches are held to the rate as well
+        """
+        while tokens > 0:
+            chunk = min(tokens, self.burst)
+            self._take(chunk)
+            tokens -= chunk
+
+    def _take(self, tokens):
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def available(self):
+        with self._lock:
+            self._refill()
+            return self.tokens
+
+
+class ConcurrencyWindow(object):
+    """ Limits the number of calls in flight with an AIMD window:
+
+        * the window grows by about one call per window of calls whose
+          latency stays within ``tolerance`` times the usual latency
+        * the window is multiplied by ``decrease`` on errors, disconnects
+          and calls that take longer than that
+
+        :param int initial: Initial size of the window
+        :param int minimum: Minimum size of the window
+        :param int maximum: Maximum size of the window
+        :param float decrease: Factor applied to the window on errors
+        :param float tolerance: Calls slower than ``tolerance`` times the
+            usual latency count as timeouts
+    """
+    def __init__(
+        self,
+        initial=4,
+        minimum=1,
+        maximum=32,
+        decrease=0.5,
+        tolerance=3.0,
+    ):
+        self.size = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.tolerance = tolerance
+        self.inflight = 0
+        self.latency = None
+        self.decreases = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        return max(int(self.size), self.minimum)
+
+    def acquire(self, count=1):
+        """ Take ``count`` slots at once, wait until they are free
+
+            ``count`` is capped at the size of the window, so a batch of
+            calls never waits for more slots than the window has.
+
+            :returns: Number of slots taken
+        """
+        with self._condition:
+            while True:
+                taken = min(count, self.limit)
+                if self.inflight + taken <= self.limit:
+                    self.inflight += taken
+                    return taken
+                self._condition.wait()
+
+    def release(self, latency=None, error=False, count=1):
+        """ Return ``count`` slots and adapt the window to the outcome of
+            the calls
+        """
+        with self._condition:
+            self.inflight -= count
+            if error:
+                self.shrink()
+            elif latency is not None:
+                # Jitter of a few milliseconds is not a sign of congestion
+                if self.latency is not None and (
+                    latency > self.tolerance * max(self.latency, 0.01)
+                ):
+                    self.shrink()
+                else:
+                    for _ in range(count):
+                        self.size = min(
+                            self.maximum, self.size + 1.0 / self.size)
+                # Smoothed latency
+                if self.latency is None:
+                    self.latency = latency
+                else:
+                    self.latency = 0.9 * self.latency + 0.1 * latency
+            self._condition.notify_all()
+
+    def shrink(self):
+        with self._condition:
+            self.size = max(self.minimum, self.size * self.decrease)
+            self.decreases += 1
+
+
+class RateLimit(object):
+    """ Token bucket and concurrency window for the calls of one API
+
+        :param float rate: Calls per second (``None`` for no limit)
+        :param int burst: Size of the token bucket
+        :param int window: Initial concurrency window
+        :param int min_window: Minimum concurrency window
+        :param int max_window: Maximum concurrency window
+        :param float decrease: Factor applied to the window on errors
+        :param float tolerance: Calls slower than ``tolerance`` times the
+            usual latency count as timeouts
+    """
+    def __init__(
+        self,
+        rate=None,
+        burst=None,
+        window=4,
+        min_window=1,
+        max_window=32,
+        decrease=0.5,
+        tolerance=3.0,
+    ):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.window = ConcurrencyWindow(
+            initial=window,
+            minimum=min_window,
+            maximum=max_window,
+            decrease=decrease,
+            tolerance=tolerance)
+
+    def acquire(self, count=1):
+        """ Take tokens and window slots for ``count`` calls
+
+            :returns: Number of window slots taken (pass it to
+                :func:`release`)
+        """
+        if self.bucket:
+            self.bucket.acquire(count)
+        return self.window.acquire(count)
+
+    def release(self, latency=None, error=False, count=1):
+        self.window.release(latency=latency, error=error, count=count)
+
+    def call(self, func, *args, **kwargs):
+        """ Execute ``func`` within the limits
+        """
+        self.acquire()
+        start = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+        except (
+            RPCError,
+            exceptions.AccountCouldntBeFoundException,
+            exceptions.InvalidAccountNameException,
+        ):
+            # The node answered
+            self.release(time.monotonic() - start)
+            raise
+        except Exception:
+            self.release(error=True)
+            raise
+        self.release(time.monotonic() - start)
+        return result
+
+    def json(self):
+        return {
+            "rate": self.bucket.rate if self.bucket else None,
+            "burst": self.bucket.burst if self.bucket else None,
+            "tokens": self.bucket.available() if self.bucket else None,
+            "window": self.window.limit,
+            "inflight": self.window.inflight,
+            "latency": self.window.latency,
+            "decreases": self.window.decreases,
+        }
+
+
+class RateLimiter(object):
+    """ Client-side rate limits of a single node, per API
+
+        :param dict limits: Keyword arguments of :class:`RateLimit`
+            indexed by API (``database``, ``history`` and
+            ``network_broadcast``), defaults to :attr:`DEFAULT_LIMITS`.
+            Calls of APIs without limits are not limited.
+
+        The API of a call is taken from its ``api`` argument or derived
+        from its name.
+
+        .. code-block:: python
+
+            from bitsharesapi.bitsharesnoderpc import BitSharesNodeRPC
+            rpc = BitSharesNodeRPC(
+                "wss://node.bitshares.eu",
+                rate_limit={
+                    "database": {"rate": 20, "burst": 40},
+                    "history": {"rate": 2, "window": 1, "max_window": 4},
+                })
+            print(rpc.rate_limits())
+    """
+    def __init__(self, limits=None):
+        if not isinstance(limits, dict):
+            limits = DEFAULT_LIMITS
+        self.limits = {
+            api: RateLimit(**kwargs) for api, kwargs in limits.items()}
+
+    def api(self, name, kwargs={}):
+        """ Returns the API that serves the call ``name``
+        """
+        if kwargs.get("api") in self.limits:
+            return kwargs["api"]
+        if name in HISTORY_METHODS:
+            return "history"
+        if name.startswith("broadcast_"):
+            return "network_broadcast"
+        return "database"
+
+    def limit(self, name, kwargs={}):
+        """ Returns the :class:`RateLimit` of the call ``name`` (or
+            ``None`` if it is not limited)
+        """
+        return self.limits.get(self.api(name, kwargs))
+
+    def call(self, name, func, *args, **kwargs):
+        limit = self.limit(name, kwargs)
+        if limit is None:
+            return func(*args, **kwargs)
+        return limit.call(func, *args, **kwargs)
+
+    def record_error(self):
+        """ Shrink all windows after a connection error
+        """
+        for limit in self.limits.values():
+            limit.window.shrink()
+
+    @property
+    def min_window(self):
+        """ The smallest concurrency window of all APIs
+        """
+        return min(limit.window.limit for limit in self.limits.values())
+
+    def json(self):
+        return {api: limit.json() for api, limit in self.limits.items()}
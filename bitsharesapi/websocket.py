@@ -2,11 +2,14 @@ import traceback
 import threading
 import ssl
 import time
-import json
 import logging
 import websocket
 from itertools import cycle
+from functools import partial
 from threading import Thread
+from grapheneapi.websocket import Websocket
+from . import codec
+from .dispatch import NotificationDispatcher
 from .exceptions import NumRetriesReached
 from events import Events
 
@@ -24,6 +27,21 @@ class BitSharesWebsocket(Events):
         :param list markets: list of asset_ids, e.g. ``[['1.3.0', '1.3.121']]``
         :param list objects: list of objects id's you'd like to be notified when changing
         :param int keep_alive: seconds between a ping to the backend (defaults to 25seconds)
+        :param bitsharesapi.nodepool.NodePool node_pool: Connect to the best
+            node of this pool instead of rotating through ``urls``
+        :param bitsharesapi.dispatch.NotificationDispatcher dispatcher: Call
+            the slots on the worker threads of this dispatcher instead of the
+            thread that reads from the websocket (``True`` for a dispatcher
+            with default settings)
+        :param bool coalesce_objects: Only deliver the latest state of each
+            object to ``on_object`` if notices arrive faster than they are
+            handled (implies a ``dispatcher``)
+        :param bool backfill: After a reconnect, deliver the current state of
+            the subscribed ``objects`` and the blocks that were produced
+            while disconnected (defaults to ``False``)
+        :param bool backfill_transactions: Also deliver the transactions of
+            backfilled blocks to ``on_tx``
+        :param int max_backfill: Maximum number of blocks to backfill
 
         After instanciating this class, you can add event slots for:
 
@@ -34,7 +52,24 @@ class BitSharesWebsocket(Events):
         * ``on_market``
 
         which will be called accordingly with the notification
-        message received from the BitShares node:
+        message received from the BitShares node.
+
+        By default, the slots are called on the thread that reads from the
+        websocket, so a slow slot delays all following notices. With a
+        ``dispatcher``, notices are queued and delivered by a pool of
+        worker threads. Notices of the same object (``on_object``,
+        ``on_account``) are delivered in order, as are all notices of
+        ``on_tx``, ``on_block`` and ``on_market`` respectively. With
+        ``coalesce_objects``, a queued ``on_object`` notice is replaced by a
+        newer notice of the same object; the number of merged notices is
+        available as :attr:`coalesced`.
+
+        The number of the last block delivered to ``on_block`` is kept in
+        :attr:`last_block_num`. With ``backfill``, the blocks missed during
+        a reconnect are requested all at once after the connection is back
+        and delivered in order (optionally together with their
+        transactions) before any new block. Gap sizes and backfill
+        durations are collected in :attr:`backfill_stats`:
 
         .. code-block:: python
 
@@ -113,10 +148,37 @@ class BitSharesWebsocket(Events):
         on_market=None,
         keep_alive=25,
         num_retries=-1,
+        node_pool=None,
+        dispatcher=None,
+        coalesce_objects=False,
+        backfill=False,
+        backfill_transactions=False,
+        max_backfill=1000,
         **kwargs
     ):
 
         self.num_retries = num_retries
+        self.node_pool = node_pool
+        if dispatcher is True or (coalesce_objects and not dispatcher):
+            dispatcher = NotificationDispatcher()
+        if coalesce_objects:
+            dispatcher.coalesce.add("on_object")
+        self.dispatcher = dispatcher
+        self.backfill = backfill
+        self.backfill_transactions = backfill_transactions
+        self.max_backfill = max_backfill
+        self.backfill_stats = {
+            "backfills": 0,
+            "blocks": 0,
+            "last_gap": 0,
+            "max_gap": 0,
+            "last_duration": 0.0,
+            "total_duration": 0.0,
+        }
+        self.last_block_num = None
+        self._backfill = None
+        self._callbacks = dict()
+        self._connected = False
         self.keepalive = None
         self._request_id = 0
         self.ws = None
@@ -162,10 +224,18 @@ class BitSharesWebsocket(Events):
             * register to the database api, and
             * subscribe to the objects defined if there is a
               callback/slot available for callbacks
+            * after a reconnect, replay the subscribed objects and backfill
+              missed blocks (if ``backfill`` is enabled)
         """
+        self._callbacks = dict()
         self.login(self.user, self.password, api_id=1)
         self.database(api_id=1)
         self.__set_subscriptions()
+        if self._connected and self.backfill:
+            self._replay_objects()
+            if self.last_block_num is not None and len(self.on_block):
+                self._start_backfill()
+        self._connected = True
         self.keepalive = threading.Thread(
             target=self._ping
         )
@@ -215,6 +285,132 @@ class BitSharesWebsocket(Events):
             log.debug('Sending ping')
             self.get_objects(["2.8.0"])
 
+    def request(self, callback, name, *args, **kwargs):
+        """ Send the call ``name`` and have ``callback`` called with its
+            result (or ``None`` if the call failed) once the reply arrives
+        """
+        query = {"method": "call",
+                 "params": [kwargs.get("api_id", 0), name, list(args)],
+                 "jsonrpc": "2.0",
+                 "id": self.get_request_id()}
+        self._callbacks[query["id"]] = callback
+        self.rpcexec(query)
+
+    def _replay_objects(self):
+        ids = [
+            id for id in self.subscription_objects
+            if id.split(".")[-1] != "x"]
+        if ids and len(self.on_object):
+            self.request(self._on_replay_objects, "get_objects", ids)
+
+    def _on_replay_objects(self, objects):
+        for obj in objects or []:
+            if obj:
+                self.process_notice(obj)
+
+    def _start_backfill(self):
+        self._backfill = {"start": time.time(), "buffer": [], "blocks": {}}
+        self.request(self._on_backfill_head, "get_dynamic_global_properties")
+
+    def _on_backfill_head(self, props):
+        if not props:
+            return self._finish_backfill()
+        head = props["head_block_number"]
+        first = self.last_block_num + 1
+        if head - first >= self.max_backfill:
+            log.warning("Missed {} blocks, only backfilling the last {}".format(
+                head - first + 1, self.max_backfill))
+            first = head - self.max_backfill + 1
+        self._backfill.update(
+            first=first, head=head, head_id=props["head_block_id"])
+        if first > head:
+            return self._finish_backfill()
+        log.info("Backfilling blocks {} to {}".format(first, head))
+        # All blocks are requested at once, the replies are collected
+        # in _on_backfill_block
+        for num in range(first, head + 1):
+            self.request(
+                partial(self._on_backfill_block, num), "get_block", num)
+
+    def _on_backfill_block(self, num, block):
+        state = self._backfill
+        if state is None:
+            return
+        state["blocks"][num] = block
+        if len(state["blocks"]) == state["head"] - state["first"] + 1:
+            self._finish_backfill()
+
+    def _finish_backfill(self):
+        state, self._backfill = self._backfill, None
+        blocks = state["blocks"]
+        delivered = set()
+        for num in sorted(blocks):
+            block = blocks[num]
+            if not block:
+                continue
+            if num == state["head"]:
+                block_id = state["head_id"]
+            else:
+                # The id of a block is stored in its successor
+                block_id = block.get("block_id") or (
+                    blocks.get(num + 1) or {}).get("previous")
+            if self.backfill_transactions:
+                for tx in block.get("transactions", []):
+                    self.emit("on_tx", tx)
+            if block_id:
+                delivered.add(block_id)
+                self.process_block(block_id)
+
+        # Blocks that arrived while backfilling, except those that the
+        # backfill delivered already (blocks of a fork have other ids)
+        for block_id in state["buffer"]:
+            if block_id not in delivered:
+                self.process_block(block_id)
+
+        duration = time.time() - state["start"]
+        stats = self.backfill_stats
+        stats["backfills"] += 1
+        stats["blocks"] += len(blocks)
+        stats["last_gap"] = len(blocks)
+        stats["max_gap"] = max(stats["max_gap"], len(blocks))
+        stats["last_duration"] = duration
+        stats["total_duration"] += duration
+        log.info("Backfilled {} blocks in {:.3f}s".format(
+            len(blocks), duration))
+
+    def process_block(self, block_id):
+        """ This method is called on new blocks. It calls ``on_block``
+            and keeps track of :attr:`last_block_num`.
+        """
+        if self._backfill is not None:
+            self._backfill["buffer"].append(block_id)
+            return
+        self.last_block_num = int(block_id[:8], 16)
+        self.emit("on_block", block_id)
+
+    def process_object_notices(self, notices):
+        """ This method is called on "general" object change notifications
+        """
+        # Let's see if a specific object has changed
+        for notice in notices:
+            try:
+                if "id" in notice:
+                    self.process_notice(notice)
+                else:
+                    for obj in notice:
+                        if "id" in obj:
+                            self.process_notice(obj)
+            except Exception as e:
+                log.critical("Error in process_notice: {}\n\n{}".format(str(e), traceback.format_exc))
+
+    def process_event(self, event, payload):
+        """ This method is called on notices other than object changes
+        """
+        if event == "on_block":
+            self.process_block(payload)
+        else:
+            self.emit(event, payload)
+
     def process_notice(self, notice):
         """ This method is called on notices that need processing. Here,
             we call ``on_object`` and ``on_account`` slots.
@@ -224,14 +420,34 @@ class BitSharesWebsocket(Events):
         _a, _b, _ = id.split(".")
 
         if id in self.subscription_objects:
-            self.on_object(notice)
+            self.emit("on_object", notice, key=id)
 
         elif ".".join([_a, _b, "x"]) in self.subscription_objects:
-            self.on_object(notice)
+            self.emit("on_object", notice, key=id)
 
         elif id[:4] == "2.6.":
             # Treat account updates separately
-            self.on_account(notice)
+            self.emit("on_account", notice, key=id)
+
+    @property
+    def coalesced(self):
+        """ Number of ``on_object`` notices that have been merged into a
+            newer notice of the same object
+        """
+        if not self.dispatcher:
+            return 0
+        return self.dispatcher.stats_for("on_object").coalesced
+
+    def emit(self, event, payload, key=None):
+        """ Call the slots of ``event`` with ``payload``, either directly
+            or through the ``dispatcher``. Payloads with the same ``key``
+            (defaults to the event name) are delivered in order.
+        """
+        slot = getattr(self.events, event)
+        if self.dispatcher is None:
+            slot(payload)
+        else:
+            self.dispatcher.put(event, key or event, slot, payload)
 
     def on_message(self, reply, *args, **kwargs):
         """ This method is called by the websocket connection on every
@@ -239,14 +455,18 @@ class BitSharesWebsocket(Events):
             hand over post-processing and signalling of events to
             ``process_notice``.
         """
-        log.debug("Received message: %s" % str(reply))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Received message: %s" % str(reply))
         data = {}
         try:
-            data = json.loads(reply, strict=False)
+            data = codec.loads(reply)
         except ValueError:
             raise ValueError("API node returned invalid format. Expected JSON!")
 
-        if data.get("method") == "notice":
+        if data.get("id") in self._callbacks:
+            self.process_reply(data)
+
+        elif data.get("method") == "notice":
             id = data["params"][0]
 
             if id >= len(self.__events__):
@@ -258,26 +478,29 @@ class BitSharesWebsocket(Events):
 
             # This is a "general" object change notification
             if id == self.__events__.index('on_object'):
-                # Let's see if a specific object has changed
-                for notice in data["params"][1]:
-                    try:
-                        if "id" in notice:
-                            self.process_notice(notice)
-                        else:
-                            for obj in notice:
-                                if "id" in obj:
-                                    self.process_notice(obj)
-                    except Exception as e:
-                        log.critical("Error in process_notice: {}\n\n{}".format(str(e), traceback.format_exc))
+                self.process_object_notices(data["params"][1])
             else:
                 try:
                     callbackname = self.__events__[id]
                     log.debug("Patching through to call %s" % callbackname)
-                    [getattr(self.events, callbackname)(x) for x in data["params"][1]]
+                    for x in data["params"][1]:
+                        self.process_event(callbackname, x)
                 except Exception as e:
                     log.critical("Error in {}: {}\n\n{}".format(
                         callbackname, str(e), traceback.format_exc()))
 
+    def process_reply(self, data):
+        """ Hand the reply to a call made with :func:`request` over to
+            its callback
+        """
+        callback = self._callbacks.pop(data["id"])
+        if "error" in data:
+            log.error("Call failed: {}".format(str(data["error"])))
+        try:
+            callback(data.get("result"))
+        except Exception as e:
+            log.critical("{}\n\n{}".format(str(e), traceback.format_exc()))
+
     def on_error(self, error, *args, **kwargs):
         """ Called on websocket errors
         """
@@ -296,7 +519,10 @@ class BitSharesWebsocket(Events):
         cnt = 0
         while not self.run_event.is_set():
             cnt += 1
-            self.url = next(self.urls)
+            if self.node_pool:
+                self.url = self.node_pool.best().url
+            else:
+                self.url = next(self.urls)
             log.debug("Trying to connect to node %s" % self.url)
             try:
                 # websocket.enableTrace(True)
@@ -309,6 +535,8 @@ class BitSharesWebsocket(Events):
                 )
                 self.ws.run_forever()
             except websocket.WebSocketException as exc:
+                if self.node_pool:
+                    self.node_pool.report_error(self.url)
                 if (self.num_retries >= 0 and cnt > self.num_retries):
                     raise NumRetriesReached()
 
@@ -333,6 +561,8 @@ class BitSharesWebsocket(Events):
         """
         self.run_event.set()
         self.ws.close()
+        if self.dispatcher:
+            self.dispatcher.stop()
 
         if self.keepalive and self.keepalive.is_alive():
             self.keepalive.join()
@@ -350,8 +580,9 @@ class BitSharesWebsocket(Events):
             :raises ValueError: if the server does not respond in proper JSON format
             :raises RPCError: if the server returns an error
         """
-        log.debug(json.dumps(payload))
-        self.ws.send(json.dumps(payload, ensure_ascii=False).encode('utf8'))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(codec.dumps(payload))
+        self.ws.send(codec.dumps_bytes(payload))
 
     def __getattr__(self, name):
         """ Map all methods to RPC calls and pass through the arguments
@@ -388,3 +619,33 @@ class BitSharesWebsocket(Events):
             r = self.rpcexec(query)
             return r
         return method
+
+
+class RPCWebsocket(codec.CodecRpc, Websocket):
+    """ Websocket connection of :class:`bitsharesapi.bitsharesnoderpc.BitSharesNodeRPC`
+
+        Calls are encoded and replies decoded with
+        :mod:`bitsharesapi.codec`. A call holds :attr:`lock` from sending
+        the query until its reply has been read, so other threads can't
+        take the reply. Code that sends several calls before reading their
+        replies (see
+        :class:`bitsharesapi.pipeline.Pipeline`) has to hold the lock, too.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+
+    def rpcexec(self, payload):
+        """ Execute a call by sending the payload
+
+            :param json payload: Payload data
+            :raises ValueError: if the server does not respond in proper JSON format
+        """
+        while True:
+            if not self.__dict__.get("ws"):
+                self.connect()
+            with self.lock:
+                # The connection may have been closed while we waited
+                if self.ws:
+                    self.ws.send(codec.dumps_bytes(payload))
+                    return self.ws.recv()
@@ -40,7 +40,9 @@ setup(
         'Intended Audience :: Financial and Insurance Industry',
         'Topic :: Office/Business :: Financial',
     ],
+    python_requires=">=3.7",
     install_requires=open("requirements.txt").readlines(),
+    extras_require={"arrays": ["numpy"]},
     setup_requires=['pytest-runner'],
     tests_require=['pytest'],
     include_package_data=True,
@@ -38,6 +38,15 @@ class Testcases(unittest.TestCase):
         self.assertEqual(str(account), "<Account 1.2.90742>")
         self.assertIsInstance(Account(account), Account)
 
+    def test_load_many(self):
+        accounts = Account.load_many(["init0", "1.2.3", "init0"])
+        self.assertEqual(len(accounts), 3)
+        for account in accounts:
+            self.assertIsInstance(account, Account)
+        self.assertEqual(accounts[0]["name"], "init0")
+        self.assertEqual(accounts[1]["id"], "1.2.3")
+        self.assertEqual(accounts[0]["id"], accounts[2]["id"])
+
     def test_account_upgrade(self):
         account = Account("init0")
         pprint(account)
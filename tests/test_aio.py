@@ -0,0 +1,133 @@
+import json
+import random
+import asyncio
+import unittest
+import websockets
+from bitsharesapi.aio import AsyncBitSharesNodeRPC
+from bitsharesapi.exceptions import NoMethodWithName, NumRetriesReached
+
+CHAIN_ID = "4018d7844c78f6a6c41c6a552b898022310fc5dec06da467ee7905a8dad512c8"
+
+
+class FakeNode(object):
+    """ Answers calls in random order with their arguments, drops the
+        connection on calls of ``hang`` and on the calls in ``drop``
+    """
+    def __init__(self):
+        self.connections = 0
+        self.calls = []
+        self.drop = []
+        self.server = None
+
+    async def start(self):
+        self.server = await websockets.serve(self.handler, "127.0.0.1", 0)
+        return "ws://127.0.0.1:{}".format(
+            self.server.sockets[0].getsockname()[1])
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handler(self, ws, *args):
+        self.connections += 1
+        async for message in ws:
+            query = json.loads(message)
+            name = query["params"][1]
+            self.calls.append(name)
+            if name == "hang":
+                continue
+            if name in self.drop:
+                self.drop.remove(name)
+                await ws.close()
+                return
+            asyncio.ensure_future(self.reply(ws, query, name))
+
+    async def reply(self, ws, query, name):
+        await asyncio.sleep(random.random() * 0.02)
+        if name == "get_chain_properties":
+            reply = {"result": {"chain_id": CHAIN_ID}}
+        elif name == "fail":
+            reply = {"error": {"message": "no method with name 'fail'"}}
+        else:
+            reply = {"result": query["params"][2]}
+        reply["id"] = query["id"]
+        try:
+            await ws.send(json.dumps(reply))
+        except websockets.ConnectionClosed:
+            pass
+
+
+class Testcases(unittest.TestCase):
+
+    def run_node(self, test, **kwargs):
+        async def main():
+            node = FakeNode()
+            url = await node.start()
+            rpc = AsyncBitSharesNodeRPC(url, **kwargs)
+            try:
+                await asyncio.wait_for(test(node, rpc), 10)
+            finally:
+                await rpc.close()
+                await node.stop()
+        asyncio.run(main())
+
+    def test_concurrent(self):
+        async def test(node, rpc):
+            await rpc.connect()
+            self.assertEqual(rpc.chain_params["chain_id"], CHAIN_ID)
+            # Replies arrive in any order
+            results = await asyncio.gather(*[
+                rpc.get_objects(["1.2.{}".format(i)]) for i in range(100)])
+            self.assertEqual(
+                results, [[["1.2.{}".format(i)]] for i in range(100)])
+            self.assertEqual(await rpc.get_object("1.2.5"), ["1.2.5"])
+            with self.assertRaises(NoMethodWithName):
+                await rpc.fail()
+            self.assertEqual(node.connections, 1)
+        self.run_node(test)
+
+    def test_connection_lost(self):
+        async def test(node, rpc):
+            await rpc.connect()
+            queries = [
+                {"method": "call", "params": [0, "hang", []],
+                 "jsonrpc": "2.0", "id": rpc.get_request_id()}
+                for _ in range(3)]
+            calls = [
+                asyncio.ensure_future(rpc.rpcexec(query))
+                for query in queries]
+            await asyncio.sleep(0.1)
+            await rpc.ws.close()
+            # All calls in flight fail
+            for call in calls:
+                with self.assertRaises(ConnectionError):
+                    await call
+            self.assertEqual(rpc._pending, {})
+            # Calls are not sent again with num_retries=0
+            node.drop.append("get_objects")
+            with self.assertRaises(NumRetriesReached):
+                await rpc.get_objects(["1.2.0"])
+        self.run_node(test, num_retries=0)
+
+    def test_reconnect(self):
+        async def test(node, rpc):
+            await rpc.connect()
+            await rpc.close()
+            # The next call reconnects
+            self.assertEqual(await rpc.get_objects(["1.2.0"]), [["1.2.0"]])
+            self.assertEqual(node.connections, 2)
+            # Calls lost with the connection are sent again
+            node.drop.append("get_objects")
+            self.assertEqual(await rpc.get_objects(["1.2.1"]), [["1.2.1"]])
+            self.assertEqual(node.connections, 3)
+        self.run_node(test)
+
+    def test_connection_lost_during_connect(self):
+        async def test(node, rpc):
+            # Lost while identifying the network of the new connection
+            node.drop.append("get_chain_properties")
+            await rpc.reconnect()
+            self.assertEqual(rpc.chain_params["chain_id"], CHAIN_ID)
+            self.assertEqual(node.connections, 2)
+            self.assertEqual(await rpc.get_objects(["1.2.0"]), [["1.2.0"]])
+        self.run_node(test)
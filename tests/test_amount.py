@@ -1,6 +1,6 @@
 import unittest
 from bitshares import BitShares
-from bitshares.amount import Amount
+from bitshares.amount import Amount, AssetDescriptor, CompactAmount
 from bitshares.asset import Asset
 from bitshares.instance import set_shared_bitshares_instance, SharedInstance
 from .fixtures import fixture_data, bitshares
@@ -221,3 +221,43 @@ class Testcases(unittest.TestCase):
         a2 = Amount(1, self.symbol)
         self.assertTrue(a1 == a2)
         self.assertTrue(a1 == 1)
+
+    def test_compact(self):
+        asset = AssetDescriptor.from_asset(self.asset)
+        self.assertIs(asset, AssetDescriptor(
+            self.asset["id"], self.symbol, self.precision))
+
+        a1 = CompactAmount.from_amount(Amount(1.5, self.symbol))
+        self.assertIs(a1.asset, asset)
+        self.assertEqual(int(a1), 15 * 10 ** (self.precision - 1))
+        a2 = CompactAmount.from_json({
+            "amount": 10 ** self.precision,
+            "asset_id": self.asset["id"]
+        })
+        self.assertEqual(float(a1 + a2), 2.5)
+        self.assertEqual(float(a1 - a2), 0.5)
+        self.assertEqual(float(a2 * 3), 3)
+        self.assertEqual(float(sum([a1, a2, a2])), 3.5)
+        self.assertTrue(a1 > a2)
+        self.assertEqual(a1.json(), {
+            "amount": 15 * 10 ** (self.precision - 1),
+            "asset_id": self.asset["id"]
+        })
+        self.dotest(a1.to_amount(), 1.5, self.symbol)
+
+        # inline
+        a2 += a1
+        self.assertEqual(float(a2), 2.5)
+
+        with self.assertRaises(ValueError):
+            a1 + CompactAmount.from_amount(Amount(1, asset=self.asset2))
+
+        # comparisons
+        self.assertTrue(a1 >= a2 > 0)
+        self.assertFalse(a1 <= 0)
+        with self.assertRaises(TypeError):
+            a1 < 1.5
+        # Amount compares the value
+        self.assertTrue(a1 > Amount(1, self.symbol))
+        with self.assertRaises(ValueError):
+            a1 < CompactAmount.from_amount(Amount(1, asset=self.asset2))
@@ -0,0 +1,63 @@
+import unittest
+from bitshares.amount import AssetDescriptor, CompactAmount
+from bitshares.arrays import AmountArray, PriceArray, numpy
+from bitshares.exceptions import InvalidAssetException
+
+USD = AssetDescriptor("1.3.121", "USD", 4)
+BTS = AssetDescriptor("1.3.0", "BTS", 5)
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        # Asks of get_order_book, base USD and quote BTS
+        self.asks = PriceArray.from_orderbook([
+            {"price": "0.0040", "base": "4.0000", "quote": "1000.00000"},
+            {"price": "0.0050", "base": "10.0000", "quote": "2000.00000"},
+            {"price": "0.0060", "base": "0.6000", "quote": "100.00000"},
+        ], USD, BTS)
+
+    def test_amounts(self):
+        amounts = AmountArray.from_json([
+            {"amount": 10000, "asset_id": "1.3.121"},
+            {"amount": 25000, "asset_id": "1.3.121"},
+        ], USD)
+        self.assertEqual(amounts.sum(), CompactAmount(35000, USD))
+        self.assertEqual(list(amounts.cumsum().amounts), [10000, 35000])
+        self.assertEqual(amounts[1], CompactAmount(25000, USD))
+        self.assertEqual(list(amounts.to_float()), [1.0, 2.5])
+        self.assertEqual(len((amounts + amounts)[1:]), 1)
+        self.assertEqual(amounts.json()[0], {"amount": 10000, "asset_id": "1.3.121"})
+        with self.assertRaises(ValueError):
+            amounts + AmountArray([1, 2], BTS)
+        with self.assertRaises(ValueError):
+            AmountArray.from_json([{"amount": 1, "asset_id": "1.3.0"}], USD)
+
+    def test_prices(self):
+        self.assertEqual(list(self.asks.prices()), [0.004, 0.005, 0.006])
+        self.assertEqual(self.asks.vwap(), 14.6 / 3100)
+        self.assertEqual(
+            self.asks.depth(0.005), CompactAmount(300000000, BTS))
+        self.assertEqual(
+            self.asks.depth(0.005, side="bids"), CompactAmount(210000000, BTS))
+        self.assertEqual(self.asks[0], (
+            CompactAmount(40000, USD), CompactAmount(100000000, BTS)))
+
+    def test_invert(self):
+        inverted = self.asks.as_base("BTS")
+        self.assertEqual(inverted.symbols(), ("BTS", "USD"))
+        self.assertIs(inverted.base, self.asks.quote)
+        self.assertEqual(list(inverted.prices()[:2]), [250.0, 200.0])
+        self.assertIs(self.asks.as_quote("BTS"), self.asks)
+        self.assertEqual(inverted.as_quote("BTS").symbols(), ("USD", "BTS"))
+        with self.assertRaises(InvalidAssetException):
+            self.asks.as_base("EUR")
+
+    def test_trades(self):
+        trades = PriceArray.from_trades([
+            {"price": "0.005", "amount": "100", "value": "0.5"},
+            {"price": "0.004", "amount": "50", "value": "0.2"},
+        ], USD, BTS)
+        self.assertEqual(trades.quote.sum(), CompactAmount(15000000, BTS))
+        self.assertEqual(trades.vwap(), 0.7 / 150)
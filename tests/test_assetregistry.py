@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import unittest
+from bitshares.amount import Amount
+from bitshares.asset import Asset
+from bitshares.assetregistry import AssetRegistry
+from bitshares.price import Price
+
+ASSETS = [
+    {"id": "1.3.{}".format(i), "symbol": "ASSET{:03d}".format(i),
+     "precision": i % 9}
+    for i in range(250)
+]
+
+
+class Rpc(object):
+    def __init__(self):
+        self.calls = []
+
+    def list_assets(self, lower_bound, limit):
+        self.calls.append(lower_bound)
+        assets = [a for a in ASSETS if a["symbol"] >= lower_bound]
+        return assets[:limit]
+
+    def __getattr__(self, name):
+        raise AssertionError("Unexpected call of {}".format(name))
+
+
+class Instance(object):
+    offline = False
+
+    def __init__(self):
+        self.rpc = Rpc()
+        self.asset_registry = AssetRegistry("test")
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.bts = Instance()
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_preload(self):
+        registry = self.bts.asset_registry
+        self.assertEqual(registry.preload(self.bts.rpc), 250)
+        self.assertEqual(
+            self.bts.rpc.calls, ["", "ASSET099", "ASSET198"])
+        self.assertIs(registry.get("1.3.7"), registry.get("ASSET007"))
+        self.assertEqual(registry.get("1.3.7").precision, 7)
+        self.assertNotIn("1.3.250", registry)
+
+        path = os.path.join(self.tmp, "assets.json.gz")
+        registry.save(path)
+        self.assertEqual(AssetRegistry("test").load(path), 250)
+        self.assertEqual(AssetRegistry("other").load(path), 0)
+        self.assertIs(AssetRegistry.for_chain("a"), AssetRegistry.for_chain("a"))
+
+    def test_amount(self):
+        self.bts.asset_registry.add("1.3.1", "USD", 4)
+        self.bts.asset_registry.add("1.3.0", "BTS", 5)
+
+        # No calls of the API
+        amount = Amount(
+            {"amount": 12345, "asset_id": "1.3.1"},
+            blockchain_instance=self.bts)
+        self.assertEqual(str(amount), "1.2345 USD")
+        self.assertEqual(amount.json(), {"amount": 12345, "asset_id": "1.3.1"})
+        self.assertIsInstance(amount["asset"], Asset)
+        amount += Amount("1 USD", blockchain_instance=self.bts)
+        self.assertEqual(str(amount), "2.2345 USD")
+
+        price = Price("0.5 USD/BTS", blockchain_instance=self.bts)
+        self.assertEqual(price["base"]["symbol"], "USD")
+        self.assertEqual(price["quote"]["asset"]["precision"], 5)
+        self.assertEqual(float(price), 0.5)
@@ -0,0 +1,69 @@
+import unittest
+import threading
+from bitsharesapi.batch import ObjectCoalescer, PendingObjects
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+    def fetch(self, ids, **kwargs):
+        self.calls.append(list(ids))
+        return [{"id": id} for id in ids]
+
+    def test_passthrough(self):
+        coalescer = ObjectCoalescer(self.fetch)
+        self.assertEqual(coalescer.get_objects(["1.2.0"]), [{"id": "1.2.0"}])
+        self.assertEqual(coalescer.get_objects(["1.2.1"]), [{"id": "1.2.1"}])
+        self.assertEqual(len(self.calls), 2)
+
+    def test_batch(self):
+        coalescer = ObjectCoalescer(self.fetch)
+        with coalescer.batch():
+            r1 = coalescer.get_objects(["1.2.0", "1.2.1"])
+            r2 = coalescer.get_objects(["1.2.1"])
+            self.assertIsInstance(r1, PendingObjects)
+            self.assertEqual(self.calls, [])
+        self.assertEqual(self.calls, [["1.2.0", "1.2.1"]])
+        self.assertEqual(r1[1], {"id": "1.2.1"})
+        self.assertEqual(list(r2), [{"id": "1.2.1"}])
+
+    def test_batch_resolve_on_access(self):
+        coalescer = ObjectCoalescer(self.fetch, max_batch=2)
+        with coalescer.batch():
+            r1 = coalescer.get_objects(["1.2.0"])
+            r2 = coalescer.get_objects(["1.2.1", "1.2.2"])
+            self.assertEqual(r2[0], {"id": "1.2.1"})
+            r3 = coalescer.get_objects(["1.2.3"])
+        self.assertEqual(r1, [{"id": "1.2.0"}])
+        self.assertEqual(r3, [{"id": "1.2.3"}])
+        self.assertEqual(
+            self.calls, [["1.2.0", "1.2.1"], ["1.2.2"], ["1.2.3"]])
+
+    def test_prefetched(self):
+        coalescer = ObjectCoalescer(self.fetch)
+        with coalescer.prefetched({"1.2.0": {"id": "1.2.0", "name": "a"}}):
+            self.assertEqual(
+                coalescer.get_objects(["1.2.0"]), [{"id": "1.2.0", "name": "a"}])
+            self.assertEqual(self.calls, [])
+            coalescer.get_objects(["1.2.0", "1.2.1"])
+        coalescer.get_objects(["1.2.0"])
+        self.assertEqual(self.calls, [["1.2.0", "1.2.1"], ["1.2.0"]])
+
+    def test_window(self):
+        coalescer = ObjectCoalescer(self.fetch, window=0.2)
+        results = dict()
+
+        def worker(i):
+            results[i] = coalescer.get_objects(["1.2.%d" % i])
+
+        threads = [
+            threading.Thread(target=worker, args=(i,)) for i in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(self.calls), 1)
+        for i in range(10):
+            self.assertEqual(results[i], [{"id": "1.2.%d" % i}])
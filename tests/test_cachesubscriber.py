@@ -0,0 +1,58 @@
+import unittest
+from bitshares.account import Account
+from bitshares.blockchainobject import BlockchainObject
+from bitshares.cachesubscriber import CacheSubscriber
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        BlockchainObject.clear_cache()
+        self.bts = object()
+        self.subscriber = CacheSubscriber(blockchain_instance=self.bts)
+        BlockchainObject._cache_subscriber = self.subscriber
+
+    def tearDown(self):
+        BlockchainObject._cache_subscriber = None
+        BlockchainObject.clear_cache()
+
+    def test_invalidate(self):
+        obj = BlockchainObject(
+            {"id": "1.2.5"}, blockchain_instance=self.bts)
+        self.assertIn("1.2.5", BlockchainObject._cache)
+        self.assertIn("1.2.5", self.subscriber.watched)
+
+        # Other objects are not watched
+        BlockchainObject(
+            {"id": "1.7.5"}, blockchain_instance=self.bts)
+        self.assertNotIn("1.7.5", self.subscriber.watched)
+
+        self.subscriber.process_notice({"id": "1.2.6"})
+        self.assertIn("1.2.5", BlockchainObject._cache)
+
+        self.subscriber.process_notice(dict(obj))
+        self.assertNotIn("1.2.5", BlockchainObject._cache)
+        self.assertEqual(self.subscriber.invalidations, 1)
+
+    def test_disconnect(self):
+        BlockchainObject(
+            {"id": "1.3.0"}, blockchain_instance=self.bts)
+        BlockchainObject(
+            {"id": "1.3.1"}, blockchain_instance=self.bts)
+        self.subscriber._on_disconnect()
+        self.assertNotIn("1.3.0", BlockchainObject._cache)
+        self.assertNotIn("1.3.1", BlockchainObject._cache)
+        self.assertEqual(self.subscriber.watched, {})
+
+    def test_full_account(self):
+        Account({
+            "id": "1.2.7",
+            "name": "init0",
+            "statistics": {"id": "2.6.7", "owner": "1.2.7"},
+        }, full=True, blockchain_instance=self.bts)
+        self.assertIn("1.2.7", self.subscriber.watched)
+        # The embedded statistics are watched by their id
+        self.assertIn("2.6.7", self.subscriber.watched)
+
+        self.subscriber.process_notice({"id": "2.6.7", "owner": "1.2.7"})
+        self.assertNotIn("1.2.7", BlockchainObject._cache)
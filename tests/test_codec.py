@@ -0,0 +1,71 @@
+import mock
+import unittest
+from grapheneapi.exceptions import RPCError
+from bitsharesapi import codec
+from bitsharesapi.websocket import RPCWebsocket
+
+
+class Testcases(unittest.TestCase):
+
+    def tearDown(self):
+        codec.set_codec()
+
+    def test_roundtrip(self):
+        payload = {"method": "call", "params": [0, "get_objects", [["1.2.0"]]],
+                   "jsonrpc": "2.0", "id": 1}
+        for name in codec.codecs:
+            codec.set_codec(name)
+            self.assertEqual(codec.get_codec().name, name)
+            self.assertEqual(codec.loads(codec.dumps(payload)), payload)
+            self.assertEqual(codec.loads(codec.dumps_bytes(payload)), payload)
+
+    def test_dumps_bytes(self):
+        # Each codec encodes bytes with its own library
+        payload = {"memo": "\u00e4", "id": 1}
+        for name in codec.codecs:
+            codec.set_codec(name)
+            module = getattr(codec, name)
+            with mock.patch.object(
+                module, "dumps", wraps=module.dumps
+            ) as dumps:
+                data = codec.dumps_bytes(payload)
+            self.assertTrue(dumps.called, name)
+            self.assertIsInstance(data, bytes)
+            self.assertEqual(codec.loads(data), payload)
+
+        # Also without ujson installed
+        with mock.patch.object(codec, "ujson") as ujson:
+            ujson.dumps.return_value = '{"id": 1}'
+            self.assertEqual(
+                codec.UjsonCodec().dumps_bytes({"id": 1}), b'{"id": 1}')
+            ujson.dumps.assert_called_once_with({"id": 1}, ensure_ascii=False)
+
+    def test_fallback(self):
+        big = {"supply": 2 ** 70, "memo": "a\x01b"}
+        for name in codec.codecs:
+            codec.set_codec(name)
+            self.assertEqual(codec.loads(codec.dumps(big)), big)
+            self.assertEqual(codec.loads('{"a": "b\x01"}'), {"a": "b\x01"})
+
+    def test_rpc(self):
+        connection = RPCWebsocket("ws://127.0.0.1:1")
+        replies = ['{"id": 1, "result": [{"id": "1.2.0"}]}',
+                   '{"id": 2, "error": {"message": "no method"}}']
+        connection.rpcexec = mock.Mock(side_effect=replies)
+        with mock.patch.object(
+            codec, "loads", wraps=codec.loads
+        ) as loads, mock.patch.object(codec, "dumps") as dumps:
+            self.assertEqual(
+                connection.get_objects(["1.2.0"]), [{"id": "1.2.0"}])
+            with self.assertRaises(RPCError):
+                connection.foobar()
+        # Replies are decoded with the codec, nothing is encoded for the
+        # log unless debug logging is enabled
+        self.assertEqual(loads.call_count, 2)
+        self.assertFalse(dumps.called)
+        query = connection.rpcexec.call_args_list[0][0][0]
+        self.assertEqual(query["params"], [0, "get_objects", [["1.2.0"]]])
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            codec.set_codec("foobar")
@@ -0,0 +1,106 @@
+import time
+import unittest
+import threading
+from bitsharesapi.dispatch import NotificationDispatcher
+from bitsharesapi.websocket import BitSharesWebsocket
+
+
+class Testcases(unittest.TestCase):
+
+    def test_order_per_key(self):
+        received = {"a": [], "b": []}
+        dispatcher = NotificationDispatcher(workers=3)
+        for i in range(100):
+            for key in received:
+                dispatcher.put(
+                    "on_object", key, received[key].append, i)
+        dispatcher.stop()
+        self.assertEqual(received["a"], list(range(100)))
+        self.assertEqual(received["b"], list(range(100)))
+        stats = dispatcher.stats()["on_object"]
+        self.assertEqual(stats["delivered"], 200)
+        self.assertEqual(stats["depth"], 0)
+
+    def test_drop_oldest(self):
+        received = []
+        release = threading.Event()
+
+        def slow(x):
+            release.wait()
+            received.append(x)
+
+        dispatcher = NotificationDispatcher(
+            workers=1, maxsize=2, overflow="drop-oldest")
+        dispatcher.put("on_block", "on_block", slow, 0)
+        # wait until the first notice is being delivered
+        while dispatcher.depth("on_block"):
+            time.sleep(0.001)
+        for i in range(1, 6):
+            dispatcher.put("on_block", "on_block", slow, i)
+        self.assertEqual(dispatcher.depth("on_block"), 2)
+        self.assertGreaterEqual(dispatcher.lag("on_block"), 0)
+        release.set()
+        dispatcher.stop()
+        self.assertEqual(received, [0, 4, 5])
+        self.assertEqual(dispatcher.stats()["on_block"]["dropped"], 3)
+
+    def test_coalesce(self):
+        received = []
+        release = threading.Event()
+
+        def slow(x):
+            release.wait()
+            received.append(x)
+
+        dispatcher = NotificationDispatcher(
+            workers=1, maxsize=2, overflow="coalesce")
+        dispatcher.put("on_object", "2.1.0", slow, 0)
+        while dispatcher.depth("on_object"):
+            time.sleep(0.001)
+        dispatcher.put("on_object", "2.1.0", slow, 1)
+        dispatcher.put("on_object", "1.7.1", slow, 2)
+        dispatcher.put("on_object", "2.1.0", slow, 3)
+        release.set()
+        dispatcher.stop()
+        self.assertEqual(received, [0, 3, 2])
+        self.assertEqual(dispatcher.stats()["on_object"]["coalesced"], 1)
+
+    def test_websocket(self):
+        received = []
+        ws = BitSharesWebsocket(
+            "ws://localhost", objects=["2.1.0"],
+            on_object=received.append, dispatcher=True)
+        ws.on_message(
+            '{"method": "notice", "params": [1, [[{"id": "2.1.0"}]]]}')
+        ws.dispatcher.stop()
+        self.assertEqual(received, [{"id": "2.1.0"}])
+
+    def test_coalesce_objects(self):
+        received = []
+        release = threading.Event()
+
+        def slow(x):
+            release.wait()
+            received.append(x)
+
+        ws = BitSharesWebsocket(
+            "ws://localhost", objects=["2.1.0", "1.7.x"],
+            on_object=slow, coalesce_objects=True)
+        self.assertIn("on_object", ws.dispatcher.coalesce)
+        ws.on_message(
+            '{"method": "notice", "params": [1, [[{"id": "2.1.0", "n": 0}]]]}')
+        while ws.dispatcher.depth("on_object"):
+            time.sleep(0.001)
+        for n in range(1, 10):
+            ws.on_message(
+                '{"method": "notice", "params": [1, [[{"id": "2.1.0", "n": %d}, '
+                '{"id": "1.7.5", "n": %d}]]]}' % (n, n))
+        release.set()
+        ws.dispatcher.stop()
+        for id in ["2.1.0", "1.7.5"]:
+            states = [x["n"] for x in received if x["id"] == id]
+            # in order, latest state last
+            self.assertEqual(states, sorted(states))
+            self.assertEqual(states[-1], 9)
+        self.assertLess(len(received), 19)
+        self.assertEqual(len(received) + ws.coalesced, 19)
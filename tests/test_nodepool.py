@@ -0,0 +1,132 @@
+import time
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from bitsharesapi.nodepool import NodePool, NodeStats
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = NodePool(
+            ["ws://node1", "ws://node2", "ws://node3"],
+            write_urls=["ws://node3"],
+            probe_interval=0
+        )
+        self.node1, self.node2, self.node3 = self.pool.nodes
+
+    def test_percentile(self):
+        stats = NodeStats()
+        self.assertIsNone(stats.percentile(50))
+        for i in range(1, 101):
+            stats.record_success(i / 1000.0)
+        self.assertAlmostEqual(stats.percentile(50), 0.051)
+        self.assertAlmostEqual(stats.percentile(99), 0.099)
+        self.assertAlmostEqual(stats.percentile(100), 0.1)
+
+    def test_error_rate(self):
+        stats = NodeStats()
+        stats.record_error()
+        self.assertGreater(stats.error_rate, 0)
+        rate = stats.error_rate
+        stats.record_success(0.1)
+        self.assertLess(stats.error_rate, rate)
+
+    def test_routing(self):
+        self.node1.stats.record_success(0.2)
+        self.node2.stats.record_success(0.1)
+        self.node3.stats.record_success(0.3)
+        self.assertIs(self.pool.best("get_objects"), self.node2)
+        self.assertIs(self.pool.best("broadcast_transaction"), self.node3)
+
+        # lagging nodes are not used for reads
+        self.node2.stats.lag = 10
+        self.assertIs(self.pool.best("get_objects"), self.node1)
+
+        # nodes that are down are skipped
+        self.node1.down_until = float("inf")
+        self.assertIs(self.pool.best("get_objects"), self.node3)
+
+    def test_hedging(self):
+        pool = NodePool(
+            ["ws://node1", "ws://node2"],
+            hedge=True,
+            probe_interval=0,
+        )
+        slow, fast = pool.nodes
+        slow.stats.record_success(0.01)
+        fast.stats.record_success(0.02)
+
+        def slow_call(name, *args, **kwargs):
+            time.sleep(0.5)
+            return "slow"
+
+        slow.call = slow_call
+        fast.call = lambda name, *args, **kwargs: "fast"
+
+        # not hedged
+        self.assertEqual(pool.call("get_objects", ["1.2.0"]), "slow")
+        self.assertEqual(pool.hedge_stats["calls"], 0)
+
+        # hedged
+        self.assertEqual(pool.call("get_order_book", "1.3.0", "1.3.1"), "fast")
+        self.assertEqual(
+            pool.hedge_stats, {"calls": 1, "fired": 1, "won": 1})
+        pool.disconnect()
+
+    def test_hedging_queued(self):
+        pool = NodePool(
+            ["ws://node1", "ws://node2"],
+            hedge=True,
+            probe_interval=0,
+        )
+        primary, secondary = pool.nodes
+        primary.stats.record_success(0.2)
+        secondary.stats.record_success(0.3)
+
+        def call(name, *args, **kwargs):
+            time.sleep(0.1)
+            return "primary"
+
+        primary.call = call
+        secondary.call = lambda name, *args, **kwargs: "secondary"
+
+        # Time waiting for a worker is not taken for latency of the node
+        pool._executor = ThreadPoolExecutor(max_workers=1)
+        pool._executor.submit(time.sleep, 0.3)
+        self.assertEqual(
+            pool.call("get_order_book", "1.3.0", "1.3.1"), "primary")
+        self.assertEqual(
+            pool.hedge_stats, {"calls": 1, "fired": 0, "won": 0})
+        pool.disconnect()
+
+    def test_hedging_loser(self):
+        pool = NodePool(
+            ["ws://node1", "ws://node2"],
+            hedge=True,
+            probe_interval=0,
+        )
+        slow, fast = pool.nodes
+        slow.stats.record_success(0.01)
+        fast.stats.record_success(0.02)
+        answer = threading.Event()
+        closed = threading.Event()
+        connection = slow.connection
+        connection.ws = True
+        connection.disconnect = closed.set
+
+        def slow_call(name, *args, **kwargs):
+            answer.wait(5)
+            return "slow"
+
+        slow.call = slow_call
+        fast.call = lambda name, *args, **kwargs: "fast"
+
+        self.assertEqual(
+            pool.call("get_order_book", "1.3.0", "1.3.1"), "fast")
+        # Later calls to the node don't wait for the abandoned call
+        self.assertIsNot(slow.connection, connection)
+        self.assertFalse(closed.is_set())
+        answer.set()
+        self.assertTrue(closed.wait(5))
+        pool.disconnect()
@@ -1,8 +1,46 @@
+import os
 import time
+import tempfile
+import threading
 import unittest
 from bitshares import BitShares, exceptions
 from bitshares.instance import set_shared_bitshares_instance
-from bitshares.blockchainobject import ObjectCache
+from bitshares.account import Account
+from bitshares.asset import Asset
+from bitshares.blockchainobject import (
+    BlockchainObject, CachePolicies, CacheStatistics, ObjectCache, FOREVER)
+from bitsharesapi.batch import ObjectCoalescer
+
+
+class SlowObject(BlockchainObject):
+    refreshes = 0
+
+    def refresh(self):
+        SlowObject.refreshes += 1
+        time.sleep(0.2)
+        if self.identifier == "missing":
+            raise ValueError(self.identifier)
+        dict.__init__(self, {"id": "1.2.1", "name": self.identifier})
+        self.cache(self.identifier)
+
+
+class BatchRpc(object):
+    def __init__(self):
+        self.calls = []
+        self.coalescer = ObjectCoalescer(self._get_objects)
+
+    def _get_objects(self, ids):
+        self.calls.append(list(ids))
+        return [
+            {"id": id, "name": "account" + id.split(".")[2]}
+            if id != "1.2.99" else None
+            for id in ids]
+
+    def get_objects(self, ids):
+        return self.coalescer.get_objects(ids)
+
+    def batch(self):
+        return self.coalescer.batch()
 
 
 class Testcases(unittest.TestCase):
@@ -31,3 +69,250 @@ class Testcases(unittest.TestCase):
 
         # Get
         self.assertEqual(cache.get("foo", "New"), "New")
+
+    def test_cache_lru(self):
+        cache = ObjectCache(default_expiration=60, max_entries=2)
+        cache["a"] = 1
+        cache["b"] = 2
+        self.assertEqual(cache.get("a"), 1)
+        cache["c"] = 3
+        # "b" was used least recently
+        self.assertNotIn("b", cache)
+        self.assertIn("a", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_cache_bytes(self):
+        cache = ObjectCache(default_expiration=60, max_bytes=2000)
+        for i in range(100):
+            cache[str(i)] = {"id": "1.2.{}".format(i), "name": "x" * 20}
+        self.assertLessEqual(cache.bytes, 2000)
+        self.assertIn("99", cache)
+        self.assertNotIn("0", cache)
+
+    def test_cache_expiry_bounded(self):
+        cache = ObjectCache(default_expiration=3600, max_entries=10)
+        for i in range(10000):
+            cache[i] = i
+            cache.set("block{}".format(i), i, FOREVER)
+        self.assertEqual(len(cache), 10)
+        self.assertLessEqual(sum(map(len, cache._expiry.values())), 10)
+        # Replaced entries are queued once
+        for i in range(5):
+            cache["x"] = i
+        self.assertLessEqual(sum(map(len, cache._expiry.values())), 10)
+
+    def test_cache_expire(self):
+        cache = ObjectCache(default_expiration=0.1)
+        cache["a"] = 1
+        cache.set_expiration(60)
+        cache["b"] = 2
+        time.sleep(0.2)
+        cache.expire()
+        self.assertEqual(cache.keys(), ["b"])
+
+    def test_cache_age(self):
+        cache = ObjectCache(default_expiration=60)
+        cache.set("a", 1, 60)
+        cache.set("b", 2, 60, age=10)
+        cache.set("c", 3, 60, age=59.9)
+        # Entries with an age share the queue of their expiration
+        self.assertEqual(list(cache._expiry), [60])
+        self.assertEqual(cache.entries()[1][3], 60)
+        self.assertGreaterEqual(cache.entries()[1][2], 10)
+        time.sleep(0.2)
+        self.assertIsNone(cache.get("c"))
+        self.assertEqual(cache.get("b"), 2)
+        # Older than their expiration
+        cache.set("d", 4, 60, age=60)
+        self.assertNotIn("d", cache)
+
+    def test_cache_no_overwrite(self):
+        cache = ObjectCache(default_expiration=60, no_overwrite=True)
+        cache["a"] = 1
+        cache["a"] = 2
+        self.assertEqual(cache["a"], 1)
+
+    def test_cache_forever(self):
+        cache = ObjectCache(default_expiration=0.1)
+        cache.set("a", 1, expiration=FOREVER)
+        cache.set("b", 2, expiration=0)
+        time.sleep(0.2)
+        cache.expire()
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+
+    def test_cache_policies(self):
+        policies = CachePolicies({"Asset": 3600, "1.3": 10, "2": 0})
+        asset = Asset({"id": "1.3.0"}, blockchain_instance=self.bts)
+        self.assertEqual(policies.lookup(asset).expiration, 3600)
+        policies.remove("Asset")
+        self.assertEqual(policies.lookup(asset).expiration, 10)
+        obj = BlockchainObject({"id": "2.1.0"}, blockchain_instance=self.bts)
+        self.assertEqual(policies.lookup(obj).expiration, 0)
+        policies.set(BlockchainObject, 5)
+        self.assertEqual(policies.lookup(obj).expiration, 5)
+        self.assertIn("BlockchainObject", policies.stats())
+
+    def test_single_flight(self):
+        BlockchainObject.clear_cache()
+        SlowObject.refreshes = 0
+        results, errors = [], []
+
+        def load(name):
+            try:
+                results.append(SlowObject(name, blockchain_instance=self.bts))
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=load, args=(name,))
+            for name in ["init0"] * 16 + ["missing"] * 16]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(SlowObject.refreshes, 2)
+        self.assertEqual(len(results), 16)
+        self.assertEqual(len(errors), 16)
+        for obj in results:
+            self.assertEqual(obj["name"], "init0")
+
+        # Cached under the id as well
+        SlowObject("1.2.1", blockchain_instance=self.bts)
+        self.assertEqual(SlowObject.refreshes, 2)
+
+    def test_cache_snapshot(self):
+        BlockchainObject.clear_cache()
+        BlockchainObject.set_expiration(0.5)
+        # Operations never change
+        BlockchainObject({"id": "1.11.5"}, blockchain_instance=self.bts)
+        BlockchainObject({"id": "1.7.5"}, blockchain_instance=self.bts)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.json.gz")
+            BlockchainObject.save_cache(path, "chain")
+
+            BlockchainObject.clear_cache()
+            self.assertEqual(BlockchainObject.load_cache(
+                path, "other", blockchain_instance=self.bts), 0)
+            self.assertEqual(BlockchainObject.load_cache(
+                path, "chain", blockchain_instance=self.bts), 2)
+            self.assertIsInstance(
+                BlockchainObject._cache["1.7.5"], BlockchainObject)
+
+            # The age of the entries is kept
+            time.sleep(0.6)
+            BlockchainObject.clear_cache()
+            BlockchainObject.set_expiration(0.5)
+            self.assertEqual(BlockchainObject.load_cache(
+                path, "chain", blockchain_instance=self.bts), 1)
+            self.assertIn("1.11.5", BlockchainObject._cache)
+            self.assertNotIn("1.7.5", BlockchainObject._cache)
+        BlockchainObject.clear_cache()
+
+    def test_cache_stats(self):
+        stats = CacheStatistics()
+        cache = ObjectCache(default_expiration=60, max_entries=1, stats=stats)
+        for id in ["1.3.0", "1.3.1"]:
+            cache[id] = BlockchainObject(
+                {"id": id}, use_cache=False, blockchain_instance=self.bts)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(
+            stats.json()["classes"]["BlockchainObject"]["evictions"], 1)
+        self.assertEqual(stats.json()["types"]["1.3"]["evictions"], 1)
+
+        BlockchainObject.clear_cache()
+        BlockchainObject.cache_stats.reset()
+        SlowObject("init0", blockchain_instance=self.bts)
+        SlowObject("init0", blockchain_instance=self.bts)
+        counters = BlockchainObject.cache_stats.json()["classes"]["SlowObject"]
+        self.assertEqual(counters["misses"], 1)
+        self.assertEqual(counters["hits"], 1)
+        self.assertEqual(counters["refreshes"], 1)
+        self.assertGreaterEqual(counters["max_refresh_time"], 0.2)
+
+    def test_cache_alias(self):
+        cache = ObjectCache(default_expiration=60)
+        cache["1.2.100"] = {"id": "1.2.100", "name": "init0"}
+        cache.alias("init0", "1.2.100")
+        self.assertIn("init0", cache)
+        self.assertEqual(cache["init0"]["id"], "1.2.100")
+        self.assertEqual(len(cache), 1)
+
+        # Updates are seen through all aliases
+        cache["1.2.100"] = {"id": "1.2.100", "name": "init0", "new": True}
+        self.assertTrue(cache["init0"]["new"])
+
+        # Removing an alias removes the entry and its aliases
+        del cache["init0"]
+        self.assertNotIn("1.2.100", cache)
+        self.assertNotIn("init0", cache)
+        self.assertEqual(cache.aliases(), {})
+
+        # Aliases expire with their entry
+        cache.set("1.2.101", {"id": "1.2.101"}, 0.1)
+        cache.alias("init1", "1.2.101")
+        time.sleep(0.2)
+        self.assertIsNone(cache.get("init1"))
+        self.assertEqual(cache.aliases(), {})
+
+    def test_cache_scope(self):
+        class Instance(object):
+            object_cache = None
+
+        shared = Instance()
+        isolated = Instance()
+        isolated.object_cache = BlockchainObject.new_cache()
+        BlockchainObject({"id": "1.2.300"}, blockchain_instance=shared)
+        self.assertIn("1.2.300", BlockchainObject._cache)
+        self.assertNotIn("1.2.300", isolated.object_cache)
+
+        obj = BlockchainObject(
+            {"id": "1.2.301"}, blockchain_instance=isolated)
+        self.assertTrue(obj.iscached("1.2.301"))
+        self.assertIn("1.2.301", isolated.object_cache)
+        self.assertNotIn("1.2.301", BlockchainObject._cache)
+
+        # Instances of the same chain share a cache
+        self.assertIs(
+            BlockchainObject.chain_cache("a"),
+            BlockchainObject.chain_cache("a"))
+        self.assertIsNot(
+            BlockchainObject.chain_cache("a"),
+            BlockchainObject.chain_cache("b"))
+        self.assertEqual(BlockchainObject.chain_cache("b").chain_id, "b")
+
+        # Clearing the shared cache leaves the others alone
+        BlockchainObject.clear_cache()
+        self.assertIn("1.2.301", isolated.object_cache)
+
+    def test_batch_load(self):
+        class Instance(object):
+            object_cache = BlockchainObject.new_cache()
+            rpc = BatchRpc()
+
+        bts = Instance()
+        with bts.rpc.batch():
+            accounts = [
+                Account("1.2.{}".format(i), blockchain_instance=bts)
+                for i in range(5)]
+            missing = Account("1.2.99", blockchain_instance=bts)
+            self.assertEqual(bts.rpc.calls, [])
+        # One call for all accounts of the batch
+        self.assertEqual(
+            bts.rpc.calls, [["1.2.{}".format(i) for i in range(5)] + ["1.2.99"]])
+        self.assertEqual(
+            [a["name"] for a in accounts],
+            ["account{}".format(i) for i in range(5)])
+        self.assertEqual(len(bts.rpc.calls), 1)
+        self.assertIn("1.2.3", bts.object_cache)
+        with self.assertRaises(exceptions.AccountDoesNotExistsException):
+            missing["name"]
+
+        # Objects used within the batch resolve the batch
+        with bts.rpc.batch():
+            first = Account("1.2.10", blockchain_instance=bts)
+            second = Account("1.2.11", blockchain_instance=bts)
+            self.assertEqual(first["name"], "account10")
+            self.assertEqual(second["name"], "account11")
+        self.assertEqual(bts.rpc.calls[1:], [["1.2.10", "1.2.11"]])
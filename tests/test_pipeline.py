@@ -0,0 +1,110 @@
+import json
+import threading
+import unittest
+from bitsharesapi.bitsharesnoderpc import Api
+from bitsharesapi.exceptions import NoMethodWithName
+from bitsharesapi.pipeline import Pipeline
+from bitsharesapi.ratelimit import RateLimiter
+from bitsharesapi.websocket import RPCWebsocket
+
+
+class FakeSocket(object):
+    """ Answers all calls in reverse order, after a notice
+    """
+    def __init__(self):
+        self.sent = []
+        self.replies = None
+
+    def send(self, frame):
+        self.sent.append(json.loads(frame.decode("utf8")))
+
+    def recv(self):
+        if self.replies is None:
+            self.replies = [json.dumps({"method": "notice", "params": [1, []]})]
+            for query in reversed(self.sent):
+                name, args = query["params"][1:]
+                if name == "fail":
+                    reply = {"error": {"message": "no method with name 'fail'"}}
+                else:
+                    reply = {"result": [name] + args}
+                reply["id"] = query["id"]
+                self.replies.append(json.dumps(reply))
+        return self.replies.pop(0)
+
+
+class FakeRPC(object):
+    post_process_exception = Api.post_process_exception
+
+    def __init__(self):
+        self.connection = RPCWebsocket("ws://localhost")
+        self.connection.ws = FakeSocket()
+        self.calls = []
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            self.calls.append(name)
+            return [name] + list(args)
+        return method
+
+
+class Testcases(unittest.TestCase):
+
+    def test_pipeline(self):
+        rpc = FakeRPC()
+        with Pipeline(rpc) as pipeline:
+            futures = [pipeline.get_block(n) for n in range(10)]
+            failed = pipeline.fail()
+            self.assertFalse(futures[0].done)
+        self.assertEqual(len(rpc.connection.ws.sent), 11)
+        self.assertEqual(
+            [f.result() for f in futures],
+            [["get_block", n] for n in range(10)])
+        with self.assertRaises(NoMethodWithName):
+            failed.result()
+        self.assertEqual(rpc.calls, [])
+
+    def test_lazy(self):
+        rpc = FakeRPC()
+        pipeline = Pipeline(rpc)
+        future = pipeline.get_objects(["1.2.0"])
+        self.assertEqual(future.result(), ["get_objects", ["1.2.0"]])
+
+    def test_sequential(self):
+        rpc = FakeRPC()
+        rpc.connection = object()
+        with Pipeline(rpc) as pipeline:
+            future = pipeline.get_block(1)
+        self.assertEqual(future.result(), ["get_block", 1])
+        self.assertEqual(rpc.calls, ["get_block"])
+
+    def test_rate_limit_window(self):
+        # Windows of one call; each pipeline needs both windows and more
+        # calls than fit into them, in opposite orders
+        limiter = RateLimiter({
+            "database": {"window": 1, "max_window": 1},
+            "history": {"window": 1, "max_window": 1}})
+        names = [
+            ["get_objects", "get_market_history", "get_block"],
+            ["get_market_history", "get_objects", "get_market_history"]]
+        pipelines = []
+        for calls in names:
+            rpc = FakeRPC()
+            rpc.rate_limit = True
+            rpc.rate_limiter = lambda: limiter
+            pipeline = Pipeline(rpc)
+            futures = [pipeline.__getattr__(name)() for name in calls]
+            pipelines.append((pipeline, futures))
+
+        threads = [
+            threading.Thread(
+                target=pipeline._execute, args=(futures, limiter),
+                daemon=True)
+            for pipeline, futures in pipelines]
+        [t.start() for t in threads]
+        [t.join(5) for t in threads]
+        self.assertFalse(any(t.is_alive() for t in threads))
+        for (pipeline, futures), calls in zip(pipelines, names):
+            self.assertEqual(
+                [f.result() for f in futures], [[name] for name in calls])
+        self.assertEqual(limiter.json()["database"]["inflight"], 0)
+        self.assertEqual(limiter.json()["history"]["inflight"], 0)
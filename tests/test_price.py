@@ -1,3 +1,4 @@
+import json
 from bitshares import BitShares
 from bitshares.instance import set_shared_bitshares_instance
 from bitshares.amount import Amount
@@ -74,3 +75,71 @@ class Testcases(unittest.TestCase):
         p3 = p1 / p2
         self.assertTrue(isinstance(p3, (float, int)))
         self.assertEqual(float(p3), 2.0)
+
+    def test_ratio(self):
+        p1 = Price({
+            "base": {"amount": 29, "asset_id": "1.3.0"},
+            "quote": {"amount": 100, "asset_id": "1.3.106"}})
+        self.assertEqual(p1.ratio(), (29, 100))
+        self.assertEqual(p1.json()["base"]["amount"], 29)
+        self.assertEqual(p1.json()["quote"]["amount"], 100)
+        self.assertEqual(p1.copy().invert().ratio(), (100, 29))
+
+        # price is derived again once base or quote change
+        p1["base"] = Amount(58, "BTS")
+        self.assertEqual(p1["price"], p1["base"]["amount"] / p1["quote"]["amount"])
+
+    def test_price_key(self):
+        p1 = Price({
+            "base": {"amount": 29, "asset_id": "1.3.0"},
+            "quote": {"amount": 100, "asset_id": "1.3.106"}})
+        # The derived price is a key like base and quote
+        self.assertIn("price", p1)
+        self.assertEqual(p1.get("price"), p1["base"]["amount"] / p1["quote"]["amount"])
+        self.assertIn("price", dict(p1))
+        self.assertIn("price", p1.keys())
+        self.assertIn("price", list(p1))
+        self.assertIn("price", dict(p1.items()))
+        self.assertIn("price", p1.copy())
+        self.assertEqual(json.loads(json.dumps(p1))["price"], p1["price"])
+
+        p1["base"] = Amount(58, "BTS")
+        self.assertEqual(p1.get("price"), p1["base"]["amount"] / p1["quote"]["amount"])
+
+    def test_inverted(self):
+        p1 = Price(10.0, "USD/GOLD")
+        p2 = p1.as_base("GOLD")
+        self.assertEqual(p2["base"]["symbol"], "GOLD")
+        self.assertEqual(float(p2), 0.1)
+        # Sharing the assets, not the amounts
+        self.assertIsNot(p2["base"], p1["quote"])
+        self.assertIs(p2["base"]["asset"], p1["quote"]["asset"])
+
+        # Modifying either price doesn't change the other
+        p1 *= 2
+        self.assertEqual(float(p2), 0.1)
+        self.assertEqual(float(p1.as_quote("USD")), 0.05)
+        p2.invert()
+        self.assertEqual(float(p2), 10)
+        self.assertEqual(float(p1), 20)
+
+    def test_inverted_mutation(self):
+        p1 = Price({
+            "base": {"amount": 29, "asset_id": "1.3.0"},
+            "quote": {"amount": 100, "asset_id": "1.3.106"}})
+        quote = p1["quote"]["asset"]
+        p2 = p1.as_base(quote["symbol"])
+        p2["base"]["amount"] = 40 / 10 ** quote["precision"]
+        # The view changed ...
+        self.assertEqual(p2.ratio(), (40, 29))
+        self.assertEqual(p2.json()["base"]["amount"], 40)
+        # ... the original didn't
+        self.assertEqual(p1["quote"]["amount"], 100 / 10 ** quote["precision"])
+        self.assertEqual(p1.ratio(), (29, 100))
+        self.assertEqual(p1.as_base(quote["symbol"]).ratio(), (100, 29))
+
+        # Amounts changed in place are not hidden by the exact ratio
+        p1["base"]["amount"] *= 2
+        self.assertEqual(p1.ratio(), (58, 100))
+        self.assertEqual(p1.inverted().ratio(), (100, 58))
+        self.assertEqual(p2.ratio(), (40, 29))
@@ -0,0 +1,72 @@
+import time
+import unittest
+import threading
+from bitsharesapi.ratelimit import (
+    TokenBucket, ConcurrencyWindow, RateLimiter)
+
+
+class Testcases(unittest.TestCase):
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(100, burst=5)
+        start = time.monotonic()
+        for _ in range(15):
+            bucket.acquire()
+        # 5 tokens right away, 10 more at 100 per second
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_token_bucket_batch(self):
+        bucket = TokenBucket(100, burst=5)
+        start = time.monotonic()
+        # Batches larger than the burst are charged in full
+        bucket.acquire(15)
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+        self.assertLess(bucket.available(), 1)
+
+    def test_window(self):
+        window = ConcurrencyWindow(initial=2, maximum=4)
+        for _ in range(20):
+            window.acquire()
+            window.release(latency=0.1)
+        self.assertEqual(window.limit, 4)
+        window.acquire()
+        window.release(error=True)
+        self.assertEqual(window.limit, 2)
+        # timeouts shrink the window as well
+        window.acquire()
+        window.release(latency=1.0)
+        self.assertEqual(window.limit, 1)
+        self.assertEqual(window.decreases, 2)
+
+    def test_concurrency(self):
+        limiter = RateLimiter({"history": {"window": 2, "max_window": 2}})
+        inflight = []
+        peak = []
+        lock = threading.Lock()
+
+        def call():
+            with lock:
+                inflight.append(1)
+                peak.append(len(inflight))
+            time.sleep(0.01)
+            with lock:
+                inflight.pop()
+
+        threads = [
+            threading.Thread(
+                target=limiter.call, args=("get_account_history", call))
+            for _ in range(8)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        self.assertEqual(max(peak), 2)
+
+    def test_api(self):
+        limiter = RateLimiter(True)
+        self.assertEqual(limiter.api("get_objects"), "database")
+        self.assertEqual(limiter.api("get_account_history"), "history")
+        self.assertEqual(
+            limiter.api("broadcast_transaction"), "network_broadcast")
+        self.assertEqual(
+            limiter.api("get_ticker", {"api": "history"}), "history")
+        self.assertIn("window", limiter.json()["database"])
+        self.assertIsNone(RateLimiter({"history": {}}).limit("get_objects"))
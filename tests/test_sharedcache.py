@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+from bitshares.blockchainobject import (
+    BlockchainObject, ObjectCache, FOREVER, encode_cached, decode_cached)
+from bitshares.sharedcache import SqliteCacheBackend
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.bts = object()
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "cache.sqlite")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def cache(self, **kwargs):
+        # One cache per process
+        return ObjectCache(backend=SqliteCacheBackend(
+            self.path, blockchain_instance=self.bts, **kwargs))
+
+    def test_shared(self):
+        first, second = self.cache(), self.cache()
+        obj = BlockchainObject(
+            {"id": "1.3.0"}, use_cache=False, blockchain_instance=self.bts)
+        first.set("1.3.0", obj, 60)
+        first.set("1.11.1", {"id": "1.11.1"}, FOREVER)
+
+        shared = second.get("1.3.0")
+        self.assertIsInstance(shared, BlockchainObject)
+        self.assertEqual(shared["id"], "1.3.0")
+        self.assertIn("1.11.1", second)
+
+        # Removals are shared too
+        del first["1.3.0"]
+        self.assertNotIn("1.3.0", self.cache())
+
+    def test_expiration(self):
+        first, second = self.cache(), self.cache()
+        first.set("a", 1, 0.2)
+        self.assertEqual(second.get("a"), 1)
+        time.sleep(0.3)
+        self.assertIsNone(self.cache().get("a"))
+
+        # The age is shared
+        first.set("b", 2, 60, age=30)
+        _, age, expiration = first.backend.get("b")
+        self.assertGreaterEqual(age, 30)
+        self.assertEqual(expiration, 60)
+
+    def test_aliases(self):
+        first, second = self.cache(), self.cache()
+        first.set("1.2.100", {"id": "1.2.100", "name": "init0"}, 60)
+        first.alias("init0", "1.2.100")
+
+        # Names resolve in other processes
+        self.assertEqual(second.get("init0")["id"], "1.2.100")
+        self.assertEqual(second.aliases(), {"init0": "1.2.100"})
+        self.assertIn("init0", self.cache())
+
+        # Aliases go with their entry
+        first.set("1.2.101", {"id": "1.2.101"}, 0.2)
+        first.alias("init1", "1.2.101")
+        time.sleep(0.3)
+        first.backend.purge()
+        self.assertIsNone(first.backend.resolve("init1"))
+        del first["1.2.100"]
+        self.assertIsNone(self.cache().get("init0"))
+        self.assertIsNone(first.backend.resolve("init0"))
+
+    def test_namespace(self):
+        self.cache(namespace="a").set("a", 1, 60)
+        self.assertIsNone(self.cache(namespace="b").get("a"))
+        self.assertEqual(self.cache(namespace="a").get("a"), 1)
+
+    def test_classes(self):
+        obj = BlockchainObject(
+            {"id": "1.3.0"}, use_cache=False, blockchain_instance=self.bts)
+        record = encode_cached(obj)
+        self.assertIsInstance(
+            decode_cached(record, blockchain_instance=self.bts),
+            BlockchainObject)
+
+        # Other classes are cache misses and are not imported
+        sys.modules.pop("xml.dom.minidom", None)
+        for klass in ["collections.OrderedDict", "xml.dom.minidom.Node"]:
+            record[0] = klass
+            self.assertIsNone(
+                decode_cached(record, blockchain_instance=self.bts))
+        self.assertNotIn("xml.dom.minidom", sys.modules)
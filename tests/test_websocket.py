@@ -0,0 +1,70 @@
+import json
+import unittest
+from bitsharesapi.websocket import BitSharesWebsocket
+
+
+def block_id(num, fork="ab"):
+    return "{:08x}".format(num) + fork * 16
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.sent = []
+        self.blocks = []
+        self.txs = []
+        self.ws = BitSharesWebsocket(
+            "ws://localhost",
+            on_block=self.blocks.append,
+            on_tx=self.txs.append,
+            backfill=True,
+            backfill_transactions=True)
+        self.ws.rpcexec = self.sent.append
+
+    def notice(self, event, payload):
+        self.ws.on_message(json.dumps({
+            "method": "notice",
+            "params": [self.ws.__events__.index(event), [payload]]}))
+
+    def reply(self, query, result):
+        self.ws.on_message(json.dumps({"id": query["id"], "result": result}))
+
+    def test_track_blocks(self):
+        self.notice("on_block", block_id(100))
+        self.notice("on_block", block_id(101))
+        # Blocks of a fork are delivered, too
+        self.notice("on_block", block_id(101, "cd"))
+        self.assertEqual(
+            self.blocks, [block_id(100), block_id(101), block_id(101, "cd")])
+        self.assertEqual(self.ws.last_block_num, 101)
+
+    def test_backfill(self):
+        self.notice("on_block", block_id(100))
+        self.ws._start_backfill()
+        self.assertEqual(
+            self.sent[-1]["params"][1], "get_dynamic_global_properties")
+        self.reply(self.sent[-1], {
+            "head_block_number": 103, "head_block_id": block_id(103)})
+        queries = self.sent[-3:]
+        self.assertEqual(
+            [q["params"][1:] for q in queries],
+            [["get_block", [101]], ["get_block", [102]], ["get_block", [103]]])
+
+        # live blocks wait for the backfill, the head is delivered once
+        self.notice("on_block", block_id(103))
+        self.notice("on_block", block_id(103, "cd"))
+        self.notice("on_block", block_id(104))
+        for query in reversed(queries):
+            num = query["params"][2][0]
+            self.reply(query, {
+                "previous": block_id(num - 1),
+                "transactions": [{"ref_block_num": num}]})
+
+        self.assertEqual(
+            self.blocks,
+            [block_id(n) for n in range(100, 104)] +
+            [block_id(103, "cd"), block_id(104)])
+        self.assertEqual(
+            [tx["ref_block_num"] for tx in self.txs], [101, 102, 103])
+        self.assertEqual(self.ws.backfill_stats["last_gap"], 3)
+        self.assertEqual(self.ws.backfill_stats["backfills"], 1)